@@ -0,0 +1,12 @@
+"""
+Benchmarks for the site generator. Run them from the repository root:
+
+    uv run python -m bench --pages 1000     # time each build stage on a synthetic site
+    uv run python -m bench.bench_nesting    # inline parsing of heavily nested emphasis
+    uv run python -m bench.bench_memory     # bytes per node on a large generated page
+"""
+import os
+import sys
+
+# The generator's modules live in src/ and import each other as top-level modules
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,97 @@
+"""
+Generates a synthetic site and times each build stage over it.
+
+    uv run python -m bench --pages 10000 --mix code=2,images=0.05 -o results.json
+
+Results are printed as a table and, with --output, written as JSON so runs
+can be compared across commits.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from bench.corpus import DEFAULT_MIX, generate_corpus, parse_mix
+from bench.stages import STAGES, run
+from manifest import GENERATOR_VERSION
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Time each build stage on a synthetic site.")
+    parser.add_argument("--pages", type=int, default=1000, help="number of pages to generate (default: 1000)")
+    parser.add_argument("--words", type=int, default=300, help="average words per page (default: 300)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed (default: 0)")
+    parser.add_argument("--mix", default="",
+                        help="comma-separated name=weight overrides of " + ",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is reported (default: 3)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to time (default: all)")
+    parser.add_argument("--workdir", help="generate the site here and keep it, instead of in a temporary directory")
+    parser.add_argument("-o", "--output", help='write the results as JSON to this file ("-" for stdout)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        sys.exit(f"Unknown stages: {', '.join(sorted(unknown))}; expected some of {', '.join(STAGES)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.workdir or tmp
+        for name in ("content", "static", "docs", "out", "static_out"):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+        start = time.perf_counter()
+        paths = generate_corpus(root, args.pages, args.seed, mix, args.words)
+        generated = time.perf_counter() - start
+        corpus_bytes = sum(os.path.getsize(path) for path in paths)
+
+        timings = run(root, paths, stages, args.repeat)
+
+    results = {
+        "generator_version": GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "pages": args.pages,
+            "words": args.words,
+            "seed": args.seed,
+            "mix": mix,
+            "bytes": corpus_bytes,
+            "generate_seconds": generated,
+        },
+        "repeat": args.repeat,
+        "stages": {
+            stage: {
+                "best_seconds": min(runs),
+                "mean_seconds": sum(runs) / len(runs),
+                "runs": runs,
+                "us_per_page": min(runs) / args.pages * 1e6,
+            }
+            for stage, runs in timings.items()
+            if runs
+        },
+    }
+
+    print(f"{args.pages} pages, {corpus_bytes / 1e6:.1f} MB of markdown (seed {args.seed}), best of {args.repeat}",
+          file=sys.stderr)
+    print(f"{'stage':<24} {'best':>10} {'us/page':>10}", file=sys.stderr)
+    for stage, result in results["stages"].items():
+        print(f"{stage:<24} {result['best_seconds'] * 1000:>8.1f}ms {result['us_per_page']:>10.1f}", file=sys.stderr)
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Reports memory per node for the HtmlNode tree and TextNode lists of a large
+generated markdown page, comparing the slotted node classes with the
+previous layout (per-instance __dict__ plus a fresh children list and props
+dict on every node).
+
+Only node overhead is measured: both layouts are built from the same parsed
+strings, so text content is not counted.
+
+    uv run python -m bench.bench_memory [words]
+"""
+import sys
+import tracemalloc
+
+from bench.corpus import generate_markdown
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, markdown_to_html_node, markdown_to_blocks, text_to_textnodes
+
+
+class DictHtmlNode:
+    """The HtmlNode layout before __slots__."""
+
+    def __init__(self, tag_name=None, value=None, children=None, props=None):
+        self.tag_name = tag_name
+        self.value = value
+        self.children = children if children is not None else []
+        self.props = props if props is not None else {}
+
+
+class DictTextNode:
+    """The TextNode layout before __slots__."""
+
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+def clone_tree(node, legacy):
+    """Rebuilds a tree with either layout, sharing tag/value strings but not containers."""
+    props = dict(node.props) if node.props else None
+    if isinstance(node, ParentNode):
+        children = [clone_tree(child, legacy) for child in node.children]
+        return DictHtmlNode(node.tag_name, None, children, props) if legacy else ParentNode(node.tag_name, children, props)
+    return DictHtmlNode(node.tag_name, node.value, None, props) if legacy else LeafNode(node.tag_name, node.value, props)
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, allocated
+
+
+def main():
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    markdown = generate_markdown(words)
+    tree = markdown_to_html_node(markdown)
+    html_nodes = count_nodes(tree)
+
+    text_nodes = [node for block in markdown_to_blocks(markdown) if not block.startswith("```")
+                  for node in text_to_textnodes(block)]
+
+    _, slotted_tree_bytes = measure(lambda: clone_tree(tree, legacy=False))
+    _, dict_tree_bytes = measure(lambda: clone_tree(tree, legacy=True))
+    _, slotted_text_bytes = measure(lambda: [TextNode(n.text, n.text_type, n.url) for n in text_nodes])
+    _, dict_text_bytes = measure(lambda: [DictTextNode(n.text, n.text_type, n.url) for n in text_nodes])
+
+    print(f"corpus: {words} words, {len(markdown)} chars")
+    print(f"{'':<10} {'nodes':>8} {'before B/node':>14} {'after B/node':>13} {'saved':>6}")
+    for name, nodes, before, after in [
+        ("HtmlNode", html_nodes, dict_tree_bytes, slotted_tree_bytes),
+        ("TextNode", len(text_nodes), dict_text_bytes, slotted_text_bytes),
+    ]:
+        print(f"{name:<10} {nodes:>8} {before / nodes:>14.1f} {after / nodes:>13.1f} {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
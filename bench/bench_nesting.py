@@ -0,0 +1,56 @@
+"""
+Times inline parsing of pathologically nested emphasis: one bold span per
+paragraph wrapping n italic words, so every character sits inside a span
+whose content used to be re-tokenized.
+
+Compares parse_inline (nested spans paired in the same scan) with the old
+approach of tokenizing and then re-tokenizing each bold/italic span's text.
+Time per character should stay flat as n grows for a linear parser.
+
+    uv run python -m bench.bench_nesting
+"""
+import timeit
+
+from htmlnode import ParentNode
+from textnode import TextType
+from tokenizer import parse_inline, tokenize_inline
+
+SIZES = [1_000, 4_000, 16_000, 64_000]
+
+
+def reparse_children(text, exclude_delimiters=frozenset()):
+    """The previous text_to_children: tokenize, then recurse into each span's text."""
+    children = []
+    for node in tokenize_inline(text, exclude_delimiters):
+        if node.text_type == TextType.BOLD_TEXT:
+            children.append(ParentNode("b", reparse_children(node.text, exclude_delimiters | {"**"})))
+        elif node.text_type == TextType.ITALIC_TEXT:
+            children.append(ParentNode("i", reparse_children(node.text, exclude_delimiters | {"*", "_"})))
+        else:
+            children.append(node.text_node_to_html_node())
+    return children
+
+
+def nested_paragraph(words):
+    inner = " ".join(f"*w{i}*" if i % 2 else f"_w{i}_" for i in range(words))
+    return f"lead **{inner} end** tail"
+
+
+def best_of(func, text, repeat=5):
+    return min(timeit.repeat(lambda: func(text), number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'words':>8} {'chars':>9} {'parse_inline':>14} {'ns/char':>8} {'reparse':>10} {'ns/char':>8}")
+    for words in SIZES:
+        text = nested_paragraph(words)
+        single = best_of(parse_inline, text)
+        reparse = best_of(reparse_children, text)
+        print(
+            f"{words:>8} {len(text):>9} {single * 1000:>12.2f}ms {single / len(text) * 1e9:>8.0f}"
+            f" {reparse * 1000:>8.2f}ms {reparse / len(text) * 1e9:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
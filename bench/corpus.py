@@ -0,0 +1,143 @@
+"""
+Deterministic synthetic site generator for benchmarks.
+
+The same seed, page count and mix always produce byte-identical content, so
+timings from different runs and commits can be compared.
+"""
+import os
+import random
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "sed", "do"]
+
+# Relative weights of block kinds, and per-word rates of inline markup
+DEFAULT_MIX = {
+    "headings": 1.0,
+    "paragraphs": 4.0,
+    "lists": 1.5,
+    "quotes": 0.5,
+    "code": 0.5,
+    "emphasis": 0.08,
+    "nested": 0.02,
+    "links": 0.02,
+    "images": 0.005,
+}
+BLOCK_KINDS = ("headings", "paragraphs", "lists", "quotes", "code")
+
+# Pages per content/ subdirectory
+SECTION_SIZE = 100
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+
+def parse_mix(text):
+    """Parses "headings=1,code=0.5" into a mix based on DEFAULT_MIX."""
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, text.split(",")):
+        name, _, value = item.partition("=")
+        if name not in mix:
+            raise ValueError(f"Unknown mix entry {name!r}; expected one of {', '.join(mix)}")
+        mix[name] = float(value)
+    return mix
+
+
+def generate_markdown(words, seed=0, mix=None):
+    """A page of roughly the given number of words, starting with an h1 title."""
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    weights = [mix[kind] for kind in BLOCK_KINDS]
+    blocks = ["# " + _sentence(rng, mix, 4, inline=False)]
+    count = 0
+    while count < words:
+        kind = rng.choices(BLOCK_KINDS, weights)[0]
+        if kind == "headings":
+            blocks.append("#" * rng.randint(2, 4) + " " + _sentence(rng, mix, 4))
+            count += 4
+        elif kind == "lists":
+            items = rng.randint(2, 8)
+            if rng.random() < 0.5:
+                lines = [f"- {_sentence(rng, mix, 6)}" for _ in range(items)]
+            else:
+                lines = [f"{i + 1}. {_sentence(rng, mix, 6)}" for i in range(items)]
+            blocks.append("\n".join(lines))
+            count += items * 6
+        elif kind == "quotes":
+            blocks.append("\n".join(f"> {_sentence(rng, mix, 10)}" for _ in range(rng.randint(1, 3))))
+            count += 20
+        elif kind == "code":
+            lines = ["    " * rng.randint(0, 2) + " ".join(rng.choices(WORDS, k=6)) for _ in range(rng.randint(2, 10))]
+            blocks.append("```\n" + "\n".join(lines) + "\n```")
+            count += len(lines) * 6
+        else:
+            length = rng.randint(20, 80)
+            blocks.append(_sentence(rng, mix, length))
+            count += length
+    return "\n\n".join(blocks)
+
+
+def _sentence(rng, mix, length, inline=True):
+    words = []
+    for _ in range(length):
+        word = rng.choice(WORDS)
+        if inline:
+            roll = rng.random()
+            if roll < mix["nested"]:
+                word = f"**{word} _{rng.choice(WORDS)}_ {rng.choice(WORDS)}**"
+            elif roll < mix["nested"] + mix["emphasis"]:
+                word = rng.choice([f"**{word}**", f"_{word}_", f"*{word}*", f"`{word}`"])
+            elif roll < mix["nested"] + mix["emphasis"] + mix["links"]:
+                word = f"[{word}](/{rng.choice(WORDS)}/{word})"
+            elif roll < mix["nested"] + mix["emphasis"] + mix["links"] + mix["images"]:
+                word = f"![{word}](/images/{word}.png)"
+        words.append(word)
+    return " ".join(words)
+
+
+def page_path(index):
+    """Relative markdown path of the index-th page."""
+    if index == 0:
+        return "index.md"
+    return os.path.join(f"section-{index // SECTION_SIZE:04d}", f"page-{index % SECTION_SIZE:03d}.md")
+
+
+def generate_corpus(root, pages, seed=0, mix=None, words=300):
+    """
+    Writes a site into root: content/ with the given number of pages,
+    static/ with a stylesheet and binary assets, and template.html.
+    Page sizes vary around the given word count. Returns the list of
+    markdown paths written.
+    """
+    mix = mix or DEFAULT_MIX
+    content_dir = os.path.join(root, "content")
+    paths = []
+    for index in range(pages):
+        rng = random.Random(f"{seed}:{index}")
+        markdown = generate_markdown(rng.randint(words // 2, words * 3 // 2), f"{seed}:{index}:body", mix)
+        path = os.path.join(content_dir, page_path(index))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(markdown)
+        paths.append(path)
+
+    static_dir = os.path.join(root, "static")
+    os.makedirs(os.path.join(static_dir, "images"), exist_ok=True)
+    with open(os.path.join(static_dir, "index.css"), 'w', encoding='utf-8') as f:
+        f.write("body { font-family: sans-serif; }\n" * 50)
+    rng = random.Random(f"{seed}:static")
+    for index in range(max(5, pages // 20)):
+        with open(os.path.join(static_dir, "images", f"image-{index:05d}.png"), 'wb') as f:
+            f.write(rng.randbytes(rng.randint(1 << 10, 64 << 10)))
+
+    with open(os.path.join(root, "template.html"), 'w', encoding='utf-8') as f:
+        f.write(TEMPLATE)
+    return paths
@@ -0,0 +1,136 @@
+"""
+Times each stage of a build over a synthetic corpus.
+
+Every page goes through the same steps as generate_page, with each step
+timed on its own: reading the markdown, markdown_to_blocks,
+block_to_block_type on every block, inline parsing of the block text,
+markdown_to_html_node, to_html, filling the template and writing the page.
+Syncing static/ with sync_static, as builds do, is timed into an empty
+directory (cold) and again with every asset unchanged (warm), and a full
+generate_pages_recursive build is timed once per repeat.
+"""
+import os
+import shutil
+import time
+
+from main import generate_pages_recursive
+from staticsync import sync_static
+from template import Template
+from textnode import (
+    BlockType,
+    WHITESPACE_RUN,
+    block_to_block_type,
+    extract_title,
+    markdown_to_blocks,
+    markdown_to_html_node,
+    text_to_children,
+)
+
+PAGE_STAGES = (
+    "read",
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "inline_parse",
+    "markdown_to_html_node",
+    "to_html",
+    "template_fill",
+    "write",
+)
+SITE_STAGES = ("sync_static_cold", "sync_static_warm", "build")
+STAGES = PAGE_STAGES + SITE_STAGES
+
+
+def inline_texts(block, block_type):
+    """The strings markdown_to_html_node passes to text_to_children for a block."""
+    if block_type == BlockType.PARAGRAPH:
+        return [WHITESPACE_RUN.sub(' ', block).strip()]
+    if block_type == BlockType.HEADING:
+        return [block[len(block) - len(block.lstrip("#")) + 1:]]
+    if block_type == BlockType.QUOTE:
+        return ["\n".join(line[1:].lstrip() for line in block.split("\n"))]
+    if block_type == BlockType.UNORDERED_LIST:
+        return [line[2:] for line in block.split("\n")]
+    if block_type == BlockType.ORDERED_LIST:
+        return [line[line.find(" ") + 1:] for line in block.split("\n")]
+    return []
+
+
+def time_pages(paths, template, out_dir, totals):
+    """Runs every page through the per-page stages, adding seconds to totals."""
+    clock = time.perf_counter
+    for index, path in enumerate(paths):
+        start = clock()
+        with open(path, 'r', encoding='utf-8') as f:
+            markdown = f.read()
+        after_read = clock()
+        blocks = markdown_to_blocks(markdown)
+        after_blocks = clock()
+        block_types = [block_to_block_type(block) for block in blocks]
+        after_types = clock()
+
+        texts = [text for block, block_type in zip(blocks, block_types) for text in inline_texts(block, block_type)]
+        before_inline = clock()
+        for text in texts:
+            text_to_children(text)
+        after_inline = clock()
+
+        html_node = markdown_to_html_node(markdown)
+        after_parse = clock()
+        html = html_node.to_html()
+        after_html = clock()
+        page = template.render(Title=extract_title(markdown), Content=html)
+        after_template = clock()
+        with open(os.path.join(out_dir, f"{index}.html"), 'w', encoding='utf-8') as f:
+            f.write(page)
+        after_write = clock()
+
+        totals["read"] += after_read - start
+        totals["markdown_to_blocks"] += after_blocks - after_read
+        totals["block_to_block_type"] += after_types - after_blocks
+        totals["inline_parse"] += after_inline - before_inline
+        totals["markdown_to_html_node"] += after_parse - after_inline
+        totals["to_html"] += after_html - after_parse
+        totals["template_fill"] += after_template - after_html
+        totals["write"] += after_write - after_template
+
+
+def run(root, paths, stages=STAGES, repeat=1):
+    """
+    Times the selected stages over the corpus in root (see corpus.generate_corpus).
+    Returns {stage: [seconds per repeat]}.
+    """
+    results = {stage: [] for stage in stages}
+    template = Template.load(os.path.join(root, "template.html"))
+    out_dir = os.path.join(root, "out")
+    static_out = os.path.join(root, "static_out")
+
+    for _ in range(repeat):
+        if any(stage in PAGE_STAGES for stage in stages):
+            shutil.rmtree(out_dir, ignore_errors=True)
+            os.makedirs(out_dir)
+            totals = dict.fromkeys(PAGE_STAGES, 0.0)
+            time_pages(paths, template, out_dir, totals)
+            for stage in PAGE_STAGES:
+                if stage in results:
+                    results[stage].append(totals[stage])
+
+        if "sync_static_cold" in stages or "sync_static_warm" in stages:
+            static_dir = os.path.join(root, "static")
+            shutil.rmtree(static_out, ignore_errors=True)
+            os.makedirs(static_out)
+            start = time.perf_counter()
+            assets, _ = sync_static(static_dir, static_out)
+            if "sync_static_cold" in results:
+                results["sync_static_cold"].append(time.perf_counter() - start)
+            if "sync_static_warm" in results:
+                start = time.perf_counter()
+                sync_static(static_dir, static_out, assets)
+                results["sync_static_warm"].append(time.perf_counter() - start)
+        if "build" in stages:
+            start = time.perf_counter()
+            generate_pages_recursive(
+                os.path.join(root, "content"), os.path.join(root, "template.html"), os.path.join(root, "docs")
+            )
+            results["build"].append(time.perf_counter() - start)
+
+    return results
@@ -1,3 +1,4 @@
 #!/bin/bash
 uv run python -m src.main
-cd docs && python3 -m http.server 8888
+# Serve by path rather than from inside docs/, so each rebuild swapped into docs/ is picked up
+python3 -m http.server 8888 --directory docs
@@ -0,0 +1,157 @@
+import json
+import logging
+import sys
+import time
+
+# Every module logs through this logger (or a child of it)
+LOGGER_NAME = "ssg"
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def get_logger(name=None):
+    """Returns the build logger, or a named child of it."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, including fields passed via extra=."""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    Stream handler that collects formatted records and writes them in chunks,
+    instead of one write and flush per record. The buffer is flushed when it
+    fills up, when flush_interval seconds have passed, for any warning or
+    error (so problems show up immediately), and when logging shuts down.
+    """
+
+    def __init__(self, stream=None, capacity=512, flush_interval=0.5):
+        super().__init__(stream)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if (
+            len(self.buffer) >= self.capacity
+            or record.levelno >= logging.WARNING
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer:
+                self.stream.write("".join(self.buffer))
+                self.buffer = []
+            super().flush()
+            self.last_flush = time.monotonic()
+        finally:
+            self.release()
+
+
+class Progress:
+    """
+    A progress bar on a terminal, redrawn at most every 0.1s. On anything
+    else (a CI log, a pipe), or when disabled, it does nothing.
+    """
+
+    def __init__(self, total, label, enabled=True, stream=None):
+        self.stream = stream or sys.stderr
+        self.enabled = enabled and total > 0 and self.stream.isatty()
+        self.total = total
+        self.label = label
+        self.done = 0
+        self.last_draw = 0.0
+
+    def advance(self, count=1):
+        self.done += count
+        if self.enabled and (time.monotonic() - self.last_draw >= 0.1 or self.done >= self.total):
+            self._draw()
+
+    def close(self):
+        if self.enabled:
+            self._draw()
+            self.stream.write("\n")
+            self.stream.flush()
+
+    def _draw(self):
+        width = 30
+        filled = width * self.done // self.total
+        self.stream.write(f"\r{self.label} [{'#' * filled}{' ' * (width - filled)}] {self.done}/{self.total}")
+        self.stream.flush()
+        self.last_draw = time.monotonic()
+
+
+_progress_enabled = False
+
+
+def flush_logs():
+    """Writes out buffered records, e.g. before a pool worker returns its results."""
+    for handler in logging.getLogger(LOGGER_NAME).handlers:
+        handler.flush()
+
+
+def progress(total, label):
+    """Returns a Progress for total steps; a no-op unless configure_logging enabled progress bars."""
+    return Progress(total, label, _progress_enabled)
+
+
+def configure_logging(verbosity=0, log_format="text", show_progress=False, stream=None):
+    """
+    Sets up build logging. verbosity 0 logs aggregate counts and timings,
+    1 or more (-v) adds a line per file, and below 0 (-q) only warnings and
+    errors (-qq: errors only). log_format "json" writes one JSON object per
+    record for CI. show_progress draws a progress bar while pages render.
+    """
+    global _progress_enabled
+
+    if verbosity >= 1:
+        level = logging.DEBUG
+    elif verbosity == 0:
+        level = logging.INFO
+    elif verbosity == -1:
+        level = logging.WARNING
+    else:
+        level = logging.ERROR
+
+    handler = BufferedStreamHandler(stream or sys.stderr)
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for old_handler in list(logger.handlers):
+        logger.removeHandler(old_handler)
+        old_handler.close()
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    # The bar would interleave with per-file lines, so verbose output turns it off
+    _progress_enabled = show_progress and verbosity < 1 and log_format == "text"
+    return logger
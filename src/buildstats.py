@@ -0,0 +1,95 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from manifest import GENERATOR_VERSION
+
+# Per-page stages, in the order generate_page runs them; the template is
+# filled while the page is streamed to its file, so write includes it, and
+# to_html too unless the body was serialized on its own for the render cache
+PAGE_STAGES = ("read", "block_split", "inline_parse", "to_html", "write")
+
+REPORT_PATH = "build-report.json"
+
+
+class BuildTimer:
+    """
+    Collects where a build spends its time: wall time of site-wide phases
+    (static sync, walking content/, rendering, pruning) and, for every
+    rendered page, the time spent in each of PAGE_STAGES.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.totals = dict.fromkeys(PAGE_STAGES, 0.0)
+        self.pages = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Times a site-wide phase; repeated phases add up."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record_page(self, source, **stages):
+        """Records the seconds one page spent in each stage."""
+        self.add_page(source, stages)
+
+    def add_page(self, source, stages):
+        """Adds a page's stage timings, e.g. as reported back by a pool worker."""
+        self.pages[source] = stages
+        for stage, seconds in stages.items():
+            self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+
+    def add_stage(self, source, stage, seconds):
+        """Adds time to one stage of a recorded page, e.g. its write as timed by a PageWriter thread."""
+        stages = self.pages[source]
+        stages[stage] = stages.get(stage, 0.0) + seconds
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+
+    def slowest(self, count):
+        """Returns the count slowest pages as (source, total seconds, stages), slowest first."""
+        pages = sorted(self.pages.items(), key=lambda item: sum(item[1].values()), reverse=True)
+        return [(source, sum(stages.values()), stages) for source, stages in pages[:count]]
+
+    def report(self, slowest=10, **details):
+        """Returns the build report as a JSON-serializable dict; details are added as-is."""
+        return {
+            "generator_version": GENERATOR_VERSION,
+            **details,
+            "wall_seconds": time.perf_counter() - self.started,
+            "pages_rendered": len(self.pages),
+            "phases": self.phases,
+            "stages": self.totals,
+            "slowest_pages": [
+                {"source": source, "seconds": seconds, "stages": stages}
+                for source, seconds, stages in self.slowest(slowest)
+            ],
+        }
+
+    def write_report(self, path=REPORT_PATH, slowest=10, **details):
+        """Writes the build report as JSON, replacing the previous one atomically."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(slowest, **details), f, indent=1)
+        os.replace(tmp_path, path)
+
+    def summary(self, slowest=5):
+        """Returns human-readable lines summarizing stage totals and the slowest pages."""
+        lines = [f"Built {len(self.pages)} page(s) in {time.perf_counter() - self.started:.2f}s"]
+        if self.phases:
+            lines.append("  phases: " + ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.phases.items()))
+        if self.pages:
+            lines.append("  stages: " + ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in self.totals.items()))
+            lines.append("  slowest pages:")
+            for source, seconds, _ in self.slowest(slowest):
+                lines.append(f"    {seconds * 1000:8.2f}ms  {source}")
+        return lines
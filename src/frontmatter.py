@@ -0,0 +1,150 @@
+import datetime
+import re
+import tomllib
+
+# A page's front matter sits between two delimiter lines at the very top of
+# the file: --- for YAML-style "key: value" lines, +++ for TOML
+YAML_DELIMITER = "---"
+TOML_DELIMITER = "+++"
+
+INTEGER_PATTERN = re.compile(r'[-+]?\d+')
+
+
+def split_front_matter(text):
+    """
+    Splits a markdown file's text into (front matter dict, body). Text that
+    does not start with a delimiter line, or whose opening delimiter is never
+    closed (e.g. a page starting with a --- rule), has no front matter:
+    ({}, text). Raises ValueError for front matter that is not valid.
+    """
+    first_end = text.find('\n')
+    delimiter = _opening_delimiter(text[:first_end]) if first_end >= 0 else None
+    if delimiter is None:
+        return {}, text
+
+    position = first_end + 1
+    while True:
+        line_end = text.find('\n', position)
+        line = text[position:] if line_end < 0 else text[position:line_end]
+        if line.strip() == delimiter:
+            body = "" if line_end < 0 else text[line_end + 1:]
+            return parse_front_matter(text[first_end + 1:position], delimiter), body
+        if line_end < 0:
+            return {}, text
+        position = line_end + 1
+
+
+def read_front_matter(path):
+    """
+    Reads only the front matter of a markdown file, stopping at its closing
+    delimiter, so the body is never read. Returns {} for a file without one,
+    including one whose opening delimiter is never closed.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        delimiter = _opening_delimiter(first) if first.endswith('\n') else None
+        if delimiter is None:
+            return {}
+        header = []
+        for line in f:
+            if line.strip() == delimiter:
+                return parse_front_matter("".join(header), delimiter)
+            header.append(line)
+    return {}
+
+
+def skip_front_matter(lines):
+    """
+    Yields an iterable of lines (without newlines) minus any leading front
+    matter block. If the opening delimiter is never closed, every line is
+    yielded, as split_front_matter treats the text as having no front matter.
+    """
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return
+    delimiter = _opening_delimiter(first)
+    if delimiter is None:
+        yield first
+    else:
+        header = [first]
+        for line in lines:
+            if line.strip() == delimiter:
+                break
+            header.append(line)
+        else:
+            yield from header
+    yield from lines
+
+
+def parse_front_matter(header, delimiter=YAML_DELIMITER):
+    """
+    Parses the text between the delimiters. TOML (+++) uses tomllib; YAML
+    (---) supports the subset pages need: "key: value" pairs with strings,
+    numbers and booleans, and lists written as [a, b] or as "- item" lines.
+    Dates are returned as ISO strings either way.
+    """
+    if delimiter == TOML_DELIMITER:
+        try:
+            data = tomllib.loads(header)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Invalid TOML front matter: {e}") from None
+        return {key: _plain(value) for key, value in data.items()}
+
+    data = {}
+    key = None
+    for number, line in enumerate(header.split('\n'), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if stripped.startswith('- ') or stripped == '-':
+            if key is None or not isinstance(data[key], list):
+                raise ValueError(f"Invalid front matter line {number}: list item outside a list: {line!r}")
+            data[key].append(_scalar(stripped[1:].strip()))
+            continue
+
+        key, colon, value = line.partition(':')
+        key = key.strip()
+        if not colon or not key or line[0].isspace():
+            raise ValueError(f"Invalid front matter line {number}: expected 'key: value', got {line!r}")
+        value = value.strip()
+        if not value:
+            # Items follow on "- " lines
+            data[key] = []
+        elif value.startswith('[') and value.endswith(']'):
+            data[key] = [_scalar(item.strip()) for item in value[1:-1].split(',') if item.strip()]
+        else:
+            data[key] = _scalar(value)
+    return data
+
+
+def _opening_delimiter(line):
+    stripped = line.strip()
+    # A delimiter only opens front matter on the very first line, without indentation
+    if line.startswith(stripped) and stripped in (YAML_DELIMITER, TOML_DELIMITER):
+        return stripped
+    return None
+
+
+def _scalar(value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    lowered = value.lower()
+    if lowered in ('true', 'yes'):
+        return True
+    if lowered in ('false', 'no'):
+        return False
+    if INTEGER_PATTERN.fullmatch(value):
+        return int(value)
+    return value
+
+
+def _plain(value):
+    """Makes a TOML value JSON-serializable, so it can be cached in the manifest."""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
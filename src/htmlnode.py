@@ -1,45 +1,146 @@
+from types import MappingProxyType
+
+from minify import PRESERVED_TAGS, attributes_to_html, collapse_whitespace
+
+# Shared, read-only defaults so nodes without children or props don't each
+# allocate their own empty list and dict
+EMPTY_CHILDREN = ()
+EMPTY_PROPS = MappingProxyType({})
+
 class HtmlNode:
+    __slots__ = ("tag_name", "value", "children", "props")
+
     def __init__(self, tag_name=None, value=None, children=None, props=None):
         self.tag_name = tag_name
         self.value = value
+        # The base class is not used for real pages, so it keeps a fresh list
         self.children = children if children is not None else []
-        self.props = props if props is not None else {}
+        self.props = props if props is not None else EMPTY_PROPS
 
-    def to_html(self):
+    def to_html(self, minify=False):
         raise NotImplementedError("Subclasses must implement to_html method")
 
-    def props_to_html(self):
-        props_html = ""
-        for key, value in self.props.items():
-            props_html += f' {key}="{value}"'
-        return props_html
+    def iter_html(self, minify=False):
+        """
+        Yields the node's HTML in chunks that concatenate to to_html().
+        With minify, whitespace in text is collapsed and attribute values
+        are left unquoted where possible, except inside PRESERVED_TAGS.
+        """
+        # Subclasses that predate minify may override to_html() without it
+        yield self.to_html(minify) if minify else self.to_html()
+
+    def write_html(self, fp, minify=False):
+        """Writes the node's HTML to a file-like object without building it as one string."""
+        fp.writelines(self.iter_html(minify))
+
+    def props_to_html(self, minify=False):
+        if not self.props:
+            return ""
+        if minify:
+            return attributes_to_html(self.props.items())
+        return "".join(f' {key}="{value}"' for key, value in self.props.items())
 
     def __repr__(self):
-        return f"HtmlNode(tag_name={self.tag_name!r}, value={self.value!r}, children={self.children}, props={self.props})"
+        return f"HtmlNode(tag_name={self.tag_name!r}, value={self.value!r}, children={list(self.children)}, props={dict(self.props)})"
 
 class LeafNode(HtmlNode):
+    __slots__ = ()
+
     def __init__(self, tag_name, value, props=None):
-        super().__init__(tag_name, value, None, props)
+        self.tag_name = tag_name
+        self.value = value
+        self.children = EMPTY_CHILDREN
+        self.props = props if props is not None else EMPTY_PROPS
 
-    def to_html(self):
+    def to_html(self, minify=False):
         if self.value is None:
             raise ValueError("All leaf nodes must have a value")
 
+        value = self._minified_value() if minify else self.value
         if self.tag_name is None:
-            return self.value
+            return value
+
+        return f"<{self.tag_name}{self.props_to_html(minify)}>{value}</{self.tag_name}>"
+
+    def iter_html(self, minify=False):
+        if self.value is None:
+            raise ValueError("All leaf nodes must have a value")
+
+        value = self._minified_value() if minify else self.value
+        if self.tag_name is None:
+            yield value
+            return
+
+        # The value is yielded as-is so long text (e.g. code blocks) is never copied
+        yield f"<{self.tag_name}{self.props_to_html(minify)}>"
+        yield value
+        yield f"</{self.tag_name}>"
 
-        return f"<{self.tag_name}{self.props_to_html()}>{self.value}</{self.tag_name}>"
+    def _minified_value(self):
+        if self.tag_name in PRESERVED_TAGS:
+            return self.value
+        return collapse_whitespace(self.value)
 
 class ParentNode(HtmlNode):
+    __slots__ = ()
+
     def __init__(self, tag_name, children, props=None):
-        super().__init__(tag_name, None, children, props)
+        self.tag_name = tag_name
+        self.value = None
+        self.children = children
+        self.props = props if props is not None else EMPTY_PROPS
+
+    def to_html(self, minify=False):
+        return "".join(self.iter_html(minify))
+
+    def iter_html(self, minify=False):
+        if minify:
+            yield from self._iter_minified_html()
+            return
+
+        # Walks the tree with an explicit stack, so no level builds its own
+        # string of its children's HTML before handing it to its parent
+        yield self._open_tag()
+        stack = [iter(self.children)]
+        closing_tags = [f"</{self.tag_name}>"]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                yield closing_tags.pop()
+            elif isinstance(child, ParentNode):
+                yield child._open_tag()
+                stack.append(iter(child.children))
+                closing_tags.append(f"</{child.tag_name}>")
+            else:
+                yield from child.iter_html()
+
+    def _iter_minified_html(self):
+        # The same walk as iter_html, also tracking whether the current node
+        # is inside a PRESERVED_TAGS element, whose text is kept as written
+        preserved = self.tag_name in PRESERVED_TAGS
+        yield self._open_tag(True)
+        stack = [(iter(self.children), f"</{self.tag_name}>", preserved)]
+        while stack:
+            children, closing_tag, preserved = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                yield closing_tag
+            elif isinstance(child, ParentNode):
+                yield child._open_tag(True)
+                stack.append((iter(child.children), f"</{child.tag_name}>",
+                              preserved or child.tag_name in PRESERVED_TAGS))
+            elif preserved:
+                yield from child.iter_html()
+            else:
+                yield from child.iter_html(True)
 
-    def to_html(self):
+    def _open_tag(self, minify=False):
         if self.tag_name is None:
             raise ValueError("All parent nodes must have a tag name")
 
         if not self.children:
             raise ValueError("All parent nodes must have children")
 
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag_name}{self.props_to_html()}>{children_html}</{self.tag_name}>"
+        return f"<{self.tag_name}{self.props_to_html(minify)}>"
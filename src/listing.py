@@ -0,0 +1,192 @@
+import hashlib
+import html
+import json
+import os
+
+from htmlnode import LeafNode, ParentNode
+from pagewriter import PageWriter, prepare_directories
+
+# Pages listed on each page of a section listing
+DEFAULT_PAGE_SIZE = 10
+
+# Front matter keys a listing shows, besides the title
+LISTED_KEYS = ("date", "description")
+
+
+class ListingStats:
+    def __init__(self):
+        self.rendered = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.failures = []
+
+    def __repr__(self):
+        return (
+            f"ListingStats(rendered={self.rendered}, unchanged={self.unchanged}, "
+            f"removed={self.removed}, failures={self.failures})"
+        )
+
+
+def page_metadata(front_matter, title):
+    """
+    Returns what a section listing shows of a page: its title (as rendered)
+    and the LISTED_KEYS of its front matter. Collected while the page is
+    rendered and kept in the manifest, so listings never reread the page.
+    """
+    metadata = {"title": title}
+    for key in LISTED_KEYS:
+        if front_matter.get(key) is not None:
+            metadata[key] = str(front_matter[key])
+    return metadata
+
+
+def find_sections(sources, dir_path_content):
+    """
+    Groups pages into sections: every directory below dir_path_content that
+    has no index.md of its own gets a listing of all the pages beneath it.
+    A page is its directory's index.md or another .md file in it.
+    Returns {section directory: [source, ...]} with sources in input order.
+    """
+    root = os.path.normpath(dir_path_content)
+    sections = {}
+    has_index = {}
+    for source in sources:
+        directory = os.path.dirname(os.path.normpath(source))
+        if os.path.basename(source) == "index.md":
+            # The page is its directory, so the sections start one level up
+            directory = os.path.dirname(directory)
+        while directory.startswith(root + os.sep):
+            if directory not in has_index:
+                has_index[directory] = os.path.exists(os.path.join(directory, "index.md"))
+            if not has_index[directory]:
+                sections.setdefault(directory, []).append(source)
+            directory = os.path.dirname(directory)
+    return sections
+
+
+def sort_pages(sources, metadata):
+    """Sorts sources newest first by their date, then by title; undated pages go last."""
+    by_title = sorted(sources, key=lambda source: (metadata[source]["title"].lower(), source))
+    return sorted(by_title, key=lambda source: metadata[source].get("date", ""), reverse=True)
+
+
+def listing_output_path(section, number, dir_path_content, dest_dir_path):
+    """Returns the HTML path of a section listing's page number (from 1), e.g. blog/page/2/index.html."""
+    directory = os.path.join(dest_dir_path, os.path.relpath(section, dir_path_content))
+    if number > 1:
+        directory = os.path.join(directory, "page", str(number))
+    return os.path.normpath(os.path.join(directory, "index.html"))
+
+
+def page_url(output, dest_dir_path):
+    """Returns the site-absolute URL of an output file, e.g. /blog/post/ for blog/post/index.html."""
+    url = "/" + os.path.relpath(output, dest_dir_path).replace(os.sep, "/")
+    if url.endswith("/index.html"):
+        url = url[:-len("index.html")]
+    return url
+
+
+def listing_title(section, number):
+    """Titles a listing page after its directory, e.g. "Programming" or "Programming (page 2)"."""
+    title = os.path.basename(section).replace("-", " ").replace("_", " ").capitalize()
+    return title if number == 1 else f"{title} (page {number})"
+
+
+def listing_node(items, number, page_count, urls):
+    """
+    Builds the body of one listing page: a list of links to the pages in
+    items as (url, metadata) pairs, followed by links to the newer and
+    older listing pages, whose URLs are in urls (indexed by page number - 1).
+    """
+    entries = []
+    for url, metadata in items:
+        children = [LeafNode("a", html.escape(metadata["title"], quote=False), {"href": url})]
+        if "date" in metadata:
+            children.append(LeafNode("time", html.escape(metadata["date"], quote=False)))
+        if "description" in metadata:
+            children.append(LeafNode("p", html.escape(metadata["description"], quote=False)))
+        entries.append(ParentNode("li", children))
+    nodes = [ParentNode("ul", entries, {"class": "listing"})]
+
+    links = []
+    if number > 1:
+        links.append(LeafNode("a", "Newer", {"href": urls[number - 2], "rel": "prev"}))
+    if number < page_count:
+        links.append(LeafNode("a", "Older", {"href": urls[number], "rel": "next"}))
+    if links:
+        nodes.append(ParentNode("nav", links, {"class": "pagination"}))
+    return ParentNode("section", nodes)
+
+
+def listing_hash(section, number, page_count, sources):
+    """Hashes what a listing page shows besides its pages' metadata: which pages, in what order."""
+    data = json.dumps([section, number, page_count, sources])
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def listing_key(section, number):
+    """
+    Returns the name a listing page is recorded under in the manifest: its
+    path as if it were a file in content/, e.g. content/blog/page/2/index.html.
+    Unlike markdown sources, these never end in .md.
+    """
+    return listing_output_path(section, number, section, section)
+
+
+def generate_listings(metadata, dir_path_content, dest_dir_path, template, manifest=None, files=None,
+                      page_size=DEFAULT_PAGE_SIZE, basepath="/"):
+    """
+    Renders a paginated listing for every section (see find_sections) of
+    the pages in metadata, which maps each page's source to its output path
+    and page_metadata(): {source: (output, metadata)}.
+    With a BuildManifest, each listing page is recorded (see listing_key) as
+    depending on the metadata of the pages it lists and on files, the
+    {path: hash} of the template and its partials, and skipped while all of
+    those are unchanged. The pages listed must be recorded before this runs.
+    Listing pages no longer produced are forgotten and their output deleted.
+    Returns a ListingStats, whose failures are (output, error) pairs of
+    listing pages that could not be written.
+    """
+    stats = ListingStats()
+    rendered = []
+    produced = set()
+    pages_metadata = {source: page for source, (_, page) in metadata.items()}
+    with PageWriter() as writer:
+        for section, sources in sorted(find_sections(metadata, dir_path_content).items()):
+            sources = sort_pages(sources, pages_metadata)
+            chunks = [sources[i:i + page_size] for i in range(0, len(sources), page_size)]
+            outputs = [listing_output_path(section, number, dir_path_content, dest_dir_path)
+                       for number in range(1, len(chunks) + 1)]
+            urls = [page_url(output, dest_dir_path) for output in outputs]
+
+            for number, (chunk, output) in enumerate(zip(chunks, outputs), 1):
+                key = listing_key(section, number)
+                produced.add(key)
+                source_hash = listing_hash(section, number, len(chunks), chunk)
+                if manifest is not None and manifest.is_fresh(key, source_hash, template.render_hash(None), basepath,
+                                                              output):
+                    stats.unchanged += 1
+                    continue
+
+                items = [(page_url(metadata[source][0], dest_dir_path), pages_metadata[source]) for source in chunk]
+                page = template.iter_render(
+                    Title=listing_title(section, number),
+                    Content=listing_node(items, number, len(chunks), urls),
+                )
+                prepare_directories([output])
+                writer.submit(output, page)
+                rendered.append((key, source_hash, output, chunk))
+
+    stats.failures = writer.failures
+    stats.rendered = len(rendered) - len(writer.failures)
+    if manifest is not None:
+        failed = dict(writer.failures)
+        for key, source_hash, output, chunk in rendered:
+            if output not in failed:
+                uses = {source: manifest.metadata_hash(source) for source in chunk}
+                manifest.record(key, source_hash, template.render_hash(None), basepath, output, files, uses)
+        for key in sorted(manifest.pages):
+            if not key.endswith(".md") and key not in produced:
+                manifest.remove(key, dest_dir_path)
+                stats.removed += 1
+    return stats
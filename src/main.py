@@ -1,149 +1,1008 @@
+import argparse
+import contextlib
+import cProfile
+import io
 import os
+import pstats
 import shutil
 import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
 # Add the src directory to the path so we can import modules
 sys.path.append(os.path.dirname(__file__))
 
-from textnode import TextNode, TextType, markdown_to_html_node, extract_title
+from textnode import (
+    StreamedHtml,
+    blocks_to_document,
+    extract_title_from_lines,
+    iter_markdown_html,
+    scan_blocks,
+)
+from frontmatter import read_front_matter, skip_front_matter, split_front_matter
+from listing import DEFAULT_PAGE_SIZE, generate_listings, page_metadata, page_url
+from manifest import BuildManifest, MANIFEST_PATH, hash_file
+from rendercache import RenderCache, DEFAULT_MAX_BYTES
+from search import SEARCH_STORE_PATH, SearchIndex, page_terms
+from buildstats import BuildTimer, REPORT_PATH
+from buildlog import configure_logging, flush_logs, get_logger, progress
+from pagewriter import PageWriter, prepare_directories, write_chunks_if_changed
+from precompress import precompress, remove_siblings
+from publish import list_builds, prepare_staging, publish, rollback
+from staticsync import sync_static
+from template import Template, normalize_basepath
+from watch import DevServer, create_watcher
+
+log = get_logger()
+
+# Templates named in front matter, compiled once per (path, basepath) and
+# recompiled when the size or mtime of the file or one of its partials changes
+_templates = {}
+
+# Markdown files at least this large are rendered block by block as they are
+# read (see stream_page) rather than loaded and parsed whole
+STREAM_THRESHOLD = 16 * 1024 * 1024
 
 def copy_static_to_public(source_dir="static", dest_dir="docs"):
     """
-    Recursively copies all contents from source directory to destination directory.
-    Deletes destination directory contents first to ensure clean copy.
+    Copies static assets into the destination directory with sync_static,
+    without a manifest: files already there and unchanged are left alone,
+    but nothing is removed. Returns the SyncStats, or None without a source.
+    """
+    if not os.path.exists(source_dir):
+        log.warning(f"Source directory {source_dir} does not exist")
+        return None
+
+    os.makedirs(dest_dir, exist_ok=True)
+    _, stats = sync_static(source_dir, dest_dir)
+    return stats
+
+def sync_static_to_public(manifest, source_dir="static", dest_dir="docs", checksum=False, link=False):
+    """
+    Incrementally syncs static assets into the destination directory, copying
+    only new or changed files and removing assets deleted from the source.
+    The synced asset list is stored in the manifest for the next run.
     """
-    print(f"Starting copy from {source_dir} to {dest_dir}")
-    
-    # Check if source directory exists
     if not os.path.exists(source_dir):
-        print(f"Source directory {source_dir} does not exist")
+        log.warning(f"Source directory {source_dir} does not exist")
         return
-    
-    # Delete destination directory if it exists to ensure clean copy
-    if os.path.exists(dest_dir):
-        print(f"Removing existing {dest_dir} directory")
-        shutil.rmtree(dest_dir)
-    
-    # Create destination directory
-    print(f"Creating {dest_dir} directory")
-    os.mkdir(dest_dir)
-    
-    # Copy all contents recursively
-    copy_directory_contents(source_dir, dest_dir)
-    print(f"Finished copying from {source_dir} to {dest_dir}")
 
-def copy_directory_contents(source_dir, dest_dir):
+    os.makedirs(dest_dir, exist_ok=True)
+    manifest.assets, stats = sync_static(source_dir, dest_dir, manifest.assets, checksum, link)
+    log.info(
+        f"Synced {source_dir} to {dest_dir}: {stats.copied} copied, "
+        f"{stats.skipped} unchanged, {stats.removed} removed",
+        extra={"copied": stats.copied, "unchanged": stats.skipped, "removed": stats.removed},
+    )
+
+def precompress_output(manifest, dest_dir="docs", enabled=True, previous_dir=None):
     """
-    Recursively copies all files and subdirectories from source to destination.
+    Brings the .gz/.br siblings of the generated files in dest_dir up to date
+    (see precompress.py), keeping their records in the manifest. When not
+    enabled, deletes the siblings an earlier build wrote instead, as a web
+    server serving them would otherwise return stale pages.
     """
-    # List all items in source directory
-    items = os.listdir(source_dir)
-    
-    for item in items:
-        source_path = os.path.join(source_dir, item)
-        dest_path = os.path.join(dest_dir, item)
-        
-        if os.path.isfile(source_path):
-            # Copy file and log the operation
-            print(f"Copying file: {source_path} -> {dest_path}")
-            shutil.copy(source_path, dest_path)
-        else:
-            # It's a directory - create it in destination and recurse
-            print(f"Creating directory: {dest_path}")
-            os.mkdir(dest_path)
-            copy_directory_contents(source_path, dest_path)
+    if not enabled:
+        if manifest.compressed:
+            removed = remove_siblings(dest_dir, manifest.compressed)
+            manifest.compressed = {}
+            log.info(f"Removed {removed} precompressed file(s) from {dest_dir}", extra={"removed": removed})
+        return
+
+    manifest.compressed, stats = precompress(dest_dir, manifest.compressed, previous_dir)
+    log.info(
+        f"Precompressed {dest_dir}: {stats.compressed} compressed, {stats.unchanged} unchanged, "
+        f"{stats.removed} removed, {stats.bytes_saved} bytes saved",
+        extra={"compressed": stats.compressed, "unchanged": stats.unchanged, "removed": stats.removed,
+               "bytes_saved": stats.bytes_saved},
+    )
 
-def generate_page(from_path, template_path, dest_path, basepath="/"):
+def generate_page(from_path, template_path, dest_path, basepath="/", template=None, cache=None, timer=None,
+                  writer=None, search=None):
     """
     Generates an HTML page from a markdown file using a template.
+    Pass an already compiled Template to avoid re-reading template_path for
+    every page; it must have been compiled with the same basepath.
+    With a RenderCache, the page body is looked up by the markdown's hash
+    before parsing, and stored there after a miss along with the title and
+    headings of the parse, so a hit needs no other pass over the markdown.
+    With a BuildTimer, the time spent in each stage is recorded for the page.
+    With a PageWriter, the page's chunks are queued for it to render and
+    write instead of written here, and dest_path's directory must already
+    exist (see prepare_directories); the write stage then only times the
+    hand-off, and the caller adds the writer's time (see _add_write_times).
+    Timing does not change how a page is rendered: unless it is cached, the
+    body is serialized while the page is written, as part of the write stage.
+    Markdown files of STREAM_THRESHOLD bytes or more bypass the cache and
+    writer and are streamed with stream_page.
+    Front matter at the top of the file is not rendered: its title replaces
+    the h1 as the page title, and its template (a path like template_path)
+    replaces the given template.
+    Returns the page's metadata for section listings (see page_metadata),
+    taken from the same parse as the page.
+    With a search dict, the page's search terms are counted from its tree
+    (see page_terms) and stored in it under from_path, unless the tree was
+    never built (a cached body, a streamed page).
     """
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    log.debug(f"Generating page from {from_path} to {dest_path} using {template_path}",
+              extra={"source": from_path, "dest": dest_path})
+    clock = time.perf_counter
+    start = clock()
+
+    if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+        front_matter = read_front_matter(from_path)
+        template = page_template(front_matter, template_path, basepath, template)
+        page_title = stream_page(from_path, dest_path, template, timer, front_matter)
+        return page_metadata(front_matter, page_title)
     
     # Read the markdown file
     with open(from_path, 'r', encoding='utf-8') as f:
         markdown_content = f.read()
+    front_matter, markdown_content = split_front_matter(markdown_content)
     
-    # Read the template file
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
-    
-    # Convert markdown to HTML
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    
-    # Extract the title from markdown
-    page_title = extract_title(markdown_content)
+    # Compile the template file unless the caller already did
+    template = page_template(front_matter, template_path, basepath, template)
     
-    # Replace placeholders in template
-    final_html = template_content.replace("{{ Title }}", page_title)
-    final_html = final_html.replace("{{ Content }}", html_content)
+    # Look for the same markdown rendered before
+    content = None
+    page_title = front_matter.get("title")
+    if page_title is not None:
+        page_title = str(page_title)
+    if cache is not None:
+        cache_key = cache.key(markdown_content, template.minify)
+        entry = cache.get_entry(cache_key)
+        if entry is not None:
+            content, cached = entry
+            if page_title is None:
+                page_title = cached.get("title")
+    read_done = split_done = parse_done = clock()
     
-    # Replace path references with basepath
-    # Ensure basepath ends with / if it's not just "/"
-    if basepath != "/" and not basepath.endswith("/"):
-        basepath = basepath + "/"
+    if content is None:
+        # Convert markdown to HTML
+        blocks = scan_blocks(markdown_content)
+        split_done = clock()
+        # The title comes out of the same parse as the body
+        document = blocks_to_document(markdown_content, blocks)
+        content = document.root
+        if page_title is None:
+            page_title = document.title
+        parse_done = clock()
+        if search is not None:
+            search[from_path] = page_terms(content)
+        if cache is not None:
+            # Caching needs the body as a string; otherwise the tree is streamed
+            # into the page as it is written, and to_html is timed as part of write
+            content = content.to_html(template.minify)
+            cache.put(cache_key, content, {"title": document.title, "headings": document.headings})
+    html_done = clock()
     
-    # Replace href and src attributes that start with /
-    final_html = final_html.replace('href="/', f'href="{basepath}')
-    final_html = final_html.replace('src="/', f'src="{basepath}')
+    if page_title is None:
+        # Raises for a page without an h1 (or a title in its front matter)
+        page_title = extract_title_from_lines(markdown_content.split('\n'))
     
-    # Create destination directory if it doesn't exist
+    # The filled template is streamed, serializing the HTML tree chunk by chunk
+    # and rewriting href and src attributes that start with /, so the page is
+    # never built as one string
+    if writer is not None:
+        # The writer thread renders the chunks as it compares and writes them
+        writer.submit(dest_path, template.iter_render(Title=page_title, Content=content))
+    else:
+        # Create destination directory if it doesn't exist
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir and not os.path.exists(dest_dir):
+            os.makedirs(dest_dir)
+        with open(dest_path, 'w', encoding='utf-8') as f:
+            template.write(f, Title=page_title, Content=content)
+    if timer is not None:
+        # Filling the template and writing are interleaved, so they are timed together
+        timer.record_page(
+            from_path,
+            read=read_done - start,
+            block_split=split_done - read_done,
+            inline_parse=parse_done - split_done,
+            to_html=html_done - parse_done,
+            write=clock() - html_done,
+        )
+    return page_metadata(front_matter, page_title)
+
+def stream_page(from_path, dest_path, template, timer=None, front_matter=None):
+    """
+    Renders a markdown file while reading it line by line, writing each
+    block's HTML as soon as the block is complete, so memory use is bounded
+    by the largest block rather than the file. Unless front_matter has a
+    title, the file is read twice: once up to its h1, which the template
+    needs before the body, then in full.
+    The page is compared with the existing file as it is rendered and only
+    written if it changed (see write_chunks_if_changed).
+    Returns the page title.
+    """
+    clock = time.perf_counter
+    start = clock()
+    if front_matter and front_matter.get("title") is not None:
+        page_title = str(front_matter["title"])
+    else:
+        with open(from_path, 'r', encoding='utf-8') as f:
+            page_title = extract_title_from_lines(skip_front_matter(_file_lines(f)))
+    title_done = clock()
+
     dest_dir = os.path.dirname(dest_path)
-    if dest_dir and not os.path.exists(dest_dir):
-        os.makedirs(dest_dir)
-    
-    # Write the final HTML to destination
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
+    if dest_dir:
+        os.makedirs(dest_dir, exist_ok=True)
+    with open(from_path, 'r', encoding='utf-8') as source:
+        body = skip_front_matter(_file_lines(source))
+        write_chunks_if_changed(dest_path, template.iter_render(
+            Title=page_title, Content=StreamedHtml(iter_markdown_html(body, template.minify))))
+
+    if timer is not None:
+        # Parsing, serializing and writing are interleaved, so they are timed together
+        timer.record_page(from_path, read=title_done - start, to_html=clock() - title_done)
+    return page_title
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
+def page_template(front_matter, template_path, basepath="/", template=None):
     """
-    Recursively generates HTML pages from all markdown files in a content directory.
-    Maintains the same directory structure in the destination.
+    Returns the compiled Template for a page: the one named by its front
+    matter's template key, otherwise template, compiled from template_path
+    if not given. A named template is minified if template is.
     """
-    print(f"Crawling {dir_path_content} for markdown files...")
-    
-    # Get all entries in the content directory
-    if not os.path.exists(dir_path_content):
-        print(f"Content directory {dir_path_content} does not exist")
-        return
-    
-    entries = os.listdir(dir_path_content)
-    
-    for entry in entries:
+    path = front_matter.get("template")
+    if path is None or path == template_path:
+        return template if template is not None else Template.load(template_path, basepath)
+
+    minify = template is not None and template.minify
+    cached = _templates.get((path, basepath, minify))
+    if cached is not None and cached[1] == _file_stats([path, *cached[0].includes]):
+        return cached[0]
+    template = Template.load(path, basepath, minify)
+    _templates[(path, basepath, minify)] = (template, _file_stats([path, *template.includes]))
+    return template
+
+def _file_stats(paths):
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stats.append((stat.st_size, stat.st_mtime_ns))
+    return stats
+
+def template_files(manifest, front_matter, template_path, basepath="/", template=None):
+    """
+    Returns {path: hash} of the template files a page is rendered with: its
+    template (see page_template) followed by that template's partials.
+    """
+    path = front_matter.get("template", template_path)
+    includes = page_template(front_matter, template_path, basepath, template).includes
+    return manifest.file_hashes([path, *includes])
+
+def _file_lines(f):
+    """Yields the lines of a text file without their newlines, like str.split('\\n')."""
+    for line in f:
+        yield line[:-1] if line.endswith('\n') else line
+
+class PageBuildError(Exception):
+    """Raised after a build in which one or more pages failed to render."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        details = "\n".join(f"  {source}: {error}" for source, error in failures)
+        super().__init__(f"Failed to generate {len(failures)} page(s):\n{details}")
+
+def discover_pages(dir_path_content, dest_dir_path):
+    """
+    Walks the content directory and returns a sorted list of
+    (markdown_path, html_path) pairs, mirroring the directory structure.
+    """
+    pages = []
+    for entry in sorted(os.listdir(dir_path_content)):
         entry_path = os.path.join(dir_path_content, entry)
-        
+
         if os.path.isfile(entry_path):
             # Check if it's a markdown file
             if entry.endswith('.md'):
                 # Generate corresponding HTML file path
                 html_filename = entry.replace('.md', '.html')
-                dest_file_path = os.path.join(dest_dir_path, html_filename)
-                
-                # Generate the page with basepath
-                generate_page(entry_path, template_path, dest_file_path, basepath)
+                pages.append((entry_path, os.path.join(dest_dir_path, html_filename)))
         else:
             # It's a directory - recurse into it
-            subdest_dir = os.path.join(dest_dir_path, entry)
-            generate_pages_recursive(entry_path, template_path, subdest_dir, basepath)
+            pages.extend(discover_pages(entry_path, os.path.join(dest_dir_path, entry)))
+    return pages
+
+def _phase(timer, name):
+    """Times a build phase when a BuildTimer is in use."""
+    return timer.phase(name) if timer is not None else contextlib.nullcontext()
+
+def page_output_path(source, dir_path_content, dest_dir_path):
+    """Returns the HTML path discover_pages maps a markdown file (or directory) to."""
+    rel_dir, name = os.path.split(os.path.relpath(source, dir_path_content))
+    if name.endswith('.md'):
+        name = name.replace('.md', '.html')
+    return os.path.normpath(os.path.join(dest_dir_path, rel_dir, name))
+
+def generate_page_batch(pages, template_path, basepath="/", template=None, cache=None, timed=False, search=False):
+    """
+    Generates a batch of pages and returns a list of (markdown_path, error,
+    stages, metadata, terms) tuples, where error is None on success, stages
+    holds the page's stage timings when timed is True, metadata is what
+    generate_page returned and terms the page's search terms when search is
+    True and they were counted. Runs inside pool workers, so exceptions
+    are reported as strings rather than raised. Pages are written by a
+    PageWriter while the next ones render.
+    """
+    timer = BuildTimer() if timed else None
+    terms = {} if search else None
+    results = []
+    with PageWriter() as writer:
+        for from_path, dest_path in pages:
+            try:
+                metadata = generate_page(from_path, template_path, dest_path, basepath, template, cache, timer, writer,
+                                         terms)
+                results.append((from_path, None, timer.pages[from_path] if timer else None, metadata,
+                                terms.pop(from_path, None) if search else None))
+            except Exception as e:
+                results.append((from_path, f"{type(e).__name__}: {e}", None, None, None))
+    _add_write_times(timer, pages, writer)
+    results = _with_write_failures(results, pages, writer)
+    # Worker processes exit without shutting logging down
+    flush_logs()
+    return results
+
+def _add_write_times(timer, pages, writer):
+    """Adds the time writer threads spent filling in and writing each page to its write stage."""
+    if timer is None:
+        return
+    for source, dest in pages:
+        if source in timer.pages and dest in writer.durations:
+            timer.add_stage(source, "write", writer.durations[dest])
+
+def _with_write_failures(results, pages, writer):
+    """Marks the results of pages the writer failed to write as failed."""
+    if not writer.failures:
+        return results
+    sources = {dest: source for source, dest in pages}
+    errors = {sources[dest]: error for dest, error in writer.failures}
+    return [(source, errors.get(source, error), *rest) for source, error, *rest in results]
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/", manifest=None, jobs=1,
+                             cache=None, timer=None, drafts=False, page_size=DEFAULT_PAGE_SIZE, search=None,
+                             minify=False):
+    """
+    Recursively generates HTML pages from all markdown files in a content directory.
+    Maintains the same directory structure in the destination.
+    When a BuildManifest is given, pages whose markdown, template (with its
+    partials) and basepath are unchanged since the last build are skipped,
+    and every rendered page is recorded in the manifest.
+    With jobs > 1, pages are rendered in a pool of worker processes. Either
+    way, failures (including front matter or a page template that cannot be
+    read) are collected and raised together as a PageBuildError once all pages ran.
+    Rendered pages are written by PageWriter threads, and output files whose
+    bytes would not change are left untouched.
+    A RenderCache, if given, is shared by every page (see generate_page).
+    A BuildTimer, if given, records the walk and render phases and every page's stages.
+    Pages whose front matter sets draft are left out unless drafts is True.
+    Then every directory without an index.md gets a listing of the pages
+    below it, page_size to a listing page (none if page_size is 0), made
+    from the metadata the pages were rendered with or, for unchanged pages,
+    the metadata recorded for them (see generate_listings).
+    With a SearchIndex, the search index in dest_dir_path is updated last,
+    using the terms counted while pages rendered; pages left unchanged keep
+    their terms from earlier builds.
+    With minify, pages and listings are written minified (see Template).
+    """
+    log.debug(f"Crawling {dir_path_content} for markdown files...")
+    
+    # Get all entries in the content directory
+    if not os.path.exists(dir_path_content):
+        log.warning(f"Content directory {dir_path_content} does not exist")
+        return
+    
+    pending = []
+    hashes = {}
+    fresh = []
+    skipped = 0
+    skipped_drafts = 0
+    walk_failures = []
+    with _phase(timer, "walk"):
+        # Compile the template once for the whole build
+        template = Template.load(template_path, basepath, minify)
+        pages = discover_pages(dir_path_content, dest_dir_path)
+        for source, dest in pages:
+            try:
+                # Only the header is read, or nothing if the manifest has it cached
+                front_matter = (manifest.page_front_matter(source) if manifest is not None
+                                else read_front_matter(source))
+                if front_matter.get("draft") and not drafts:
+                    log.debug(f"Skipping draft {source}", extra={"source": source})
+                    skipped_drafts += 1
+                    continue
+                if manifest is not None:
+                    # Loads the page's own template, if its front matter names one
+                    source_hash = manifest.file_hash(source)
+                    files = template_files(manifest, front_matter, template_path, basepath, template)
+                    template_hash = template.render_hash(files[front_matter.get("template", template_path)])
+            except (OSError, ValueError) as e:
+                walk_failures.append((source, f"{type(e).__name__}: {e}"))
+                continue
+            if manifest is not None:
+                if manifest.is_fresh(source, source_hash, template_hash, basepath, dest):
+                    log.debug(f"Skipping unchanged page {source}", extra={"source": source})
+                    skipped += 1
+                    fresh.append((source, dest))
+                    continue
+                hashes[source] = (source_hash, template_hash, files)
+            pending.append((source, dest))
+
+    with _phase(timer, "render"):
+        # Create the output directory tree once, instead of checking for it per page
+        prepare_directories(dest for _, dest in pending)
+
+        terms = {} if search is not None else None
+        bar = progress(len(pending), "Rendering pages")
+        try:
+            if jobs > 1 and len(pending) > 1:
+                results = _generate_pages_parallel(pending, template_path, basepath, template, jobs, cache, timer, bar,
+                                                   terms)
+            else:
+                results = []
+                with PageWriter() as writer:
+                    for source, dest in pending:
+                        try:
+                            metadata = generate_page(source, template_path, dest, basepath, template, cache, timer,
+                                                     writer, terms)
+                            results.append((source, None, metadata))
+                        except Exception as e:
+                            results.append((source, f"{type(e).__name__}: {e}", None))
+                        bar.advance()
+                _add_write_times(timer, pending, writer)
+                results = _with_write_failures(results, pending, writer)
+        finally:
+            bar.close()
+
+    render_failures = [(source, error) for source, error, _ in results if error is not None]
+    # Pages that failed while being read are reported along with the others, in input order
+    order = {source: index for index, (source, _) in enumerate(pages)}
+    failures = sorted(walk_failures + render_failures, key=lambda failure: order[failure[0]])
+    log.info(
+        f"Rendered {len(results) - len(render_failures)} page(s) from {dir_path_content}, "
+        f"{skipped} unchanged, {skipped_drafts} draft(s) skipped, {len(failures)} failed",
+        extra={
+            "rendered": len(results) - len(render_failures),
+            "unchanged": skipped,
+            "drafts": skipped_drafts,
+            "failed": len(failures),
+        },
+    )
+    outputs = dict(pending)
+    if manifest is not None:
+        for source, error, metadata in results:
+            if error is None:
+                source_hash, template_hash, files = hashes[source]
+                manifest.record(source, source_hash, template_hash, basepath, outputs[source], files,
+                                metadata=metadata)
+
+    listed = {source: (outputs[source], metadata) for source, error, metadata in results if error is None}
+    for source, dest in fresh:
+        listed[source] = (dest, manifest.pages[source].get("metadata", {}))
+    if page_size > 0:
+        with _phase(timer, "listings"):
+            failures.extend(_generate_listings(listed, dir_path_content, dest_dir_path, template_path, template,
+                                               manifest, page_size, basepath))
+
+    if search is not None:
+        with _phase(timer, "search"):
+            if manifest is not None:
+                hashes = {source: manifest.pages[source]["source_hash"] for source in listed}
+            else:
+                hashes = {source: hash_file(source) for source in listed}
+            _update_search(search, listed, hashes, dest_dir_path, basepath, terms)
+
+    if failures:
+        raise PageBuildError(failures)
+
+def _update_search(search, listed, hashes, dest_dir_path, basepath, terms=None):
+    """
+    Updates the search index in dest_dir_path with the listed pages ({source:
+    (output, metadata)}, as for generate_listings), whose source hashes are
+    in hashes; terms holds the search terms already counted for some of them.
+    """
+    basepath = normalize_basepath(basepath)
+    entries = {
+        source: (hashes[source], basepath + page_url(output, dest_dir_path)[1:], metadata.get("title", ""))
+        for source, (output, metadata) in listed.items()
+    }
+    stats = search.update(entries, dest_dir_path, terms)
+    log.info(
+        f"Search index: {stats.indexed} page(s) indexed, {stats.unchanged} unchanged, {stats.removed} removed, "
+        f"{stats.shards_written} shard(s) written",
+        extra={
+            "indexed": stats.indexed,
+            "unchanged": stats.unchanged,
+            "removed": stats.removed,
+            "shards_written": stats.shards_written,
+        },
+    )
+
+def _generate_listings(listed, dir_path_content, dest_dir_path, template_path, template, manifest, page_size,
+                       basepath):
+    """Renders the section listings of the listed pages (see generate_listings) and returns its write failures."""
+    files = manifest.file_hashes([template_path, *template.includes]) if manifest is not None else None
+    stats = generate_listings(listed, dir_path_content, dest_dir_path, template, manifest, files, page_size, basepath)
+    if stats.rendered or stats.unchanged or stats.failures:
+        log.info(
+            f"Rendered {stats.rendered} listing page(s), {stats.unchanged} unchanged, "
+            f"{stats.removed} removed, {len(stats.failures)} failed",
+            extra={
+                "rendered": stats.rendered,
+                "unchanged": stats.unchanged,
+                "removed": stats.removed,
+                "failed": len(stats.failures),
+            },
+        )
+    return stats.failures
+
+def _generate_pages_parallel(pages, template_path, basepath, template, jobs, cache=None, timer=None, bar=None,
+                             search=None):
+    """
+    Fans pages out over a process pool in batches, returning (markdown_path,
+    error, metadata) tuples in input order. Stage timings reported by the workers are
+    added to the timer, search terms they counted to the search dict, and
+    the progress bar advances as batches finish.
+    """
+    # A few batches per worker keeps them all busy without paying IPC per page
+    batch_size = max(1, min(64, len(pages) // (jobs * 4)))
+    batches = [pages[i:i + batch_size] for i in range(0, len(pages), batch_size)]
+
+    results = []
+    # Forked workers inherit the log handler's buffer and would write it out again
+    flush_logs()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(generate_page_batch, batch, template_path, basepath, template, cache,
+                                   timer is not None, search is not None)
+                   for batch in batches]
+        for batch, future in zip(batches, futures):
+            for source, error, stages, metadata, terms in future.result():
+                if stages is not None:
+                    timer.add_page(source, stages)
+                if terms is not None:
+                    search[source] = terms
+                results.append((source, error, metadata))
+            if bar is not None:
+                bar.advance(len(batch))
+    return results
+
+def rebuild_changed(changed, manifest, basepath="/", content_dir="content", static_dir="static",
+                    template_path="template.html", dest_dir="docs", link=False, cache=None, drafts=False,
+                    page_size=DEFAULT_PAGE_SIZE, search=None, minify=False):
+    """
+    Brings the output up to date after the given input paths changed, redoing
+    only what depends on them: the page of a changed markdown file, the copy
+    of a changed static file, and the pages the manifest records as built
+    from a changed template or partial (see BuildManifest.dependents). A page
+    that became a draft is removed (unless drafts is True). Section listings
+    are then brought up to date from the metadata recorded for every page,
+    re-rendering only those whose pages were added, removed or changed, and
+    so is the search index, if a SearchIndex is given.
+    With minify, pages and listings are written minified.
+    Pages that fail to render are reported and skipped rather than raised.
+    Returns the number of output files written or removed.
+    """
+    for path in changed:
+        manifest.forget_hash(path)
+    updated = 0
+
+    pages = [
+        (source, page_output_path(source, content_dir, dest_dir))
+        for source in sorted(manifest.dependents(changed))
+        if os.path.isfile(source)
+    ]
+    for path in sorted(changed):
+        if not _is_within(path, content_dir):
+            continue
+        if os.path.isdir(path):
+            pages.extend(discover_pages(path, page_output_path(path, content_dir, dest_dir)))
+        elif path.endswith('.md') and os.path.isfile(path):
+            pages.append((path, page_output_path(path, content_dir, dest_dir)))
+
+    # Pages whose markdown was deleted or moved away
+    for source in sorted(manifest.pages):
+        if source.endswith('.md') and not os.path.isfile(source) and any(_is_within(source, path) for path in changed):
+            removed = manifest.remove(source, dest_dir)
+            if removed is not None:
+                log.debug(f"Removed stale page {removed}", extra={"dest": removed})
+                updated += 1
+
+    template = None
+    # Listings can change without any page being rendered, e.g. when one is deleted
+    if (pages or page_size > 0) and os.path.exists(template_path):
+        try:
+            template = Template.load(template_path, basepath, minify)
+        except (OSError, ValueError) as e:
+            log.error(f"Failed to load {template_path}: {type(e).__name__}: {e}")
+    terms = {} if search is not None else None
+    if pages and template is not None:
+        pages = dict(pages)
+        prepare_directories(pages.values())
+        rendered = []
+        with PageWriter() as writer:
+            for source, dest in pages.items():
+                try:
+                    front_matter = manifest.page_front_matter(source)
+                    if front_matter.get("draft") and not drafts:
+                        removed = manifest.remove(source, dest_dir)
+                        if removed is not None:
+                            log.debug(f"Removed draft page {removed}", extra={"dest": removed})
+                            updated += 1
+                        continue
+                    files = template_files(manifest, front_matter, template_path, basepath, template)
+                    template_hash = template.render_hash(files[front_matter.get("template", template_path)])
+                    source_hash = manifest.file_hash(source)
+                    if manifest.is_fresh(source, source_hash, template_hash, basepath, dest):
+                        continue
+                    metadata = generate_page(source, template_path, dest, basepath, template, cache, writer=writer,
+                                             search=terms)
+                except Exception as e:
+                    log.error(f"Failed to generate {source}: {type(e).__name__}: {e}", extra={"source": source})
+                    continue
+                rendered.append((source, source_hash, template_hash, dest, files, metadata))
+
+        failed = dict(writer.failures)
+        for source, source_hash, template_hash, dest, files, metadata in rendered:
+            if dest in failed:
+                log.error(f"Failed to write {dest}: {failed[dest]}", extra={"source": source, "dest": dest})
+                continue
+            manifest.record(source, source_hash, template_hash, basepath, dest, files, metadata=metadata)
+            updated += 1
+
+    listed = {
+        source: (entry["output"], entry["metadata"])
+        for source, entry in manifest.pages.items()
+        if source.endswith('.md') and "metadata" in entry
+    }
+    if page_size > 0 and template is not None:
+        stats = generate_listings(listed, content_dir, dest_dir, template, manifest,
+                                  manifest.file_hashes([template_path, *template.includes]), page_size, basepath)
+        for dest, error in stats.failures:
+            log.error(f"Failed to write {dest}: {error}", extra={"dest": dest})
+        updated += stats.rendered + stats.removed
+
+    if search is not None and (pages or any(_is_within(path, content_dir) for path in changed)):
+        hashes = {source: manifest.pages[source]["source_hash"] for source in listed}
+        _update_search(search, listed, hashes, dest_dir, basepath, terms)
+
+    static_paths = [os.path.relpath(path, static_dir) for path in changed if _is_within(path, static_dir)]
+    if static_paths and os.path.isdir(static_dir):
+        # A change reported for static/ itself (e.g. dropped events) means a full sync
+        paths = None if os.curdir in static_paths else static_paths
+        manifest.assets, stats = sync_static(static_dir, dest_dir, manifest.assets, link=link, paths=paths)
+        updated += stats.copied + stats.removed
+
+    return updated
+
+def _is_within(path, directory):
+    return path == directory or path.startswith(directory + os.sep)
+
+def watch(argv=None):
+    """
+    Builds the site incrementally, then keeps running: watches content/,
+    static/ and template.html, rebuilds only what a change affects, and
+    serves docs/ with pages that reload themselves after each rebuild.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py watch",
+        description="Rebuild the site as its sources change and serve docs/ with live reload.",
+    )
+    parser.add_argument("basepath", nargs="?", default="/",
+                        help='base path prepended to absolute links (default: "/")')
+    parser.add_argument("--host", default="localhost", help="address to serve on (default: localhost)")
+    parser.add_argument("--port", type=int, default=8888, help="port to serve on (default: 8888)")
+    parser.add_argument("--poll", action="store_true",
+                        help="poll for changes instead of using inotify")
+    parser.add_argument("--link-static", action="store_true",
+                        help="hard-link static files into docs/ instead of copying them")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always parse markdown instead of reusing cached renders")
+    parser.add_argument("--drafts", action="store_true", help="also build pages marked draft in their front matter")
+    _add_generated_page_arguments(parser)
+    _add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args.verbose - args.quiet, args.log_format)
+    basepath = args.basepath
+    cache = None if args.no_cache else RenderCache()
+
+    # Watch before building so edits made during the first build are not missed
+    roots = ["content", "static", "template.html"]
+    if os.path.isdir("templates"):
+        # Where templates named in front matter and partials usually live
+        roots.append("templates")
+    try:
+        # Partials the template includes from elsewhere
+        includes = Template.load("template.html").includes
+    except (OSError, ValueError):
+        includes = []
+    roots.extend(path for path in includes if not any(_is_within(path, root) for root in roots))
+    watcher = create_watcher(roots, poll=args.poll)
+
+    manifest = BuildManifest.load(MANIFEST_PATH)
+    search = None if args.no_search else SearchIndex.load(SEARCH_STORE_PATH)
+    sync_static_to_public(manifest, link=args.link_static)
+    try:
+        generate_pages_recursive("content", "template.html", "docs", basepath, manifest, cache=cache, drafts=args.drafts,
+                                 page_size=args.listing_size, search=search, minify=args.minify)
+        for removed in manifest.prune("docs"):
+            log.debug(f"Removed stale page {removed}", extra={"dest": removed})
+    except Exception as e:
+        log.error(f"Build failed: {e}")
+    precompress_output(manifest, enabled=args.precompress)
+    manifest.save()
+    if search is not None:
+        search.save()
+
+    server = DevServer("docs", args.host, args.port, basepath)
+    server.start()
+    log.info(f"Serving docs at {server.address}, watching for changes ({type(watcher).__name__})")
+
+    try:
+        while True:
+            # Records are otherwise only written once a later one arrives, so
+            # the last lines of a build would wait for the next change
+            flush_logs()
+            changed = watcher.wait()
+            start = time.perf_counter()
+            manifest.begin_build()
+            updated = rebuild_changed(changed, manifest, basepath, link=args.link_static, cache=cache,
+                                      drafts=args.drafts, page_size=args.listing_size, search=search,
+                                      minify=args.minify)
+            if updated:
+                precompress_output(manifest, enabled=args.precompress)
+            manifest.save()
+            if search is not None:
+                search.save()
+            if updated:
+                server.reload()
+                log.info(f"Rebuilt {updated} file(s) in {(time.perf_counter() - start) * 1000:.0f} ms",
+                         extra={"updated": updated})
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        server.shutdown()
+        if cache is not None:
+            cache.evict()
+
+def cache_command(argv=None):
+    """Manages the render cache: "main.py cache clear" deletes every cached page body."""
+    parser = argparse.ArgumentParser(prog="main.py cache", description="Manage the render cache.")
+    parser.add_argument("action", choices=["clear"])
+    _add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args.verbose - args.quiet, args.log_format)
+
+    if args.action == "clear":
+        cache = RenderCache()
+        cache.clear()
+        log.info(f"Cleared render cache {cache.directory}")
+
+def rollback_command(argv=None):
+    """
+    Restores a build kept with --keep-builds: "main.py rollback" swaps the
+    newest one back into docs/, "main.py rollback BUILD" a given one.
+    """
+    parser = argparse.ArgumentParser(prog="main.py rollback", description="Restore a previous build of docs/.")
+    parser.add_argument("build", nargs="?", help="id of the build to restore (default: the newest)")
+    parser.add_argument("--list", action="store_true", help="list the kept builds instead")
+    _add_logging_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_logging(args.verbose - args.quiet, args.log_format)
+
+    if args.list:
+        for build_id in list_builds():
+            print(build_id)
+        return
+
+    try:
+        replaced = rollback("docs", build_id=args.build, manifest_path=MANIFEST_PATH)
+    except ValueError as e:
+        log.error(str(e))
+        sys.exit(1)
+    log.info(f"Restored {args.build or 'the previous build'} into docs, replaced build kept as {replaced}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the static site from content/ into docs/.",
+        epilog='Run "main.py watch --help" for the rebuild-on-change dev server, '
+               '"main.py cache clear" to empty the render cache, '
+               'or "main.py rollback" to restore the previous build.',
+    )
+    parser.add_argument("basepath", nargs="?", default=None,
+                        help='base path prepended to absolute links (default: "/")')
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep docs/ and only re-render pages whose inputs changed")
+    parser.add_argument("--checksum", action="store_true",
+                        help="compare static files by content hash instead of size and mtime")
+    parser.add_argument("--link-static", action="store_true",
+                        help="hard-link static files into docs/ instead of copying them")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes used to render pages (0 = one per CPU)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always parse markdown instead of reusing renders from .ssg-cache/render")
+    parser.add_argument("--drafts", action="store_true", help="also build pages marked draft in their front matter")
+    _add_generated_page_arguments(parser)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="maximum size of the render cache in MiB (default: %(default)s)")
+    parser.add_argument("--report", default=REPORT_PATH,
+                        help="where to write the JSON build report (default: %(default)s)")
+    parser.add_argument("--slowest", type=int, default=5,
+                        help="number of slowest pages to list after the build (default: %(default)s)")
+    parser.add_argument("--profile", action="store_true",
+                        help="run the build under cProfile and tracemalloc and dump the results next to the report "
+                             "(worker processes are not profiled)")
+    parser.add_argument("--in-place", action="store_true",
+                        help="write into docs/ directly instead of building in a staging directory and swapping it in")
+    parser.add_argument("--keep-builds", type=int, default=0, metavar="N",
+                        help="keep the N previous builds in .ssg-cache/builds for \"main.py rollback\" (default: %(default)s)")
+    parser.add_argument("--progress", action="store_true",
+                        help="draw a progress bar while pages render (only on a terminal)")
+    _add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+def _add_generated_page_arguments(parser):
+    parser.add_argument("--listing-size", type=int, default=DEFAULT_PAGE_SIZE, metavar="N",
+                        help="pages per page of the generated section listings, 0 to not generate them "
+                             "(default: %(default)s)")
+    parser.add_argument("--no-search", action="store_true", help="do not write the search index to docs/search")
+    parser.add_argument("--minify", action="store_true",
+                        help="write pages without comments, insignificant whitespace and optional attribute quotes")
+    parser.add_argument("--precompress", action="store_true",
+                        help="write .gz (and .br, if the brotli module is installed) files next to each generated "
+                             "HTML, CSS, JS, JSON, SVG and XML file, for servers that serve them precompressed")
+
+def _add_logging_arguments(parser):
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="log every file generated, copied or skipped")
+    parser.add_argument("-q", "--quiet", action="count", default=0,
+                        help="only log warnings and errors (-qq: errors only)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text",
+                        help="log as plain text or as one JSON object per line (default: %(default)s)")
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "watch":
+        watch(argv[1:])
+        return
+    if argv and argv[0] == "cache":
+        cache_command(argv[1:])
+        return
+    if argv and argv[0] == "rollback":
+        rollback_command(argv[1:])
+        return
+
+    args = parse_args(argv)
+    configure_logging(args.verbose - args.quiet, args.log_format, args.progress)
+    timer = BuildTimer()
+
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        tracemalloc.start()
+        profiler.enable()
 
-def main():
     # Get basepath from command line arguments, default to "/"
     basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
-        print(f"Using basepath: {basepath}")
+    if args.basepath is not None:
+        basepath = args.basepath
+        log.debug(f"Using basepath: {basepath}")
     else:
-        print("Using default basepath: /")
-    
-    # Delete everything in docs directory
-    if os.path.exists("docs"):
-        shutil.rmtree("docs")
+        log.debug("Using default basepath: /")
     
-    # Copy static assets to docs directory
-    copy_static_to_public()
+    out_dir = "docs"
+    staging = None
+    if not args.in_place:
+        # Build beside the live docs/ and swap it in at the end, so docs/ is never half-written
+        staging = prepare_staging("docs", seed=args.incremental)
+        out_dir = staging
+
+    if args.incremental:
+        # Reuse the previous output and only redo what changed
+        manifest = BuildManifest.load(MANIFEST_PATH)
+        manifest.relocate("docs", out_dir)
+    else:
+        # Delete everything in docs directory
+        if staging is None and os.path.exists("docs"):
+            shutil.rmtree("docs")
+
+        # Start from an empty manifest so the next incremental build can use it,
+        # keeping only the front matter cache, which is checked against each file,
+        # and the records of precompressed files, checked against their hashes
+        previous = BuildManifest.load(MANIFEST_PATH)
+        manifest = BuildManifest(MANIFEST_PATH, front_matter=previous.front_matter, compressed=previous.compressed)
+
+    # Copy static assets to docs directory, skipping files that are already current
+    with timer.phase("static"):
+        sync_static_to_public(manifest, dest_dir=out_dir, checksum=args.checksum, link=args.link_static)
     
-    # Generate all pages recursively with basepath
-    generate_pages_recursive("content", "template.html", "docs", basepath)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+
+    # Reuse page bodies rendered from identical markdown in earlier builds
+    cache = None if args.no_cache else RenderCache(max_bytes=args.cache_size * 1024 * 1024)
+
+    # Search terms counted in earlier builds, so unchanged pages are not tokenized again
+    search = None if args.no_search else SearchIndex.load(SEARCH_STORE_PATH)
+
+    succeeded = False
+    try:
+        # Generate all pages recursively with basepath
+        generate_pages_recursive("content", "template.html", out_dir, basepath, manifest, jobs, cache, timer,
+                                 args.drafts, args.listing_size, search, args.minify)
+
+        # Remove pages whose markdown source no longer exists
+        with timer.phase("prune"):
+            for removed in manifest.prune(out_dir):
+                log.debug(f"Removed stale page {removed}", extra={"dest": removed})
+
+        # Siblings in the live docs/ are reused for files whose content did not change
+        with timer.phase("compress"):
+            precompress_output(manifest, out_dir, args.precompress, previous_dir="docs" if staging else None)
+        succeeded = True
+    except PageBuildError as e:
+        # The aggregated report of every failed page, rather than a traceback
+        log.error(str(e))
+    finally:
+        if staging is None:
+            if not succeeded:
+                # Pages that did render in docs/ must not be served with their old siblings
+                precompress_output(manifest, out_dir, args.precompress)
+            # Keep the record of pages that did render, even if others failed
+            manifest.save()
+            if search is not None:
+                search.save()
+        elif succeeded:
+            with timer.phase("publish"):
+                retired = publish(staging, "docs", keep=args.keep_builds, manifest_path=MANIFEST_PATH)
+                manifest.relocate(staging, "docs")
+                manifest.save()
+                if search is not None:
+                    search.save()
+            if retired is not None:
+                log.info(f'Previous build kept as {retired} (undo with "main.py rollback")')
+        else:
+            # The live docs/ and its manifest still describe the last good build
+            shutil.rmtree(staging, ignore_errors=True)
+            log.error("Build failed, docs/ left unchanged")
+        if cache is not None:
+            cache.evict()
+
+        details = {"basepath": basepath, "jobs": jobs, "incremental": args.incremental, "succeeded": succeeded}
+        if profiler is not None:
+            profiler.disable()
+            details.update(_dump_profile(profiler, os.path.dirname(args.report)))
+        timer.write_report(args.report, max(args.slowest, 10), **details)
+        for line in timer.summary(args.slowest):
+            log.info(line)
+        log.debug(f"Wrote build report to {args.report}")
+    if not succeeded:
+        sys.exit(1)
+
+def _dump_profile(profiler, directory):
+    """
+    Saves cProfile stats to build-profile.pstats, prints the most expensive
+    functions and allocation sites, and returns report details.
+    """
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats_path = os.path.join(directory, "build-profile.pstats")
+    profiler.dump_stats(stats_path)
+    log.info(f"Profile written to {stats_path} (open with python -m pstats)")
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(20)
+    log.info(output.getvalue())
+
+    log.info("Top allocation sites:")
+    for statistic in snapshot.statistics("lineno")[:10]:
+        log.info(f"  {statistic}")
+    return {"profile": stats_path, "peak_memory_bytes": peak}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+
+from frontmatter import read_front_matter
+
+# Bump whenever a change to the generator alters the HTML it produces, so that
+# incremental builds re-render every page instead of trusting stale output.
+GENERATOR_VERSION = "4"
+
+MANIFEST_PATH = os.path.join(".ssg-cache", "manifest.json")
+
+
+def hash_file(path):
+    """Returns the sha256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Persisted record of what each generated page was built from.
+    Maps a markdown source path to the hashes and options used to render it,
+    so an incremental build can skip pages whose inputs have not changed.
+    Together the entries form the build's dependency graph: besides its
+    source and template, a page records the other files it was built from
+    (partials) and the pages whose metadata it shows, e.g. in a listing,
+    and dependents() walks those edges backwards from changed inputs.
+    Also remembers which static assets were synced into the output, so ones
+    deleted from static/ can be removed without touching generated pages,
+    caches each source's front matter by the file's size and mtime, and
+    keeps the records of precompressed output files (see precompress.py).
+    """
+
+    def __init__(self, path=MANIFEST_PATH, pages=None, assets=None, front_matter=None, compressed=None):
+        self.path = path
+        self.pages = pages if pages is not None else {}
+        self.assets = assets if assets is not None else []
+        self.front_matter = front_matter if front_matter is not None else {}
+        self.compressed = compressed if compressed is not None else {}
+        self.seen = set()
+        self._hashes = {}
+
+    @classmethod
+    def load(cls, path=MANIFEST_PATH):
+        """
+        Loads a manifest from disk.
+        A missing, unreadable or outdated manifest yields an empty one, which
+        simply means every page is rebuilt.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+
+        if not isinstance(data, dict) or data.get("version") != GENERATOR_VERSION:
+            return cls(path)
+
+        return cls(
+            path,
+            data.get("pages", {}),
+            data.get("assets", []),
+            data.get("front_matter", {}),
+            data.get("compressed", {}),
+        )
+
+    def save(self):
+        """Writes the manifest to disk, replacing the previous file atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            data = {
+                "version": GENERATOR_VERSION,
+                "pages": self.pages,
+                "assets": self.assets,
+                "front_matter": self.front_matter,
+                "compressed": self.compressed,
+            }
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def begin_build(self):
+        """
+        Starts another build with the same manifest (e.g. in watch mode):
+        forgets memoized file hashes and which pages have been seen.
+        """
+        self.seen = set()
+        self._hashes = {}
+
+    def forget_hash(self, path):
+        """Drops the memoized hash of a file that has changed since it was hashed."""
+        self._hashes.pop(path, None)
+
+    def file_hash(self, path):
+        """Hashes a file once per build (the template is shared by every page)."""
+        if path not in self._hashes:
+            self._hashes[path] = hash_file(path)
+        return self._hashes[path]
+
+    def page_front_matter(self, source):
+        """
+        Returns a source's front matter, reading just the file's header (see
+        read_front_matter) unless it is cached for the file's current size and mtime.
+        """
+        stat = os.stat(source)
+        entry = self.front_matter.get(source)
+        if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["data"]
+
+        data = read_front_matter(source)
+        self.front_matter[source] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "data": data}
+        return data
+
+    def file_hashes(self, paths):
+        """Returns {path: hash} for the files a page depends on, e.g. its template's partials."""
+        return {path: self.file_hash(path) for path in paths}
+
+    def metadata_hash(self, source):
+        """
+        Returns a hash of the metadata last recorded for a page, which pages
+        listing it depend on, or None if the page is not recorded.
+        """
+        entry = self.pages.get(source)
+        if entry is None:
+            return None
+        metadata = json.dumps(entry.get("metadata", {}), sort_keys=True)
+        return hashlib.sha256(metadata.encode('utf-8')).hexdigest()
+
+    def is_fresh(self, source, source_hash, template_hash, basepath, output):
+        """
+        Returns True if the page's recorded inputs match, including every file
+        and page metadata it depends on, and its output still exists.
+        Pages whose metadata it shows must already be recorded for this build.
+        """
+        self.seen.add(source)
+        entry = self.pages.get(source)
+        if entry is None:
+            return False
+        return (
+            entry.get("source_hash") == source_hash
+            and entry.get("template_hash") == template_hash
+            and entry.get("basepath") == basepath
+            and entry.get("output") == output
+            and os.path.exists(output)
+            and self._dependencies_fresh(entry)
+        )
+
+    def _dependencies_fresh(self, entry):
+        for path, digest in entry.get("files", {}).items():
+            try:
+                if self.file_hash(path) != digest:
+                    return False
+            except OSError:
+                return False
+        for page, digest in entry.get("uses", {}).items():
+            if self.metadata_hash(page) != digest:
+                return False
+        return True
+
+    def record(self, source, source_hash, template_hash, basepath, output, files=None, uses=None, metadata=None):
+        """
+        Records the inputs a page was just rendered from: besides its source
+        and template, files maps other files it was built from to their
+        hashes and uses maps pages whose metadata it shows to their
+        metadata_hash(). metadata is what pages listing this one show of it.
+        """
+        self.seen.add(source)
+        entry = {
+            "source_hash": source_hash,
+            "template_hash": template_hash,
+            "basepath": basepath,
+            "output": output,
+        }
+        if files:
+            entry["files"] = files
+        if uses:
+            entry["uses"] = uses
+        if metadata:
+            entry["metadata"] = metadata
+        self.pages[source] = entry
+
+    def dependents(self, paths):
+        """
+        Returns the sources of the recorded pages that depend on any of the
+        given paths (files or directories): through their source, the files
+        they were built from or the metadata of pages they list. Pages that
+        list a changed page are returned even if its metadata is the same;
+        is_fresh() tells whether they need rendering again.
+        """
+        paths = {os.path.normpath(path) for path in paths}
+
+        def affected(path):
+            path = os.path.normpath(path)
+            return any(path == changed or path.startswith(changed + os.sep) for changed in paths)
+
+        found = set()
+        for source, entry in self.pages.items():
+            inputs = [source, *entry.get("files", ()), *entry.get("uses", ())]
+            if any(affected(path) for path in inputs):
+                found.add(source)
+        return found
+
+    def relocate(self, old_root, new_root):
+        """
+        Points the recorded outputs under old_root at the same paths under
+        new_root, e.g. while a build is staged outside the output directory.
+        """
+        for entry in self.pages.values():
+            output = entry["output"]
+            if output.startswith(old_root + os.sep):
+                entry["output"] = os.path.join(new_root, output[len(old_root) + 1:])
+
+    def prune(self, dest_root):
+        """
+        Forgets every page whose source was not seen during this build and
+        deletes its output, along with any directories left empty under dest_root.
+        Returns the list of removed output paths.
+        """
+        removed = []
+        for source in sorted(set(self.pages) - self.seen):
+            output = self.remove(source, dest_root)
+            if output is not None:
+                removed.append(output)
+        for source in [source for source in self.front_matter if not os.path.exists(source)]:
+            del self.front_matter[source]
+        return removed
+
+    def remove(self, source, dest_root):
+        """
+        Forgets a single page and deletes its output, along with any directories
+        left empty under dest_root, unless another page now writes to the same
+        path (e.g. a section listing replaced by an index.md).
+        Returns the removed output path, or None.
+        """
+        entry = self.pages.pop(source, None)
+        if entry is None or not os.path.exists(entry["output"]):
+            return None
+        if any(other["output"] == entry["output"] for other in self.pages.values()):
+            return None
+        os.remove(entry["output"])
+        remove_empty_parents(entry["output"], dest_root)
+        return entry["output"]
+
+
+def remove_empty_parents(path, root):
+    """Removes empty directories from path's parent up to (but not including) root."""
+    root = os.path.abspath(root)
+    directory = os.path.dirname(os.path.abspath(path))
+    while directory != root and directory.startswith(root + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
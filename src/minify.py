@@ -0,0 +1,142 @@
+import re
+
+# Elements whose text is shown or run as written, so it is never collapsed
+PRESERVED_TAGS = frozenset({"pre", "code", "textarea", "script", "style"})
+
+# Elements that do not flow inline with text, so whitespace next to their
+# tags renders nothing and is dropped rather than collapsed to one space
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "base", "blockquote", "body", "caption", "col", "colgroup", "dd", "details",
+    "dialog", "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "head", "header", "hgroup", "hr", "html", "li", "link", "main", "menu", "meta", "nav", "noscript",
+    "ol", "optgroup", "option", "p", "pre", "script", "section", "source", "style", "summary", "table", "tbody",
+    "td", "template", "tfoot", "th", "thead", "title", "tr", "track", "ul",
+})
+
+# ASCII whitespace only: a non-breaking space is content
+WHITESPACE_PATTERN = re.compile(r'[ \t\n\r\f]+')
+
+# Attribute values that can be written without quotes
+UNQUOTED_VALUE_PATTERN = re.compile(r'[^ \t\n\r\f"\'=<>`]+\Z')
+
+# Raw HTML in markdown text that must keep its whitespace
+RAW_PRESERVED_PATTERN = re.compile(r'<(?:' + '|'.join(sorted(PRESERVED_TAGS)) + r')[\s>]', re.IGNORECASE)
+
+# A comment or a start or end tag, with its attributes (quoted values may contain >)
+TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->|<(/?)([A-Za-z][A-Za-z0-9:-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.DOTALL,
+)
+
+ATTRIBUTE_PATTERN = re.compile(r'([^\s"\'>/=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+
+def collapse_whitespace(text):
+    """
+    Collapses each run of whitespace in a text node to one space, unless the
+    text holds raw HTML (e.g. a <pre> written in markdown) that needs its own.
+    """
+    if "<" in text and RAW_PRESERVED_PATTERN.search(text):
+        return text
+    return WHITESPACE_PATTERN.sub(" ", text)
+
+
+def attributes_to_html(items):
+    """Serializes (name, value) attribute pairs, leaving out quotes where a value does not need them."""
+    return "".join(
+        f" {name}={value}" if UNQUOTED_VALUE_PATTERN.match(value) else f' {name}="{value}"'
+        for name, value in items
+    )
+
+
+def minify_template(text):
+    """
+    Minifies template text once, at compile time: drops comments (but not
+    conditional comments), collapses whitespace and removes it next to block
+    tags, and unquotes attribute values that allow it. The content of
+    PRESERVED_TAGS elements is kept as written, as are {{ Name }}
+    placeholders, and attribute values containing one keep their quotes.
+    """
+    out = []
+    pending = []
+    previous_block = True
+    preserved = None
+    position = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        between = text[position:match.start()]
+        position = match.end()
+        token = match.group(0)
+        closing, name = match.group(1), match.group(2)
+
+        if preserved is not None:
+            out.append(between)
+            if closing and name.lower() == preserved:
+                preserved = None
+                out.append(_minify_tag(match))
+            else:
+                out.append(token)
+            continue
+
+        pending.append(between)
+        if name is None:
+            if token.startswith("<!--[if"):
+                out.append(_collapse_text("".join(pending), previous_block, False))
+                pending = []
+                out.append(token)
+                previous_block = False
+            continue
+
+        block = name.lower() in BLOCK_TAGS
+        out.append(_collapse_text("".join(pending), previous_block, block))
+        pending = []
+        out.append(_minify_tag(match))
+        previous_block = block
+        if not closing and name.lower() in PRESERVED_TAGS:
+            preserved = name.lower()
+
+    if preserved is not None:
+        out.append(text[position:])
+    else:
+        pending.append(text[position:])
+        out.append(_collapse_text("".join(pending), previous_block, True))
+    return "".join(out)
+
+
+def _collapse_text(text, after_block, before_block):
+    text = collapse_whitespace(text)
+    if after_block:
+        text = text.lstrip(" ")
+    if before_block:
+        text = text.rstrip(" ")
+    return text
+
+
+def _minify_tag(match):
+    closing, name, attributes = match.groups()
+    if closing:
+        return f"</{name}>"
+    self_closing = attributes.rstrip().endswith("/")
+    if self_closing:
+        attributes = attributes.rstrip()[:-1]
+
+    parts = [f"<{name}"]
+    unquoted = False
+    for attribute in ATTRIBUTE_PATTERN.finditer(attributes):
+        key, double, single, bare = attribute.groups()
+        value = next((v for v in (double, single, bare) if v is not None), None)
+        unquoted = False
+        if value is None:
+            parts.append(f" {key}")
+        elif "{{" not in value and UNQUOTED_VALUE_PATTERN.match(value):
+            parts.append(f" {key}={value}")
+            unquoted = True
+        elif '"' in value:
+            parts.append(f" {key}='{value}'")
+        else:
+            parts.append(f' {key}="{value}"')
+    if self_closing:
+        # A slash straight after an unquoted value would become part of it
+        parts.append(" />" if unquoted else "/>")
+    else:
+        parts.append(">")
+    return "".join(parts)
@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from buildlog import get_logger
+
+log = get_logger()
+
+# Writer threads; page writes are small, so a few are enough to keep the disk busy
+DEFAULT_THREADS = 4
+
+# Rendered pages waiting to be written; submit() blocks beyond this to bound memory
+DEFAULT_MAX_PENDING = 64
+
+
+def prepare_directories(dest_paths):
+    """Creates the parent directory of every output path, once per directory."""
+    for directory in sorted({os.path.dirname(path) for path in dest_paths}):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+
+def write_if_changed(path, data):
+    """
+    Writes data (bytes) to path unless the file already holds exactly those
+    bytes, in which case it is left alone so its mtime does not change.
+    The new file replaces the old one rather than overwriting it, so readers
+    never see it half-written and hard links to the old file are unaffected.
+    Returns True if the file was written.
+    """
+    try:
+        if os.stat(path).st_size == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+
+    f = _open_tmp(path)
+    try:
+        with f:
+            f.write(data)
+        os.replace(f.name, path)
+    except BaseException:
+        os.remove(f.name)
+        raise
+    return True
+
+
+def write_chunks_if_changed(path, chunks):
+    """
+    Like write_if_changed for a page given as an iterable of str chunks
+    (e.g. Template.iter_render), which are encoded and compared one at a
+    time, so the page is never held as one string. While the chunks match
+    the existing file nothing is written; at the first difference the
+    matching prefix is copied from the old file and the rest streamed after it.
+    Returns True if the file was written.
+    """
+    try:
+        old = open(path, 'rb')
+    except FileNotFoundError:
+        old = None
+    f = None
+    matched = 0
+    try:
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            if f is None:
+                if old is not None and old.read(len(data)) == data:
+                    matched += len(data)
+                    continue
+                f = _open_tmp(path)
+                _copy_prefix(old, f, matched)
+            f.write(data)
+        if f is None:
+            if old is not None and not old.read(1):
+                return False
+            # The old file is longer than the page
+            f = _open_tmp(path)
+            _copy_prefix(old, f, matched)
+        f.close()
+        os.replace(f.name, path)
+    except BaseException:
+        if f is not None:
+            f.close()
+            os.remove(f.name)
+        raise
+    finally:
+        if old is not None:
+            old.close()
+    return True
+
+
+def _open_tmp(path):
+    """Opens the temporary file a page is written to before it replaces path."""
+    tmp_path = path + ".tmp"
+    try:
+        return open(tmp_path, 'wb')
+    except FileNotFoundError:
+        # A directory that was not prepared up front
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(tmp_path, 'wb')
+
+
+def _copy_prefix(source, dest, size):
+    """Copies the first size bytes of source (or none, if it is None) to dest."""
+    if source is None:
+        return
+    source.seek(0)
+    while size > 0:
+        data = source.read(min(size, 1024 * 1024))
+        dest.write(data)
+        size -= len(data)
+
+
+class PageWriter:
+    """
+    Writes rendered pages from a pool of threads, so rendering the next page
+    overlaps with writing the previous ones. Pages are queued with submit(),
+    as a string or as chunks that are rendered while they are written; at
+    most max_pending are held in memory at once. Files whose bytes are
+    already identical are not rewritten. close() (or leaving a with block)
+    waits for every queued write; failed writes are collected in failures as
+    (dest_path, error) pairs rather than raised, and the seconds each page
+    took to render (when given as chunks) and write are kept in durations.
+    """
+
+    def __init__(self, threads=DEFAULT_THREADS, max_pending=DEFAULT_MAX_PENDING):
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="page-writer")
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.written = 0
+        self.unchanged = 0
+        self.failures = []
+        self.durations = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, dest_path, page):
+        """
+        Queues page to be written to dest_path as UTF-8: a string, or an
+        iterable of string chunks (e.g. Template.iter_render) consumed by the
+        writer thread. An error raised while iterating it is a failed write.
+        """
+        self.slots.acquire()
+        try:
+            self.executor.submit(self._write, dest_path, page)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def close(self):
+        """Waits for all queued pages to be written and stops the threads."""
+        self.executor.shutdown(wait=True)
+
+    def _write(self, dest_path, page):
+        start = time.perf_counter()
+        try:
+            if isinstance(page, str):
+                written = write_if_changed(dest_path, page.encode('utf-8'))
+            else:
+                written = write_chunks_if_changed(dest_path, page)
+        except Exception as e:
+            with self.lock:
+                self.failures.append((dest_path, f"{type(e).__name__}: {e}"))
+            return
+        finally:
+            self.slots.release()
+
+        with self.lock:
+            self.durations[dest_path] = time.perf_counter() - start
+            if written:
+                self.written += 1
+            else:
+                self.unchanged += 1
+        if not written:
+            log.debug(f"Output unchanged, not rewriting {dest_path}", extra={"dest": dest_path})
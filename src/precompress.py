@@ -0,0 +1,164 @@
+import gzip
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import remove_empty_parents
+from pagewriter import write_if_changed
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only .gz siblings are written
+    brotli = None
+
+# Text files worth serving precompressed; images and fonts are compressed already
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".json", ".svg", ".xml")
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+class PrecompressStats:
+    def __init__(self):
+        self.compressed = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.bytes_saved = 0
+
+    def __repr__(self):
+        return (
+            f"PrecompressStats(compressed={self.compressed}, unchanged={self.unchanged}, "
+            f"removed={self.removed}, bytes_saved={self.bytes_saved})"
+        )
+
+
+def compressors():
+    """Returns the (suffix, compress function) pairs available: gzip, and brotli if it is installed."""
+    available = [(".gz", lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0))]
+    if brotli is not None:
+        available.append((".br", lambda data: brotli.compress(data, quality=BROTLI_QUALITY)))
+    return available
+
+
+def precompress(dest_dir, previous=None, previous_dir=None, threads=None):
+    """
+    Writes a .gz (and .br) sibling next to every compressible file in
+    dest_dir, compressing files in a pool of threads (zlib and brotli work
+    outside the GIL). A sibling is only kept if it is smaller than the file.
+    previous maps each file's path relative to dest_dir to the record made
+    when it was last compressed; a file whose size and mtime, or else
+    content hash, still match is not compressed again. Siblings missing
+    from dest_dir (e.g. in a fresh staging directory) are hard-linked from
+    previous_dir when the file there was recorded with the same hash.
+    Siblings of files that no longer exist are removed.
+    Returns (records, stats), where records is the new {path: record} map.
+    """
+    previous = previous or {}
+    available = compressors()
+    stats = PrecompressStats()
+    records = {}
+
+    paths = list(_compressible_files(dest_dir))
+    with ThreadPoolExecutor(max_workers=threads or os.cpu_count() or 1, thread_name_prefix="precompress") as pool:
+        futures = [
+            pool.submit(_compress_file, dest_dir, rel_path, previous.get(rel_path), available, previous_dir)
+            for rel_path in paths
+        ]
+        for rel_path, future in zip(paths, futures):
+            record, compressed, saved = future.result()
+            records[rel_path] = record
+            if compressed:
+                stats.compressed += 1
+                stats.bytes_saved += saved
+            else:
+                stats.unchanged += 1
+
+    gone = {rel_path: previous[rel_path] for rel_path in sorted(set(previous) - set(records))}
+    stats.removed = remove_siblings(dest_dir, gone)
+    return records, stats
+
+
+def remove_siblings(dest_dir, records):
+    """
+    Deletes the compressed siblings listed in records from dest_dir, along
+    with directories left empty. Returns how many were removed.
+    """
+    removed = 0
+    for rel_path, record in records.items():
+        path = os.path.join(dest_dir, rel_path)
+        for suffix in record["kept"]:
+            try:
+                os.remove(path + suffix)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        remove_empty_parents(path, dest_dir)
+    return removed
+
+
+def _compress_file(dest_dir, rel_path, record, available, previous_dir):
+    """Brings one file's siblings up to date; returns (record, whether it was compressed, bytes saved)."""
+    path = os.path.join(dest_dir, rel_path)
+    suffixes = [suffix for suffix, _ in available]
+    stat = os.stat(path)
+    current = record is not None and record["suffixes"] == suffixes
+    if (current and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns
+            and _siblings_present(path, record["kept"])):
+        return record, False, 0
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    new_record = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest, "suffixes": suffixes}
+    if current and record["hash"] == digest and (
+            _siblings_present(path, record["kept"]) or _link_siblings(previous_dir, rel_path, path, record["kept"])):
+        new_record["kept"] = record["kept"]
+        return new_record, False, 0
+
+    kept = []
+    saved = 0
+    for suffix, compress in available:
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            write_if_changed(path + suffix, compressed)
+            kept.append(suffix)
+            saved += len(data) - len(compressed)
+        else:
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+    new_record["kept"] = kept
+    return new_record, True, saved
+
+
+def _siblings_present(path, suffixes):
+    return all(os.path.exists(path + suffix) for suffix in suffixes)
+
+
+def _link_siblings(previous_dir, rel_path, path, suffixes):
+    """Hard-links (or copies) the siblings of rel_path from previous_dir; returns False if one is missing."""
+    if previous_dir is None:
+        return False
+    for suffix in suffixes:
+        source = os.path.join(previous_dir, rel_path) + suffix
+        target = path + suffix
+        if not os.path.exists(source):
+            return False
+        if os.path.lexists(target):
+            os.remove(target)
+        try:
+            os.link(source, target)
+        except OSError:
+            with open(source, 'rb') as f:
+                write_if_changed(target, f.read())
+    return True
+
+
+def _compressible_files(root):
+    """Yields the paths of compressible files under root, relative to it, in sorted order."""
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                yield os.path.relpath(os.path.join(directory, name), root)
@@ -0,0 +1,170 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import shutil
+import time
+
+# Staging directory and previous builds live here, on the same filesystem as
+# the output so they can be renamed into place
+BUILDS_DIR = os.path.join(".ssg-cache", "builds")
+
+STAGING_NAME = "staging"
+
+# renameat2(2) flag that swaps two existing paths in one step
+RENAME_EXCHANGE = 2
+AT_FDCWD = -100
+
+_renameat2 = None
+
+
+def exchange_paths(a, b):
+    """
+    Atomically swaps two existing paths with renameat2(RENAME_EXCHANGE), so
+    there is no moment at which either is missing. Returns False where that
+    is not supported (non-Linux, old kernels or C libraries, some filesystems).
+    """
+    global _renameat2
+    if _renameat2 is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            _renameat2 = libc.renameat2
+            _renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+        except (OSError, AttributeError, TypeError):
+            _renameat2 = False
+    if not _renameat2:
+        return False
+
+    if _renameat2(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+    raise OSError(error, os.strerror(error), a, None, b)
+
+
+def swap_directory(new, dest_dir, old):
+    """
+    Puts the directory new in dest_dir's place and moves the previous
+    dest_dir to old. Uses an atomic exchange where available; otherwise two
+    renames, between which dest_dir is briefly missing.
+    Returns True if there was a previous dest_dir (now at old).
+    """
+    if not os.path.lexists(dest_dir):
+        os.rename(new, dest_dir)
+        return False
+    if exchange_paths(new, dest_dir):
+        os.rename(new, old)
+    else:
+        os.rename(dest_dir, old)
+        os.rename(new, dest_dir)
+    return True
+
+
+def prepare_staging(dest_dir, builds_dir=BUILDS_DIR, seed=False):
+    """
+    Creates an empty staging directory for the next build and returns its
+    path. With seed=True it starts as a copy of dest_dir made of hard links,
+    so an incremental build only rewrites what changed. Files in it must be
+    replaced rather than written through (as PageWriter and copy_file do),
+    or the live output would change too.
+    """
+    staging = os.path.join(builds_dir, STAGING_NAME)
+    # Left over from a build that was interrupted
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(builds_dir, exist_ok=True)
+
+    if seed and os.path.isdir(dest_dir):
+        shutil.copytree(dest_dir, staging, copy_function=_link_or_copy, symlinks=True)
+    else:
+        os.mkdir(staging)
+    return staging
+
+
+def publish(staging, dest_dir, builds_dir=BUILDS_DIR, keep=0, manifest_path=None):
+    """
+    Swaps a finished staging directory into dest_dir. The previous output is
+    kept under builds_dir for rollback, together with a copy of the manifest
+    describing it (manifest_path, read before the new one is saved), and all
+    but the newest keep previous builds are deleted.
+    Returns the id of the build just retired, or None if there was none.
+    """
+    build_id = _new_build_id(builds_dir)
+    old = os.path.join(builds_dir, build_id)
+    if not swap_directory(staging, dest_dir, old):
+        return None
+
+    if manifest_path is not None and os.path.exists(manifest_path):
+        shutil.copyfile(manifest_path, old + ".json")
+    prune_builds(builds_dir, keep)
+    return build_id if keep > 0 else None
+
+
+def list_builds(builds_dir=BUILDS_DIR):
+    """Returns the ids of the kept previous builds, oldest first."""
+    if not os.path.isdir(builds_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(builds_dir)
+        if name != STAGING_NAME and os.path.isdir(os.path.join(builds_dir, name))
+    )
+
+
+def prune_builds(builds_dir=BUILDS_DIR, keep=0):
+    """Deletes all but the newest keep previous builds."""
+    builds = list_builds(builds_dir)
+    for build_id in builds[:max(0, len(builds) - keep)]:
+        shutil.rmtree(os.path.join(builds_dir, build_id), ignore_errors=True)
+        try:
+            os.remove(os.path.join(builds_dir, build_id + ".json"))
+        except FileNotFoundError:
+            pass
+
+
+def rollback(dest_dir, builds_dir=BUILDS_DIR, build_id=None, manifest_path=None):
+    """
+    Swaps a kept build (the newest unless build_id is given) back into
+    dest_dir, restoring its manifest too. The output it replaces is kept as
+    a new build, so a rollback can itself be undone.
+    Returns the id under which the replaced output was kept.
+    """
+    builds = list_builds(builds_dir)
+    if build_id is None:
+        if not builds:
+            raise ValueError(f"No previous builds in {builds_dir}")
+        build_id = builds[-1]
+    elif build_id not in builds:
+        raise ValueError(f"Unknown build {build_id!r}; kept builds: {', '.join(builds) or 'none'}")
+
+    target = os.path.join(builds_dir, build_id)
+    current_id = _new_build_id(builds_dir)
+    current = os.path.join(builds_dir, current_id)
+    swap_directory(target, dest_dir, current)
+
+    if manifest_path is not None:
+        if os.path.exists(manifest_path):
+            shutil.copyfile(manifest_path, current + ".json")
+        target_manifest = target + ".json"
+        if os.path.exists(target_manifest):
+            os.replace(target_manifest, manifest_path)
+        elif os.path.exists(manifest_path):
+            # Without its record, the next incremental build re-renders everything
+            os.remove(manifest_path)
+    return current_id
+
+
+def _new_build_id(builds_dir):
+    build_id = time.strftime("%Y%m%d-%H%M%S")
+    suffix = 0
+    candidate = build_id
+    while os.path.lexists(os.path.join(builds_dir, candidate)):
+        suffix += 1
+        candidate = f"{build_id}-{suffix:03d}"
+    return candidate
+
+
+def _link_or_copy(source_path, dest_path):
+    try:
+        os.link(source_path, dest_path)
+    except OSError:
+        shutil.copy2(source_path, dest_path)
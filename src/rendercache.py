@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import shutil
+
+from manifest import GENERATOR_VERSION
+
+RENDER_CACHE_DIR = os.path.join(".ssg-cache", "render")
+
+# Upper bound on the cache's size on disk; least recently used entries go first
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Layout of an entry: a line of JSON metadata, then the body. Part of the
+# key, so entries written in another layout are never read
+ENTRY_FORMAT = "2"
+
+
+class RenderCache:
+    """
+    On-disk cache of rendered page bodies, keyed by a hash of the markdown
+    source and the generator version, so markdown that was rendered once (in
+    an earlier build, another branch or another page) is not parsed again.
+    Entries are files sharded by key prefix: <directory>/<key[:2]>/<key>.html.
+    Each entry keeps metadata of the parse next to the body (e.g. the page's
+    title), so a hit needs no other pass over the markdown.
+    Reading an entry refreshes its mtime, and evict() removes the least
+    recently used entries once the cache grows past max_bytes.
+    """
+
+    def __init__(self, directory=RENDER_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(markdown, minify=False):
+        """Returns the cache key for a markdown source, rendered minified or not."""
+        digest = hashlib.sha256(f"{GENERATOR_VERSION}:{ENTRY_FORMAT}".encode())
+        digest.update(b"\0minified\0" if minify else b"\0")
+        digest.update(markdown.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Returns the cached HTML for key, or None on a miss."""
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key):
+        """Returns (html, metadata) cached for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                metadata = json.loads(f.readline())
+                html = f.read()
+        except (OSError, UnicodeDecodeError, ValueError):
+            return None
+
+        try:
+            # Mark the entry as recently used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return html, metadata
+
+    def put(self, key, html, metadata=None):
+        """
+        Stores the HTML rendered for key with metadata (a dict that can be
+        written as JSON), replacing any previous entry atomically.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Pool workers may store the same key at once, so each writes its own temp file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(json.dumps(metadata or {}, ensure_ascii=False) + "\n")
+            f.write(html)
+        os.replace(tmp_path, path)
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits in max_bytes.
+        Returns the number of entries removed.
+        """
+        entries = []
+        total = 0
+        for path in self._entry_paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Deletes every entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".html")
+
+    def _entry_paths(self):
+        if not os.path.isdir(self.directory):
+            return
+        with os.scandir(self.directory) as shards:
+            shard_paths = [shard.path for shard in shards if shard.is_dir()]
+        for shard_path in shard_paths:
+            with os.scandir(shard_path) as it:
+                for entry in it:
+                    if entry.name.endswith(".html"):
+                        yield entry.path
@@ -0,0 +1,95 @@
+// Client for the search index written by search.py. Include it with
+//   <script src="/search/search.js"></script>
+// and call siteSearch("query") for a promise of [{url, title, score}], best
+// first; or add <input data-search> and <ul data-search-results></ul> to a
+// page to get results as you type. Only index.json and the shards for the
+// query's term prefixes are fetched, each at most once.
+(function () {
+  "use strict";
+  var base = document.currentScript.src.replace(/[^/]*$/, "");
+  var index = null;
+  var shards = {};
+
+  function fetchJson(name) {
+    return fetch(base + encodeURIComponent(name) + ".json").then(function (response) {
+      if (!response.ok) throw new Error("Failed to load " + name + ".json: " + response.status);
+      return response.json();
+    });
+  }
+
+  function loadIndex() {
+    if (!index) index = fetchJson("index");
+    return index;
+  }
+
+  function loadShard(meta, prefix) {
+    if (meta.shards.indexOf(prefix) < 0) return Promise.resolve({});
+    if (!shards[prefix]) shards[prefix] = fetchJson(prefix);
+    return shards[prefix];
+  }
+
+  // Same terms as search.py's count_terms: lowercased words, cut to max_term_length
+  function terms(meta, query) {
+    return (query.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [])
+      .filter(function (term) { return term.length >= meta.min_term_length; })
+      .map(function (term) { return term.slice(0, meta.max_term_length); });
+  }
+
+  // Every term must match; the last one also matches as a prefix, as it may still be being typed
+  function siteSearch(query) {
+    return loadIndex().then(function (meta) {
+      var words = terms(meta, query);
+      return Promise.all(words.map(function (term) {
+        return loadShard(meta, term.slice(0, meta.prefix_length));
+      })).then(function (loaded) {
+        var scores = null;
+        words.forEach(function (word, i) {
+          var found = {};
+          Object.keys(loaded[i]).forEach(function (term) {
+            if (term !== word && !(i === words.length - 1 && term.indexOf(word) === 0)) return;
+            var postings = loaded[i][term];
+            for (var j = 0; j < postings.length; j += 2) {
+              found[postings[j]] = (found[postings[j]] || 0) + postings[j + 1];
+            }
+          });
+          if (scores === null) {
+            scores = found;
+          } else {
+            Object.keys(scores).forEach(function (id) {
+              if (id in found) scores[id] += found[id];
+              else delete scores[id];
+            });
+          }
+        });
+        return Object.keys(scores || {}).map(function (id) {
+          var page = meta.pages[id];
+          return {url: page[0], title: page[1], score: scores[id]};
+        }).sort(function (a, b) { return b.score - a.score; });
+      });
+    });
+  }
+
+  window.siteSearch = siteSearch;
+
+  document.addEventListener("DOMContentLoaded", function () {
+    var input = document.querySelector("[data-search]");
+    var list = document.querySelector("[data-search-results]");
+    if (!input || !list) return;
+    var latest = 0;
+    input.addEventListener("input", function () {
+      var request = ++latest;
+      siteSearch(input.value).then(function (results) {
+        if (request !== latest) return;
+        list.textContent = "";
+        results.slice(0, 20).forEach(function (result) {
+          var link = document.createElement("a");
+          link.href = result.url;
+          link.textContent = result.title;
+          var item = document.createElement("li");
+          item.appendChild(link);
+          list.appendChild(item);
+        });
+      });
+    });
+  });
+})();
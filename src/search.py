@@ -0,0 +1,234 @@
+import json
+import os
+import re
+import shutil
+from collections import Counter
+
+from frontmatter import skip_front_matter
+from pagewriter import write_if_changed
+from textnode import block_to_html_node, iter_block_texts
+
+SEARCH_STORE_PATH = os.path.join(".ssg-cache", "search.json")
+
+# Directory under the output that holds the index shards and the loader
+SEARCH_DIR = "search"
+
+# Terms are sharded by their first characters, so a query only fetches the
+# shards for the prefixes it contains
+PREFIX_LENGTH = 2
+
+# Shorter terms are not indexed, longer ones are cut to this length
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 32
+
+TERM_PATTERN = re.compile(r'\w+')
+
+# Client-side loader copied next to the index, see search.js
+LOADER_PATH = os.path.join(os.path.dirname(__file__), "search.js")
+
+STORE_VERSION = "1"
+
+
+def node_text(node):
+    """Yields the plain text of an HtmlNode tree: the value of every leaf and the alt text of images."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.children:
+            stack.extend(reversed(node.children))
+        elif node.tag_name == "img":
+            yield node.props.get("alt", "")
+        elif node.value:
+            yield node.value
+
+
+def count_terms(texts, counts=None):
+    """Adds the terms of each text (lowercased words) to counts, a {term: count} dict, and returns it."""
+    counts = counts if counts is not None else {}
+    # One scan and a Counter over the joined text beat a loop per text and term
+    found = Counter(TERM_PATTERN.findall(" ".join(texts).lower()))
+    for term, count in found.items():
+        if len(term) >= MIN_TERM_LENGTH:
+            term = term[:MAX_TERM_LENGTH]
+            counts[term] = counts.get(term, 0) + count
+    return counts
+
+
+def page_terms(root):
+    """Returns the {term: count} of a page's HtmlNode tree."""
+    return count_terms(node_text(root))
+
+
+def file_terms(path):
+    """
+    Returns the {term: count} of a markdown file, parsing it one block at a
+    time, for pages whose tree was not built (render cache hits, streamed pages).
+    """
+    counts = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = (line[:-1] if line.endswith('\n') else line for line in f)
+        for block_type, block in iter_block_texts(skip_front_matter(lines)):
+            count_terms(node_text(block_to_html_node(block, block_type)), counts)
+    return counts
+
+
+class SearchIndexStats:
+    def __init__(self):
+        self.indexed = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.shards_written = 0
+
+    def __repr__(self):
+        return (
+            f"SearchIndexStats(indexed={self.indexed}, unchanged={self.unchanged}, "
+            f"removed={self.removed}, shards_written={self.shards_written})"
+        )
+
+
+class SearchIndex:
+    """
+    Full-text search index written into the output as static JSON:
+    search/index.json lists the pages ([url, title] by document id) and the
+    shards, and search/<prefix>.json maps each term starting with prefix to
+    its postings, a flat [id, count, id, count, ...] list.
+    The terms counted for every page are kept in a store between builds,
+    with the source hash they were counted from, so only pages whose
+    markdown changed are tokenized again and only the shards their old or
+    new terms fall in are rewritten. Document ids stay with their page, and
+    those of removed pages are reused.
+    """
+
+    def __init__(self, path=SEARCH_STORE_PATH, pages=None, shards=None, generation=0):
+        self.path = path
+        self.pages = pages if pages is not None else {}
+        self.shards = set(shards) if shards is not None else set()
+        self.generation = generation
+
+    @classmethod
+    def load(cls, path=SEARCH_STORE_PATH):
+        """Loads the store; a missing or unreadable one yields an empty index, so every page is tokenized."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(data, dict) or data.get("version") != STORE_VERSION:
+            return cls(path)
+        return cls(path, data.get("pages", {}), data.get("shards", []), data.get("generation", 0))
+
+    def save(self):
+        """Writes the store to disk, replacing the previous file atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            data = {
+                "version": STORE_VERSION,
+                "generation": self.generation,
+                "shards": sorted(self.shards),
+                "pages": self.pages,
+            }
+            json.dump(data, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def update(self, entries, dest_dir, terms=None):
+        """
+        Brings the index in dest_dir up to date with entries, which maps the
+        source of every page to be searchable to (source_hash, url, title).
+        terms may hold {term: count} already counted for some of the pages
+        (see page_terms); other changed pages are tokenized with file_terms.
+        If dest_dir's index was not written from this store (e.g. in a fresh
+        output directory), every shard is written.
+        Returns a SearchIndexStats.
+        """
+        terms = terms or {}
+        stats = SearchIndexStats()
+        search_dir = os.path.join(dest_dir, SEARCH_DIR)
+        full = self._written_generation(search_dir) != self.generation
+        affected = set()
+
+        for source in sorted(set(self.pages) - set(entries)):
+            affected.update(term[:PREFIX_LENGTH] for term in self.pages.pop(source)["terms"])
+            stats.removed += 1
+
+        used_ids = {page["id"] for page in self.pages.values()}
+        free_ids = (number for number in range(len(self.pages) + len(entries) + 1) if number not in used_ids)
+        for source, (source_hash, url, title) in sorted(entries.items()):
+            page = self.pages.get(source)
+            if page is not None and page["hash"] == source_hash:
+                page["url"], page["title"] = url, title
+                stats.unchanged += 1
+                continue
+            counts = terms.get(source)
+            if counts is None:
+                counts = file_terms(source)
+            if page is None:
+                page = self.pages[source] = {"id": next(free_ids)}
+            else:
+                affected.update(term[:PREFIX_LENGTH] for term in page["terms"])
+            affected.update(term[:PREFIX_LENGTH] for term in counts)
+            page.update(hash=source_hash, url=url, title=title, terms=counts)
+            stats.indexed += 1
+
+        if full:
+            # Shards left by another index would be served alongside the new ones
+            shutil.rmtree(search_dir, ignore_errors=True)
+            self.shards = set()
+            affected = None
+        self.generation += 1
+        os.makedirs(search_dir, exist_ok=True)
+        for prefix, postings in self._build_shards(affected).items():
+            path = os.path.join(search_dir, prefix + ".json")
+            if postings:
+                self.shards.add(prefix)
+                if write_if_changed(path, _dump(postings)):
+                    stats.shards_written += 1
+            elif prefix in self.shards:
+                self.shards.discard(prefix)
+                os.remove(path)
+                stats.shards_written += 1
+
+        listed = [None] * (max((page["id"] for page in self.pages.values()), default=-1) + 1)
+        for page in self.pages.values():
+            listed[page["id"]] = [page["url"], page["title"]]
+        index = {
+            "generation": self.generation,
+            "prefix_length": PREFIX_LENGTH,
+            "min_term_length": MIN_TERM_LENGTH,
+            "max_term_length": MAX_TERM_LENGTH,
+            "shards": sorted(self.shards),
+            "pages": listed,
+        }
+        write_if_changed(os.path.join(search_dir, "index.json"), _dump(index))
+        with open(LOADER_PATH, 'rb') as f:
+            write_if_changed(os.path.join(search_dir, "search.js"), f.read())
+        return stats
+
+    def _build_shards(self, prefixes):
+        """Returns {prefix: {term: postings}} for the given prefixes, or for every prefix if None."""
+        shards = {prefix: {} for prefix in prefixes} if prefixes is not None else {}
+        for page in sorted(self.pages.values(), key=lambda page: page["id"]):
+            for term, count in page["terms"].items():
+                prefix = term[:PREFIX_LENGTH]
+                if prefixes is None:
+                    shard = shards.setdefault(prefix, {})
+                elif prefix in shards:
+                    shard = shards[prefix]
+                else:
+                    continue
+                shard.setdefault(term, []).extend((page["id"], count))
+        return shards
+
+    @staticmethod
+    def _written_generation(search_dir):
+        try:
+            with open(os.path.join(search_dir, "index.json"), 'r', encoding='utf-8') as f:
+                return json.load(f).get("generation")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode('utf-8')
@@ -0,0 +1,188 @@
+import errno
+import os
+import shutil
+
+from manifest import hash_file, remove_empty_parents
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# ioctl request number for FICLONE on Linux (btrfs, XFS, ...): share extents copy-on-write
+FICLONE = 0x40049409
+
+# errnos meaning "this fast path is not supported here", as opposed to a real I/O failure
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY, errno.EPERM}
+
+
+class SyncStats:
+    def __init__(self):
+        self.copied = 0
+        self.skipped = 0
+        self.removed = 0
+        self.bytes_copied = 0
+
+    def __repr__(self):
+        return (
+            f"SyncStats(copied={self.copied}, skipped={self.skipped}, "
+            f"removed={self.removed}, bytes_copied={self.bytes_copied})"
+        )
+
+
+def sync_static(source_dir, dest_dir, previous_assets=(), checksum=False, link=False, paths=None):
+    """
+    Brings dest_dir in line with source_dir without rebuilding it from scratch.
+    Files whose size and mtime (or, with checksum=True, content hash) already
+    match are left alone; changed files are copied; files listed in
+    previous_assets that no longer exist in source_dir are deleted.
+    Other files in dest_dir (e.g. generated pages) are never touched.
+    Given paths (files or directories relative to source_dir), only those are
+    synced and previous assets outside them are kept as they are.
+    Returns (assets, stats), where assets is the sorted list of relative paths
+    now synced, to be passed back as previous_assets on the next run.
+    """
+    stats = SyncStats()
+    assets = []
+
+    kept = []
+    if paths is None:
+        candidates = _walk_files(source_dir)
+    else:
+        candidates = _walk_paths(source_dir, paths)
+        # Assets outside the synced paths stay as they were
+        kept = [rel_path for rel_path in previous_assets if not _is_under(rel_path, paths)]
+        previous_assets = [rel_path for rel_path in previous_assets if _is_under(rel_path, paths)]
+
+    for rel_path in candidates:
+        assets.append(rel_path)
+        source_path = os.path.join(source_dir, rel_path)
+        dest_path = os.path.join(dest_dir, rel_path)
+
+        if _is_unchanged(source_path, dest_path, checksum):
+            stats.skipped += 1
+            continue
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        copy_file(source_path, dest_path, link)
+        stats.copied += 1
+        stats.bytes_copied += os.stat(source_path).st_size
+
+    current = set(assets)
+    for rel_path in sorted(set(previous_assets) - current):
+        dest_path = os.path.join(dest_dir, rel_path)
+        if os.path.isfile(dest_path):
+            os.remove(dest_path)
+            stats.removed += 1
+            remove_empty_parents(dest_path, dest_dir)
+
+    if kept:
+        assets = sorted(kept + assets)
+    return assets, stats
+
+
+def copy_file(source_path, dest_path, link=False):
+    """
+    Copies one file using the cheapest mechanism the filesystem supports:
+    a hard link (only when link=True, since the copy then shares the source's
+    inode), a reflink clone, copy_file_range, and finally a regular copy.
+    The destination gets the source's mode and mtime so later syncs can skip it.
+    """
+    # Never write through an existing file: it may be a hard link to a source
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+
+    if link:
+        try:
+            os.link(source_path, dest_path)
+            return
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+
+    if not (_try_clone(source_path, dest_path) or _try_copy_file_range(source_path, dest_path)):
+        shutil.copyfile(source_path, dest_path)
+
+    shutil.copymode(source_path, dest_path)
+    source_stat = os.stat(source_path)
+    os.utime(dest_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+
+
+def _walk_files(root, prefix=""):
+    """Yields the paths of all files under root, relative to root, in sorted order."""
+    with os.scandir(os.path.join(root, prefix) if prefix else root) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        rel_path = os.path.join(prefix, entry.name) if prefix else entry.name
+        if entry.is_dir():
+            yield from _walk_files(root, rel_path)
+        else:
+            yield rel_path
+
+
+def _walk_paths(root, paths):
+    """Yields each file at or under the given paths relative to root, once."""
+    seen = set()
+    for rel_path in sorted(set(paths)):
+        full_path = os.path.join(root, rel_path)
+        if os.path.isdir(full_path):
+            files = _walk_files(root, rel_path)
+        elif os.path.isfile(full_path):
+            files = [rel_path]
+        else:
+            continue
+        for file_path in files:
+            if file_path not in seen:
+                seen.add(file_path)
+                yield file_path
+
+
+def _is_under(rel_path, paths):
+    return any(rel_path == path or rel_path.startswith(path + os.sep) for path in paths)
+
+
+def _is_unchanged(source_path, dest_path, checksum):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    source_stat = os.stat(source_path)
+
+    if (source_stat.st_dev, source_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if checksum:
+        return hash_file(source_path) == hash_file(dest_path)
+    return source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def _try_clone(source_path, dest_path):
+    if fcntl is None:
+        return False
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            return False
+
+
+def _try_copy_file_range(source_path, dest_path):
+    if not hasattr(os, "copy_file_range"):
+        return False
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            return False
+    return True
@@ -0,0 +1,137 @@
+import os
+import re
+
+from minify import minify_template
+
+# Matches {{ Name }} placeholders, e.g. {{ Title }} and {{ Content }}
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Matches {{> path }} includes, e.g. {{> partials/header.html }}, whose file is
+# inserted in their place before the template is compiled
+INCLUDE_PATTERN = re.compile(r'\{\{>\s*([^\s{}]+)\s*\}\}')
+
+# Attribute prefixes whose absolute paths are rewritten to live under the basepath
+PATH_ATTRIBUTES = ('href="/', 'src="/')
+
+# The same attributes as minified output writes them, without quotes
+UNQUOTED_PATH_ATTRIBUTES = ('href=/', 'src=/')
+
+
+def normalize_basepath(basepath):
+    """Ensures basepath ends with / if it's not just "/"."""
+    if basepath != "/" and not basepath.endswith("/"):
+        basepath = basepath + "/"
+    return basepath
+
+
+def rewrite_paths(html, basepath, attributes=PATH_ATTRIBUTES):
+    """Rewrites href="/... and src="/... (or other attributes) so absolute paths start with basepath."""
+    if basepath == "/":
+        return html
+    for attribute in attributes:
+        if attribute in html:
+            html = html.replace(attribute, attribute[:-1] + basepath)
+    return html
+
+
+class Template:
+    """
+    A page template compiled once per build.
+    The template text is split into static segments and named placeholder
+    slots, with basepath rewriting already applied to the static segments, so
+    rendering a page is a single join rather than repeated string replaces.
+    Placeholders without a value are left in the output unchanged.
+    Partials included with {{> path }} are resolved relative to the directory
+    of the including file (path, or the working directory if None); the files
+    used are listed in includes so a build can track them as dependencies.
+    With minify, the static segments are minified as they are compiled
+    (see minify_template) and HtmlNode values are serialized minified.
+    """
+
+    def __init__(self, text, basepath="/", path=None, minify=False):
+        self.basepath = normalize_basepath(basepath)
+        self.minify = minify
+        self.path_attributes = PATH_ATTRIBUTES + UNQUOTED_PATH_ATTRIBUTES if minify else PATH_ATTRIBUTES
+        self.parts = []
+        self.slots = []
+        self.includes = []
+        if "{{>" in text:
+            stack = (os.path.normpath(path),) if path is not None else ()
+            text = self._expand_includes(text, os.path.dirname(path) if path is not None else "", stack)
+        if minify:
+            text = minify_template(text)
+
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.parts.append(rewrite_paths(text[position:match.start()], self.basepath, self.path_attributes))
+            # A slot right after href=" or src=" gets basepath applied to its leading /
+            in_path_attribute = text.endswith(tuple(a[:-1] for a in PATH_ATTRIBUTES), 0, match.start())
+            self.slots.append((len(self.parts), match.group(1), in_path_attribute))
+            self.parts.append(match.group(0))
+            position = match.end()
+        self.parts.append(rewrite_paths(text[position:], self.basepath, self.path_attributes))
+
+    @classmethod
+    def load(cls, template_path, basepath="/", minify=False):
+        """Reads and compiles a template file."""
+        with open(template_path, 'r', encoding='utf-8') as f:
+            return cls(f.read(), basepath, template_path, minify)
+
+    def _expand_includes(self, text, directory, stack):
+        """Replaces each {{> path }} with the file's text, expanding its own includes too."""
+        def include(match):
+            path = os.path.normpath(os.path.join(directory, match.group(1)))
+            if path in stack:
+                raise ValueError(f"Template include cycle: {' -> '.join(stack + (path,))}")
+            if path not in self.includes:
+                self.includes.append(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                partial = f.read()
+            return self._expand_includes(partial, os.path.dirname(path), stack + (path,))
+        return INCLUDE_PATTERN.sub(include, text)
+
+    def render_hash(self, template_hash):
+        """
+        Returns the template hash to record for a page rendered with this
+        template, marked when minified so that toggling minify re-renders pages.
+        """
+        if not self.minify:
+            return template_hash
+        return f"{template_hash or ''}+minified"
+
+    @property
+    def placeholders(self):
+        """Names of the placeholders in the template, in order of appearance."""
+        return [name for _, name, _ in self.slots]
+
+    def iter_render(self, **values):
+        """
+        Yields the page HTML in chunks. A value may be a string or an HtmlNode,
+        which is streamed with iter_html() instead of being rendered to a string.
+        """
+        position = 0
+        for index, name, in_path_attribute in self.slots:
+            yield from self.parts[position:index]
+            position = index + 1
+
+            value = values.get(name)
+            if value is None:
+                yield self.parts[index]
+            elif isinstance(value, str):
+                value = rewrite_paths(value, self.basepath, self.path_attributes)
+                if in_path_attribute and value.startswith("/"):
+                    value = self.basepath + value[1:]
+                yield value
+            else:
+                # Each attribute sits whole inside one chunk, so chunks can be rewritten alone
+                for chunk in value.iter_html(self.minify):
+                    yield rewrite_paths(chunk, self.basepath, self.path_attributes)
+        yield from self.parts[position:]
+
+    def render(self, **values):
+        """Fills the placeholders with the given values and returns the page HTML."""
+        return "".join(self.iter_render(**values))
+
+    def write(self, fp, **values):
+        """Writes the rendered page to a file-like object chunk by chunk."""
+        fp.writelines(self.iter_render(**values))
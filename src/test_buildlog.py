@@ -0,0 +1,85 @@
+import io
+import json
+import logging
+import unittest
+
+from buildlog import BufferedStreamHandler, JsonFormatter, Progress, configure_logging, get_logger
+
+class JsonFormatterTest(unittest.TestCase):
+    def test_includes_extra_fields(self):
+        record = logging.makeLogRecord({
+            "name": "ssg", "levelno": logging.INFO, "levelname": "INFO",
+            "msg": "Rendered %d page(s)", "args": (3,), "rendered": 3,
+        })
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["level"], "info")
+        self.assertEqual(entry["logger"], "ssg")
+        self.assertEqual(entry["message"], "Rendered 3 page(s)")
+        self.assertEqual(entry["rendered"], 3)
+        self.assertNotIn("msg", entry)
+
+class BufferedStreamHandlerTest(unittest.TestCase):
+    def make_logger(self, **kwargs):
+        stream = io.StringIO()
+        handler = BufferedStreamHandler(stream, **kwargs)
+        logger = logging.getLogger("ssg.test_buffered")
+        logger.handlers = [handler]
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        self.addCleanup(setattr, logger, "handlers", [])
+        return logger, handler, stream
+
+    def test_buffers_until_flush(self):
+        logger, handler, stream = self.make_logger(capacity=10, flush_interval=60)
+        logger.info("one")
+        logger.info("two")
+        self.assertEqual(stream.getvalue(), "")
+        handler.flush()
+        self.assertEqual(stream.getvalue(), "one\ntwo\n")
+
+    def test_flushes_when_full(self):
+        logger, _, stream = self.make_logger(capacity=2, flush_interval=60)
+        logger.info("one")
+        logger.info("two")
+        self.assertEqual(stream.getvalue(), "one\ntwo\n")
+
+    def test_warnings_flush_immediately(self):
+        logger, _, stream = self.make_logger(capacity=10, flush_interval=60)
+        logger.info("one")
+        logger.warning("careful")
+        self.assertEqual(stream.getvalue(), "one\ncareful\n")
+
+class ConfigureLoggingTest(unittest.TestCase):
+    def tearDown(self):
+        logger = get_logger()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+    def test_verbosity_levels(self):
+        for verbosity, level in [(2, logging.DEBUG), (1, logging.DEBUG), (0, logging.INFO),
+                                 (-1, logging.WARNING), (-2, logging.ERROR)]:
+            logger = configure_logging(verbosity, stream=io.StringIO())
+            self.assertEqual(logger.level, level)
+            self.assertEqual(len(logger.handlers), 1)
+
+    def test_json_format(self):
+        stream = io.StringIO()
+        configure_logging(0, "json", stream=stream)
+        get_logger().info("Built", extra={"pages": 2})
+        get_logger("child").debug("hidden")
+        get_logger().handlers[0].flush()
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["pages"], 2)
+
+class ProgressTest(unittest.TestCase):
+    def test_silent_when_not_a_terminal(self):
+        stream = io.StringIO()
+        bar = Progress(10, "Rendering", stream=stream)
+        bar.advance(10)
+        bar.close()
+        self.assertEqual(stream.getvalue(), "")
+        self.assertEqual(bar.done, 10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+
+from buildstats import PAGE_STAGES, BuildTimer
+
+class BuildTimerTest(unittest.TestCase):
+    def test_record_page_adds_to_stage_totals(self):
+        timer = BuildTimer()
+        timer.record_page("a.md", read=1.0, write=2.0)
+        timer.add_page("b.md", {"read": 0.5, "to_html": 1.0})
+        self.assertEqual(timer.totals["read"], 1.5)
+        self.assertEqual(timer.totals["write"], 2.0)
+        self.assertEqual(timer.totals["to_html"], 1.0)
+        self.assertTrue(set(PAGE_STAGES) <= set(timer.totals))
+
+    def test_add_stage(self):
+        timer = BuildTimer()
+        timer.record_page("a.md", read=1.0, write=0.5)
+        timer.add_stage("a.md", "write", 2.0)
+        self.assertEqual(timer.pages["a.md"], {"read": 1.0, "write": 2.5})
+        self.assertEqual(timer.totals["write"], 2.5)
+
+    def test_slowest_pages_first(self):
+        timer = BuildTimer()
+        timer.record_page("fast.md", read=0.1)
+        timer.record_page("slow.md", read=0.2, write=0.3)
+        timer.record_page("medium.md", read=0.3)
+        self.assertEqual([source for source, _, _ in timer.slowest(2)], ["slow.md", "medium.md"])
+
+    def test_phases_add_up(self):
+        timer = BuildTimer()
+        with timer.phase("walk"):
+            pass
+        with timer.phase("walk"):
+            pass
+        self.assertEqual(list(timer.phases), ["walk"])
+        self.assertGreaterEqual(timer.phases["walk"], 0.0)
+
+    def test_write_report(self):
+        timer = BuildTimer()
+        timer.record_page("a.md", read=0.25)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "build-report.json")
+            timer.write_report(path, slowest=1, basepath="/")
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(report["basepath"], "/")
+        self.assertEqual(report["pages_rendered"], 1)
+        self.assertEqual(report["slowest_pages"], [{"source": "a.md", "seconds": 0.25, "stages": {"read": 0.25}}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from frontmatter import parse_front_matter, read_front_matter, skip_front_matter, split_front_matter
+
+class SplitFrontMatterTest(unittest.TestCase):
+    def test_yaml_front_matter(self):
+        text = (
+            "---\n"
+            "title: A post: part one\n"
+            "date: 2024-05-01\n"
+            "tags: [python, 'static sites']\n"
+            "draft: false\n"
+            "weight: 3\n"
+            "aliases:\n"
+            "  - /old\n"
+            "  - /older\n"
+            "---\n"
+            "# Heading\n"
+        )
+        front_matter, body = split_front_matter(text)
+        self.assertEqual(front_matter, {
+            "title": "A post: part one",
+            "date": "2024-05-01",
+            "tags": ["python", "static sites"],
+            "draft": False,
+            "weight": 3,
+            "aliases": ["/old", "/older"],
+        })
+        self.assertEqual(body, "# Heading\n")
+
+    def test_toml_front_matter(self):
+        front_matter, body = split_front_matter('+++\ntitle = "T"\ndate = 2024-05-01\ndraft = true\n+++\nbody')
+        self.assertEqual(front_matter, {"title": "T", "date": "2024-05-01", "draft": True})
+        self.assertEqual(body, "body")
+
+    def test_without_front_matter(self):
+        for text in ["# Title\n---\n", " ---\nx: 1\n---\n", "---", "", "---\ntitle: x\n", "---\n\nA rule\n"]:
+            self.assertEqual(split_front_matter(text), ({}, text))
+
+    def test_invalid_front_matter(self):
+        for text in ["---\nnot a pair\n---\n", "---\n- item\n---\n", "+++\ntitle = \n+++\n"]:
+            with self.assertRaises(ValueError, msg=text):
+                split_front_matter(text)
+
+    def test_comments_and_blank_lines(self):
+        self.assertEqual(parse_front_matter("# comment\n\ntitle: x # not a comment\n"), {"title": "x # not a comment"})
+
+class ReadFrontMatterTest(unittest.TestCase):
+    def test_reads_the_header(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("---\ntitle: Hi\n---\n# Body\n\n---\nnot: front matter\n---\n")
+            self.assertEqual(read_front_matter(path), {"title": "Hi"})
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("# No front matter\n---\ntitle: x\n---\n")
+            self.assertEqual(read_front_matter(path), {})
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("---\n\nA rule, not front matter\n")
+            self.assertEqual(read_front_matter(path), {})
+
+    def test_skip_front_matter(self):
+        self.assertEqual(list(skip_front_matter(["---", "a: 1", "---", "# T", ""])), ["# T", ""])
+        self.assertEqual(list(skip_front_matter(["# T", "---"])), ["# T", "---"])
+        self.assertEqual(list(skip_front_matter(["---", "a: 1"])), ["---", "a: 1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from htmlnode import HtmlNode, LeafNode, ParentNode
@@ -142,3 +143,79 @@ class HtmlNodeTest(unittest.TestCase):
         child_node = LeafNode("span", "test")
         parent_node = ParentNode("div", [child_node])
         self.assertEqual(parent_node.props, {})
+
+    # ===== Streaming Serialization Tests =====
+    def test_iter_html_joins_to_to_html(self):
+        root = ParentNode("div", [
+            ParentNode("p", [LeafNode(None, "text "), LeafNode("b", "bold")]),
+            LeafNode("a", "link", {"href": "/x"}),
+        ], {"class": "page"})
+        self.assertEqual("".join(root.iter_html()), root.to_html())
+        self.assertGreater(len(list(root.iter_html())), 1)
+
+    def test_leaf_iter_html_yields_value_unchanged(self):
+        value = "x" * 1000
+        self.assertIn(value, list(LeafNode("code", value).iter_html()))
+
+    def test_write_html(self):
+        root = ParentNode("ul", [ParentNode("li", [LeafNode("i", "one")]), ParentNode("li", [LeafNode(None, "two")])])
+        buffer = io.StringIO()
+        root.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), "<ul><li><i>one</i></li><li>two</li></ul>")
+
+    def test_iter_html_raises_for_nested_empty_parent(self):
+        root = ParentNode("div", [ParentNode("b", [])])
+        with self.assertRaises(ValueError) as context:
+            root.write_html(io.StringIO())
+        self.assertIn("must have children", str(context.exception))
+
+    def test_iter_html_raises_for_leaf_without_value(self):
+        root = ParentNode("div", [LeafNode("p", None)])
+        with self.assertRaises(ValueError):
+            list(root.iter_html())
+
+    def test_iter_html_uses_custom_node_to_html(self):
+        class Comment(HtmlNode):
+            def to_html(self):
+                return "<!-- note -->"
+        self.assertEqual(ParentNode("div", [Comment()]).to_html(), "<div><!-- note --></div>")
+
+    # ===== Compact Representation Tests =====
+    def test_nodes_have_no_instance_dict(self):
+        for node in [LeafNode("b", "x"), ParentNode("p", [LeafNode(None, "x")]), HtmlNode("div")]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_leaf_nodes_share_empty_defaults(self):
+        first = LeafNode("b", "one")
+        second = LeafNode("i", "two")
+        self.assertIs(first.children, second.children)
+        self.assertIs(first.props, second.props)
+        self.assertEqual(first.props, {})
+
+    def test_minified_html(self):
+        node = ParentNode("div", [
+            ParentNode("p", [
+                LeafNode(None, "Some\n   text "),
+                LeafNode("a", "a  link", {"href": "/about/", "title": "About us"}),
+            ]),
+            ParentNode("pre", [LeafNode("code", "def f():\n    return  1\n")]),
+            LeafNode("code", "a  b"),
+        ], {"class": "page"})
+        expected = (
+            '<div class=page><p>Some text <a href=/about/ title="About us">a link</a></p>'
+            '<pre><code>def f():\n    return  1\n</code></pre><code>a  b</code></div>'
+        )
+        self.assertEqual(node.to_html(minify=True), expected)
+        self.assertEqual("".join(node.iter_html(True)), expected)
+        # The default output is unchanged
+        self.assertIn('<p>Some\n   text <a href="/about/"', node.to_html())
+
+    def test_minify_keeps_raw_preserved_html(self):
+        raw = "<pre>\n  indented\n</pre>"
+        self.assertEqual(LeafNode(None, raw).to_html(minify=True), raw)
+        self.assertEqual(LeafNode(None, "a\u00a0\u00a0b").to_html(minify=True), "a\u00a0\u00a0b")
+
+    def test_shared_default_props_are_read_only(self):
+        node = LeafNode("b", "x")
+        with self.assertRaises(TypeError):
+            node.props["class"] = "y"
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+
+from listing import (
+    find_sections,
+    generate_listings,
+    listing_key,
+    listing_node,
+    listing_output_path,
+    listing_title,
+    page_metadata,
+    page_url,
+    sort_pages,
+)
+from manifest import BuildManifest
+from template import Template
+
+class ListingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.docs = os.path.join(self.root, "docs")
+        self.template = Template("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add_page(self, *parts):
+        path = os.path.join(self.content, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write("# Page\n")
+        return path
+
+    def test_page_metadata(self):
+        front_matter = {"date": "2024-05-01", "tags": ["a"], "description": "About"}
+        self.assertEqual(
+            page_metadata(front_matter, "Hi"),
+            {"title": "Hi", "date": "2024-05-01", "description": "About"},
+        )
+        self.assertEqual(page_metadata({}, "Hi"), {"title": "Hi"})
+
+    def test_find_sections(self):
+        home = self.add_page("index.md")
+        post = self.add_page("blog", "code", "post", "index.md")
+        note = self.add_page("blog", "code", "note.md")
+        about = self.add_page("about", "index.md")
+        sections = find_sections([home, post, note, about], self.content)
+        self.assertEqual(sections, {
+            os.path.join(self.content, "blog"): [post, note],
+            os.path.join(self.content, "blog", "code"): [post, note],
+        })
+
+    def test_section_with_index_is_not_listed(self):
+        post = self.add_page("blog", "post", "index.md")
+        self.add_page("blog", "index.md")
+        self.assertEqual(find_sections([post], self.content), {})
+
+    def test_sort_pages_newest_first(self):
+        metadata = {
+            "a.md": {"title": "b", "date": "2024-01-01"},
+            "b.md": {"title": "a"},
+            "c.md": {"title": "c", "date": "2024-03-01"},
+            "d.md": {"title": "A"},
+        }
+        self.assertEqual(sort_pages(["a.md", "b.md", "c.md", "d.md"], metadata), ["c.md", "a.md", "b.md", "d.md"])
+
+    def test_paths_and_urls(self):
+        section = os.path.join("content", "blog")
+        self.assertEqual(listing_output_path(section, 1, "content", "docs"), os.path.join("docs", "blog", "index.html"))
+        self.assertEqual(
+            listing_output_path(section, 2, "content", "docs"),
+            os.path.join("docs", "blog", "page", "2", "index.html"),
+        )
+        self.assertEqual(listing_key(section, 2), os.path.join("content", "blog", "page", "2", "index.html"))
+        self.assertEqual(page_url(os.path.join("docs", "blog", "index.html"), "docs"), "/blog/")
+        self.assertEqual(page_url(os.path.join("docs", "blog", "a.html"), "docs"), "/blog/a.html")
+        self.assertEqual(listing_title(os.path.join("content", "side-projects"), 1), "Side projects")
+        self.assertEqual(listing_title(os.path.join("content", "blog"), 3), "Blog (page 3)")
+
+    def test_listing_node(self):
+        items = [("/a/", {"title": "A & B", "date": "2024-01-01"}), ("/b/", {"title": "B", "description": "x"})]
+        self.assertEqual(
+            listing_node(items, 2, 3, ["/blog/", "/blog/page/2/", "/blog/page/3/"]).to_html(),
+            '<section><ul class="listing">'
+            '<li><a href="/a/">A &amp; B</a><time>2024-01-01</time></li>'
+            '<li><a href="/b/">B</a><p>x</p></li></ul>'
+            '<nav class="pagination"><a href="/blog/" rel="prev">Newer</a>'
+            '<a href="/blog/page/3/" rel="next">Older</a></nav></section>',
+        )
+        self.assertNotIn("<nav", listing_node(items, 1, 1, ["/blog/"]).to_html())
+
+    def test_generate_listings_paginates(self):
+        listed = {}
+        for number in range(5):
+            source = self.add_page("blog", f"post{number}.md")
+            listed[source] = (os.path.join(self.docs, "blog", f"post{number}.html"),
+                              {"title": f"Post {number}", "date": f"2024-01-0{number + 1}"})
+        stats = generate_listings(listed, self.content, self.docs, self.template, page_size=2)
+        self.assertEqual((stats.rendered, stats.failures), (3, []))
+
+        with open(os.path.join(self.docs, "blog", "index.html")) as f:
+            first = f.read()
+        self.assertIn("<title>Blog</title>", first)
+        self.assertLess(first.index("Post 4"), first.index("Post 3"))
+        with open(os.path.join(self.docs, "blog", "page", "3", "index.html")) as f:
+            self.assertIn('<a href="/blog/post0.html">Post 0</a>', f.read())
+
+    def test_generate_listings_incremental(self):
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        listed = {}
+        for name in ("a", "b", "c"):
+            source = self.add_page("blog", f"{name}.md")
+            output = os.path.join(self.docs, "blog", f"{name}.html")
+            listed[source] = (output, {"title": name.upper()})
+            manifest.record(source, "h", "t", "/", output, metadata=listed[source][1])
+
+        stats = generate_listings(listed, self.content, self.docs, self.template, manifest, page_size=2)
+        self.assertEqual((stats.rendered, stats.unchanged), (2, 0))
+        stats = generate_listings(listed, self.content, self.docs, self.template, manifest, page_size=2)
+        self.assertEqual((stats.rendered, stats.unchanged), (0, 2))
+
+        # Only the listing page showing the renamed page is rendered again
+        source = os.path.join(self.content, "blog", "c.md")
+        listed[source] = (listed[source][0], {"title": "Z"})
+        manifest.record(source, "h", "t", "/", listed[source][0], metadata=listed[source][1])
+        stats = generate_listings(listed, self.content, self.docs, self.template, manifest, page_size=2)
+        self.assertEqual((stats.rendered, stats.unchanged), (1, 1))
+
+        # Fewer pages: the second listing page goes away
+        del listed[source]
+        stats = generate_listings(listed, self.content, self.docs, self.template, manifest, page_size=2)
+        self.assertEqual(stats.removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog", "page", "2", "index.html")))
+        self.assertNotIn(listing_key(os.path.join(self.content, "blog"), 2), manifest.pages)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,333 @@
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from buildstats import BuildTimer
+from htmlnode import ParentNode
+from main import PageBuildError, copy_static_to_public, generate_page, generate_pages_recursive, rebuild_changed, stream_page
+from manifest import BuildManifest
+from rendercache import RenderCache
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+class MainTestCase(unittest.TestCase):
+    """Builds in a temporary site directory with content/, static/ and template.html."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.write("template.html", TEMPLATE)
+        self.write(os.path.join("static", "index.css"), "body { margin: 0; }")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def write(self, name, text):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read(self, name):
+        with open(self.path(name)) as f:
+            return f.read()
+
+    def run_main(self, *args):
+        """Runs main.py in the site directory and returns the finished process."""
+        return subprocess.run([sys.executable, MAIN_PATH, *args], cwd=self.root, capture_output=True, text=True)
+
+
+class ParallelBuildTest(MainTestCase):
+    def test_jobs_build_logs_each_line_once(self):
+        for number in range(6):
+            self.write(os.path.join("content", f"page{number}.md"), f"# Page {number}\n\nText")
+        result = self.run_main("-j", "3", "--no-search")
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        lines = result.stderr.splitlines()
+        self.assertEqual(len([line for line in lines if line.startswith("Synced static")]), 1)
+        self.assertEqual(len([line for line in lines if line.startswith("Built 6 page(s)")]), 1)
+        self.assertIn("<title>Page 5</title>", self.read(os.path.join("docs", "page5.html")))
+
+    def test_jobs_output_matches_a_serial_build(self):
+        for number in range(6):
+            self.write(os.path.join("content", "blog", f"post{number}.md"), f"# Post {number}\n\n*Text* {number}")
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("serial"), page_size=0)
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("parallel"), jobs=3,
+                                 page_size=0)
+        for number in range(6):
+            name = os.path.join("blog", f"post{number}.html")
+            self.assertEqual(self.read(os.path.join("parallel", name)), self.read(os.path.join("serial", name)))
+
+    def test_failures_are_raised_together_in_input_order(self):
+        for name in ("a", "c", "e"):
+            self.write(os.path.join("content", f"{name}.md"), f"# {name}\n\nText")
+        for name in ("d", "b"):
+            self.write(os.path.join("content", f"{name}.md"), "No title here")
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                dest = self.path(f"docs{jobs}")
+                with self.assertRaises(PageBuildError) as raised:
+                    generate_pages_recursive(self.path("content"), self.path("template.html"), dest, jobs=jobs,
+                                             page_size=0)
+                self.assertEqual([source for source, _ in raised.exception.failures],
+                                 [self.path("content", "b.md"), self.path("content", "d.md")])
+                # The other pages are still written
+                for name in ("a", "c", "e"):
+                    self.assertTrue(os.path.exists(os.path.join(dest, f"{name}.html")))
+
+    def test_bad_front_matter_fails_only_its_page(self):
+        self.write(os.path.join("content", "a.md"), "# A")
+        self.write(os.path.join("content", "b.md"), "---\ntitle x\n---\n# B")
+        self.write(os.path.join("content", "c.md"), "# C")
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                dest = self.path(f"docs{jobs}")
+                manifest = BuildManifest(self.path(f"manifest{jobs}.json"))
+                with self.assertRaises(PageBuildError) as raised:
+                    generate_pages_recursive(self.path("content"), self.path("template.html"), dest,
+                                             manifest=manifest, jobs=jobs, page_size=0)
+                [(source, error)] = raised.exception.failures
+                self.assertEqual(source, self.path("content", "b.md"))
+                self.assertTrue(error.startswith("ValueError"), error)
+                self.assertTrue(os.path.exists(os.path.join(dest, "a.html")))
+                self.assertTrue(os.path.exists(os.path.join(dest, "c.html")))
+
+    def test_missing_page_template_fails_only_its_page(self):
+        self.write(os.path.join("content", "a.md"), "# A")
+        self.write(os.path.join("content", "post.md"), "---\ntemplate: templates/post.html\n---\n# Post")
+        for manifest in (None, BuildManifest(self.path("manifest.json"))):
+            with self.subTest(manifest=manifest is not None):
+                dest = self.path("docs" if manifest is None else "docs-manifest")
+                with self.assertRaises(PageBuildError) as raised:
+                    generate_pages_recursive(self.path("content"), self.path("template.html"), dest,
+                                             manifest=manifest, page_size=0)
+                [(source, error)] = raised.exception.failures
+                self.assertEqual(source, self.path("content", "post.md"))
+                self.assertTrue(error.startswith("FileNotFoundError"), error)
+                self.assertTrue(os.path.exists(os.path.join(dest, "a.html")))
+
+    def test_main_reports_a_missing_page_template(self):
+        self.write(os.path.join("content", "index.md"), "# Home")
+        self.write(os.path.join("content", "post.md"), "---\ntemplate: templates/post.html\n---\n# Post")
+        result = self.run_main("--no-search")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Failed to generate 1 page(s)", result.stderr)
+        self.assertIn("templates/post.html", result.stderr)
+        self.assertNotIn("Traceback", result.stderr)
+
+    def test_unclosed_front_matter_delimiter_is_markdown(self):
+        self.write(os.path.join("content", "a.md"), "---\n\n# Rule first\n\nText")
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"), page_size=0)
+        page = self.read(os.path.join("docs", "a.html"))
+        self.assertIn("<title>Rule first</title>", page)
+        self.assertIn("<p>---</p>", page)
+
+    def test_main_reports_failures_without_a_traceback(self):
+        self.write(os.path.join("content", "index.md"), "# Home")
+        self.write(os.path.join("content", "broken.md"), "No title here")
+        for jobs in ("1", "2"):
+            with self.subTest(jobs=jobs):
+                result = self.run_main("-j", jobs, "--no-search")
+                self.assertEqual(result.returncode, 1)
+                self.assertIn("Failed to generate 1 page(s)", result.stderr)
+                self.assertIn("broken.md", result.stderr)
+                self.assertNotIn("Traceback", result.stderr)
+
+
+class IncrementalBuildTest(MainTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manifest = BuildManifest(self.path("manifest.json"))
+
+    def build(self, **kwargs):
+        self.manifest.begin_build()
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"),
+                                 manifest=self.manifest, page_size=0, **kwargs)
+
+    def test_skips_unchanged_pages(self):
+        self.write(os.path.join("content", "a.md"), "# A")
+        self.write(os.path.join("content", "b.md"), "# B")
+        self.build()
+        with mock.patch("main.generate_page", wraps=generate_page) as render:
+            self.build()
+            self.assertEqual(render.call_count, 0)
+
+            self.write(os.path.join("content", "b.md"), "# B again")
+            self.build()
+            self.assertEqual([call.args[0] for call in render.call_args_list], [self.path("content", "b.md")])
+        self.assertIn("<title>B again</title>", self.read(os.path.join("docs", "b.html")))
+
+    def test_prune_deletes_output_of_removed_pages(self):
+        self.write(os.path.join("content", "a.md"), "# A")
+        old = self.write(os.path.join("content", "old", "index.md"), "# Old")
+        self.build()
+        self.assertTrue(os.path.exists(self.path("docs", "old", "index.html")))
+
+        os.remove(old)
+        self.build()
+        self.assertEqual(self.manifest.prune(self.path("docs")), [self.path("docs", "old", "index.html")])
+        self.assertFalse(os.path.exists(self.path("docs", "old")))
+        self.assertTrue(os.path.exists(self.path("docs", "a.html")))
+
+    def test_drafts_are_skipped_unless_asked_for(self):
+        self.write(os.path.join("content", "a.md"), "# A")
+        self.write(os.path.join("content", "wip.md"), "---\ndraft: true\n---\n# Work in progress")
+        self.build()
+        self.assertFalse(os.path.exists(self.path("docs", "wip.html")))
+        self.assertNotIn(self.path("content", "wip.md"), self.manifest.pages)
+
+        self.build(drafts=True)
+        self.assertIn("<title>Work in progress</title>", self.read(os.path.join("docs", "wip.html")))
+
+
+class RebuildChangedTest(MainTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("template.html", "<html><title>{{ Title }}</title>{{> header.html }}{{ Content }}</html>")
+        self.write("header.html", "<header>Docs</header>")
+        self.write("plain.html", TEMPLATE)
+        self.write(os.path.join("content", "a.md"), "# A")
+        self.write(os.path.join("content", "b.md"), "# B")
+        self.write(os.path.join("content", "plain.md"), f"---\ntemplate: {self.path('plain.html')}\n---\n# Plain")
+        self.manifest = BuildManifest(self.path("manifest.json"))
+        generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"),
+                                 manifest=self.manifest, page_size=0)
+
+    def rebuild(self, *changed):
+        return rebuild_changed(list(changed), self.manifest, content_dir=self.path("content"),
+                               static_dir=self.path("static"), template_path=self.path("template.html"),
+                               dest_dir=self.path("docs"), page_size=0)
+
+    def test_renders_only_the_changed_page(self):
+        page = self.write(os.path.join("content", "a.md"), "# A again")
+        with mock.patch("main.generate_page", wraps=generate_page) as render:
+            self.assertEqual(self.rebuild(page), 1)
+        self.assertEqual([call.args[0] for call in render.call_args_list], [page])
+        self.assertIn("<title>A again</title>", self.read(os.path.join("docs", "a.html")))
+
+    def test_removes_the_page_of_a_deleted_file(self):
+        page = self.path("content", "b.md")
+        os.remove(page)
+        self.assertEqual(self.rebuild(page), 1)
+        self.assertFalse(os.path.exists(self.path("docs", "b.html")))
+        self.assertNotIn(page, self.manifest.pages)
+
+    def test_partial_change_renders_its_dependents(self):
+        partial = self.write("header.html", "<header>New docs</header>")
+        with mock.patch("main.generate_page", wraps=generate_page) as render:
+            self.assertEqual(self.rebuild(partial), 2)
+        self.assertEqual(sorted(call.args[0] for call in render.call_args_list),
+                         [self.path("content", "a.md"), self.path("content", "b.md")])
+        self.assertIn("<header>New docs</header>", self.read(os.path.join("docs", "a.html")))
+        self.assertNotIn("header", self.read(os.path.join("docs", "plain.html")))
+
+
+class StreamPageTest(MainTestCase):
+    def test_streamed_page_matches_a_rendered_one(self):
+        source = self.write(os.path.join("content", "big.md"),
+                            "Intro\n\n# Big page\n\n" + "\n\n".join(f"Paragraph **{n}**" for n in range(50))
+                            + "\n\n```\ncode\n```\n\n- one\n- two")
+        generate_page(source, self.path("template.html"), self.path("docs", "rendered.html"))
+        with mock.patch("main.STREAM_THRESHOLD", 1), mock.patch("main.stream_page", wraps=stream_page) as streamed:
+            generate_page(source, self.path("template.html"), self.path("docs", "streamed.html"))
+        self.assertEqual(streamed.call_count, 1)
+        self.assertEqual(self.read(os.path.join("docs", "streamed.html")),
+                         self.read(os.path.join("docs", "rendered.html")))
+        self.assertIn("<title>Big page</title>", self.read(os.path.join("docs", "streamed.html")))
+
+    def test_unchanged_page_is_not_rewritten(self):
+        source = self.write(os.path.join("content", "big.md"), "# Big page\n\n" + "Paragraph\n\n" * 50)
+        dest = self.path("docs", "big.html")
+        with mock.patch("main.STREAM_THRESHOLD", 1):
+            generate_page(source, self.path("template.html"), dest)
+            os.utime(dest, ns=(0, 0))
+            generate_page(source, self.path("template.html"), dest)
+            self.assertEqual(os.stat(dest).st_mtime_ns, 0)
+
+            self.write(os.path.join("content", "big.md"), "# Big page\n\nChanged")
+            generate_page(source, self.path("template.html"), dest)
+        self.assertNotEqual(os.stat(dest).st_mtime_ns, 0)
+        self.assertIn("<p>Changed</p>", self.read(os.path.join("docs", "big.html")))
+
+
+class CopyStaticTest(MainTestCase):
+    def test_copies_changed_files_only(self):
+        page = self.write(os.path.join("docs", "index.html"), "<p>Page</p>")
+        self.assertEqual(copy_static_to_public(self.path("static"), self.path("docs")).copied, 1)
+        self.assertEqual(self.read(os.path.join("docs", "index.css")), "body { margin: 0; }")
+        # Generated pages are kept, and unchanged assets are not copied again
+        self.assertTrue(os.path.exists(page))
+        stats = copy_static_to_public(self.path("static"), self.path("docs"))
+        self.assertEqual((stats.copied, stats.skipped), (0, 1))
+
+
+class TimedBuildTest(MainTestCase):
+    def test_timing_does_not_serialize_bodies_on_their_own(self):
+        self.write(os.path.join("content", "a.md"), "# A\n\nText")
+        self.write(os.path.join("content", "b.md"), "# B\n\nMore")
+        timer = BuildTimer()
+        # Without a render cache, bodies are streamed into the pages as they are written
+        with mock.patch.object(ParentNode, "to_html", side_effect=AssertionError("joined the body")):
+            generate_pages_recursive(self.path("content"), self.path("template.html"), self.path("docs"),
+                                     timer=timer, page_size=0)
+        self.assertEqual(self.read(os.path.join("docs", "a.html")),
+                         "<html><title>A</title><body><div><h1>A</h1><p>Text</p></div></body></html>")
+        self.assertEqual(sorted(timer.pages), [self.path("content", "a.md"), self.path("content", "b.md")])
+        self.assertGreater(timer.pages[self.path("content", "a.md")]["write"], 0)
+
+
+class RenderCacheHitTest(MainTestCase):
+    def test_hit_takes_the_title_from_the_entry(self):
+        source = self.write(os.path.join("content", "a.md"), "Intro\n\n# Cached title\n\nText")
+        cache = RenderCache(self.path("cache"))
+        generate_page(source, self.path("template.html"), self.path("docs", "a.html"), cache=cache)
+        with mock.patch("main.extract_title_from_lines", side_effect=AssertionError("rescanned")):
+            generate_page(source, self.path("template.html"), self.path("docs", "b.html"), cache=cache)
+        self.assertEqual(self.read(os.path.join("docs", "b.html")), self.read(os.path.join("docs", "a.html")))
+        self.assertIn("<title>Cached title</title>", self.read(os.path.join("docs", "b.html")))
+
+
+class WatchLoggingTest(MainTestCase):
+    def read_until(self, lines, prefix, timeout=10):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = lines.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.fail(f"No line starting with {prefix!r} within {timeout}s")
+            if line.startswith(prefix):
+                return line
+
+    def test_lines_show_up_without_waiting_for_a_change(self):
+        page = self.write(os.path.join("content", "index.md"), "# Home")
+        process = subprocess.Popen([sys.executable, MAIN_PATH, "watch", "--port", "0", "--poll", "--no-search"],
+                                   cwd=self.root, stderr=subprocess.PIPE, text=True)
+        lines = queue.Queue()
+        reader = threading.Thread(target=lambda: [lines.put(line) for line in process.stderr], daemon=True)
+        reader.start()
+        try:
+            self.read_until(lines, "Serving docs at")
+            with open(page, "w") as f:
+                f.write("# Home again")
+            self.read_until(lines, "Rebuilt")
+        finally:
+            process.terminate()
+            process.wait()
+            process.stderr.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
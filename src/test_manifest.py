@@ -0,0 +1,199 @@
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest, GENERATOR_VERSION, hash_file
+
+class BuildManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.manifest_path = os.path.join(self.root, "cache", "manifest.json")
+        self.output = os.path.join(self.root, "docs", "post", "index.html")
+        os.makedirs(os.path.dirname(self.output))
+        with open(self.output, "w") as f:
+            f.write("<p>hi</p>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hash_file_changes_with_content(self):
+        path = os.path.join(self.root, "a.md")
+        with open(path, "w") as f:
+            f.write("# One")
+        first = hash_file(path)
+        with open(path, "w") as f:
+            f.write("# Two")
+        self.assertNotEqual(first, hash_file(path))
+
+    def test_fresh_after_record(self):
+        manifest = BuildManifest(self.manifest_path)
+        self.assertFalse(manifest.is_fresh("a.md", "h1", "t1", "/", self.output))
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        self.assertTrue(manifest.is_fresh("a.md", "h1", "t1", "/", self.output))
+
+    def test_not_fresh_when_inputs_change(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        self.assertFalse(manifest.is_fresh("a.md", "h2", "t1", "/", self.output))
+        self.assertFalse(manifest.is_fresh("a.md", "h1", "t2", "/", self.output))
+        self.assertFalse(manifest.is_fresh("a.md", "h1", "t1", "/blog/", self.output))
+
+    def test_not_fresh_when_output_missing(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        os.remove(self.output)
+        self.assertFalse(manifest.is_fresh("a.md", "h1", "t1", "/", self.output))
+
+    def test_save_and_load_round_trip(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        manifest.save()
+        loaded = BuildManifest.load(self.manifest_path)
+        self.assertEqual(loaded.pages, manifest.pages)
+        self.assertTrue(loaded.is_fresh("a.md", "h1", "t1", "/", self.output))
+
+    def test_load_discards_other_generator_version(self):
+        os.makedirs(os.path.dirname(self.manifest_path))
+        with open(self.manifest_path, "w") as f:
+            f.write('{"version": "old-%s", "pages": {"a.md": {}}}' % GENERATOR_VERSION)
+        self.assertEqual(BuildManifest.load(self.manifest_path).pages, {})
+
+    def test_load_missing_or_corrupt_manifest(self):
+        self.assertEqual(BuildManifest.load(self.manifest_path).pages, {})
+        os.makedirs(os.path.dirname(self.manifest_path))
+        with open(self.manifest_path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(BuildManifest.load(self.manifest_path).pages, {})
+
+    def test_prune_removes_outputs_of_unseen_sources(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        manifest.save()
+
+        next_build = BuildManifest.load(self.manifest_path)
+        removed = next_build.prune(os.path.join(self.root, "docs"))
+
+        self.assertEqual(removed, [self.output])
+        self.assertEqual(next_build.pages, {})
+        self.assertFalse(os.path.exists(os.path.dirname(self.output)))
+        self.assertTrue(os.path.exists(os.path.join(self.root, "docs")))
+
+    def test_prune_keeps_seen_sources(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        self.assertEqual(manifest.prune(os.path.join(self.root, "docs")), [])
+        self.assertTrue(os.path.exists(self.output))
+
+    def test_begin_build_forgets_seen_sources(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        manifest.begin_build()
+        self.assertEqual(manifest.prune(os.path.join(self.root, "docs")), [self.output])
+
+    def test_remove_single_page(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        self.assertEqual(manifest.remove("a.md", os.path.join(self.root, "docs")), self.output)
+        self.assertIsNone(manifest.remove("a.md", os.path.join(self.root, "docs")))
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_remove_keeps_output_written_by_another_page(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("listing", "h1", "t1", "/", self.output)
+        manifest.record("index.md", "h2", "t1", "/", self.output)
+        self.assertIsNone(manifest.remove("listing", self.root))
+        self.assertTrue(os.path.exists(self.output))
+        self.assertNotIn("listing", manifest.pages)
+
+    def test_page_front_matter_cached_by_stat(self):
+        source = os.path.join(self.root, "a.md")
+        with open(source, "w") as f:
+            f.write("---\ntitle: One\n---\n# Body")
+        manifest = BuildManifest(self.manifest_path)
+        self.assertEqual(manifest.page_front_matter(source), {"title": "One"})
+
+        manifest.front_matter[source]["data"] = {"title": "Cached"}
+        self.assertEqual(manifest.page_front_matter(source), {"title": "Cached"})
+
+        with open(source, "w") as f:
+            f.write("---\ntitle: Two!\n---\n# Body")
+        self.assertEqual(manifest.page_front_matter(source), {"title": "Two!"})
+
+        manifest.save()
+        self.assertEqual(BuildManifest.load(self.manifest_path).page_front_matter(source), {"title": "Two!"})
+        os.remove(source)
+        manifest.prune(self.root)
+        self.assertEqual(manifest.front_matter, {})
+
+    def test_relocate_outputs(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", os.path.join("docs", "a.html"))
+        manifest.record("b.md", "h1", "t1", "/", os.path.join("docs2", "b.html"))
+        manifest.relocate("docs", "staging")
+        self.assertEqual(manifest.pages["a.md"]["output"], os.path.join("staging", "a.html"))
+        self.assertEqual(manifest.pages["b.md"]["output"], os.path.join("docs2", "b.html"))
+
+    def test_not_fresh_when_dependency_file_changes(self):
+        partial = os.path.join(self.root, "nav.html")
+        with open(partial, "w") as f:
+            f.write("<nav></nav>")
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output, files=manifest.file_hashes([partial]))
+        self.assertTrue(manifest.is_fresh("a.md", "h1", "t1", "/", self.output))
+
+        with open(partial, "w") as f:
+            f.write("<nav>changed</nav>")
+        manifest.forget_hash(partial)
+        self.assertFalse(manifest.is_fresh("a.md", "h1", "t1", "/", self.output))
+        os.remove(partial)
+        manifest.forget_hash(partial)
+        self.assertFalse(manifest.is_fresh("a.md", "h1", "t1", "/", self.output))
+
+    def test_not_fresh_when_used_metadata_changes(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("post.md", "h1", "t1", "/", self.output, metadata={"title": "One"})
+        manifest.record("index.md", "h2", "t1", "/", self.output, uses={"post.md": manifest.metadata_hash("post.md")})
+        self.assertTrue(manifest.is_fresh("index.md", "h2", "t1", "/", self.output))
+
+        # Re-rendering the post with the same metadata leaves the index alone
+        manifest.record("post.md", "h3", "t1", "/", self.output, metadata={"title": "One"})
+        self.assertTrue(manifest.is_fresh("index.md", "h2", "t1", "/", self.output))
+        manifest.record("post.md", "h4", "t1", "/", self.output, metadata={"title": "Two"})
+        self.assertFalse(manifest.is_fresh("index.md", "h2", "t1", "/", self.output))
+
+    def test_metadata_hash_of_unknown_page(self):
+        self.assertIsNone(BuildManifest(self.manifest_path).metadata_hash("missing.md"))
+
+    def test_dependents(self):
+        manifest = BuildManifest(self.manifest_path)
+        template = os.path.join("templates", "post.html")
+        partial = os.path.join("templates", "partials", "nav.html")
+        manifest.record(os.path.join("content", "a.md"), "h", "t", "/", "a.html", files={"template.html": "t"})
+        manifest.record(os.path.join("content", "b.md"), "h", "t", "/", "b.html", files={template: "t", partial: "p"},
+                        metadata={"title": "B"})
+        manifest.record(os.path.join("content", "index.md"), "h", "t", "/", "index.html",
+                        files={"template.html": "t"}, uses={os.path.join("content", "b.md"): "m"})
+
+        self.assertEqual(manifest.dependents([partial]), {os.path.join("content", "b.md")})
+        self.assertEqual(manifest.dependents(["templates"]), {os.path.join("content", "b.md")})
+        self.assertEqual(
+            manifest.dependents([os.path.join("content", "b.md")]),
+            {os.path.join("content", "b.md"), os.path.join("content", "index.md")},
+        )
+        self.assertEqual(len(manifest.dependents(["template.html"])), 2)
+        self.assertEqual(manifest.dependents(["static"]), set())
+
+    def test_dependencies_round_trip(self):
+        manifest = BuildManifest(self.manifest_path)
+        manifest.record("a.md", "h1", "t1", "/", self.output, files={"nav.html": "n"}, uses={"b.md": "m"},
+                        metadata={"title": "A"})
+        manifest.save()
+        entry = BuildManifest.load(self.manifest_path).pages["a.md"]
+        self.assertEqual(entry["files"], {"nav.html": "n"})
+        self.assertEqual(entry["uses"], {"b.md": "m"})
+        self.assertEqual(entry["metadata"], {"title": "A"})
+
+
+if __name__ == "__main__":
+    unittest.main()
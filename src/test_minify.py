@@ -0,0 +1,47 @@
+import unittest
+
+from minify import attributes_to_html, collapse_whitespace, minify_template
+
+class MinifyTest(unittest.TestCase):
+    def test_collapse_whitespace(self):
+        self.assertEqual(collapse_whitespace("a \n\t b "), "a b ")
+        self.assertEqual(collapse_whitespace("a  b"), "a  b")
+        self.assertEqual(collapse_whitespace("<PRE>\n x</PRE>\n\n"), "<PRE>\n x</PRE>\n\n")
+
+    def test_attributes_to_html(self):
+        self.assertEqual(
+            attributes_to_html([("href", "/a/b.html"), ("alt", "two words"), ("title", ""), ("data-x", "a=b")]),
+            ' href=/a/b.html alt="two words" title="" data-x="a=b"',
+        )
+
+    def test_drops_comments_but_not_conditional_ones(self):
+        self.assertEqual(
+            minify_template("<p>a <!-- note --> b</p><!--[if IE]><p>old</p><![endif]-->"),
+            "<p>a b</p><!--[if IE]><p>old</p><![endif]-->",
+        )
+
+    def test_whitespace_between_inline_tags_is_kept(self):
+        self.assertEqual(
+            minify_template("<div>\n  <a href='/x'>x</a>\n  <a href=\"/y\">y</a>\n</div>"),
+            "<div><a href=/x>x</a> <a href=/y>y</a></div>",
+        )
+
+    def test_tags(self):
+        self.assertEqual(
+            minify_template('<input  type="text"   disabled\n value=\'say "hi"\' >'),
+            "<input type=text disabled value='say \"hi\"'>",
+        )
+        self.assertEqual(minify_template('<img src="/a.png" />'), "<img src=/a.png />")
+        self.assertEqual(minify_template('<path d="M 0 0"/>'), '<path d="M 0 0"/>')
+        self.assertEqual(minify_template('<a title="{{Title}}" {{ Attributes }}>'), '<a title="{{Title}}" {{ Attributes }}>')
+
+    def test_preserved_elements(self):
+        text = '<script>\n  if (a < b) { x(); }  // <!-- no -->\n</script>\n<textarea>\n a\n</textarea>'
+        self.assertEqual(
+            minify_template(text),
+            '<script>\n  if (a < b) { x(); }  // <!-- no -->\n</script><textarea>\n a\n</textarea>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+from pagewriter import PageWriter, prepare_directories, write_chunks_if_changed, write_if_changed
+
+class WriteIfChangedTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "page.html")
+
+    def test_writes_new_file(self):
+        self.assertTrue(write_if_changed(self.path, b"<p>hi</p>"))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b"<p>hi</p>")
+
+    def test_identical_bytes_keep_mtime(self):
+        write_if_changed(self.path, b"<p>hi</p>")
+        os.utime(self.path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertFalse(write_if_changed(self.path, b"<p>hi</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+
+    def test_same_size_different_bytes_rewritten(self):
+        write_if_changed(self.path, b"<p>hi</p>")
+        self.assertTrue(write_if_changed(self.path, b"<p>ho</p>"))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b"<p>ho</p>")
+
+    def test_creates_missing_directory(self):
+        path = os.path.join(self.tmp.name, "a", "b", "page.html")
+        self.assertTrue(write_if_changed(path, b"x"))
+        self.assertTrue(os.path.isfile(path))
+
+class WriteChunksIfChangedTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "page.html")
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_writes_new_file(self):
+        self.assertTrue(write_chunks_if_changed(self.path, iter(["<p>", "é", "</p>"])))
+        self.assertEqual(self.read(), "<p>é</p>".encode('utf-8'))
+
+    def test_identical_chunks_keep_mtime(self):
+        write_if_changed(self.path, b"<p>hi</p>")
+        os.utime(self.path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertFalse(write_chunks_if_changed(self.path, ["<p>", "hi", "</p>"]))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_changed_chunks_rewritten(self):
+        for old, chunks in [
+            (b"<p>hi</p>", ["<p>", "ho", "</p>"]),
+            (b"<p>hi</p>", ["<p>", "hi", "</p>", "<p>more</p>"]),
+            (b"<p>hi</p><p>more</p>", ["<p>", "hi", "</p>"]),
+            (b"<p>hi</p>", []),
+        ]:
+            write_if_changed(self.path, old)
+            self.assertTrue(write_chunks_if_changed(self.path, chunks))
+            self.assertEqual(self.read(), "".join(chunks).encode('utf-8'))
+
+    def test_error_while_rendering_leaves_file(self):
+        write_if_changed(self.path, b"<p>hi</p>")
+
+        def chunks():
+            yield "<p>other"
+            raise ValueError("broken node")
+
+        with self.assertRaises(ValueError):
+            write_chunks_if_changed(self.path, chunks())
+        self.assertEqual(self.read(), b"<p>hi</p>")
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+class PageWriterTest(unittest.TestCase):
+    def test_writes_all_pages_and_counts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f"section-{i % 3}", f"{i}.html") for i in range(50)]
+            prepare_directories(paths)
+            with PageWriter(threads=3, max_pending=4) as writer:
+                for i, path in enumerate(paths):
+                    writer.submit(path, f"<p>{i} é</p>")
+            self.assertEqual((writer.written, writer.unchanged, writer.failures), (50, 0, []))
+            with open(paths[7], 'r', encoding='utf-8') as f:
+                self.assertEqual(f.read(), "<p>7 é</p>")
+
+            with PageWriter() as writer:
+                writer.submit(paths[0], "<p>0 é</p>")
+                writer.submit(paths[1], "<p>changed</p>")
+            self.assertEqual((writer.written, writer.unchanged), (1, 1))
+
+    def test_writes_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.html")
+            with PageWriter() as writer:
+                writer.submit(path, (chunk for chunk in ["<p>", "hi", "</p>"]))
+            self.assertEqual((writer.written, writer.failures), (1, []))
+            with open(path) as f:
+                self.assertEqual(f.read(), "<p>hi</p>")
+
+    def test_failures_are_collected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # A directory where the page should go cannot be opened for writing
+            path = os.path.join(tmp, "page.html")
+            os.mkdir(path)
+            with PageWriter() as writer:
+                writer.submit(path, "<p>hi</p>")
+            self.assertEqual(len(writer.failures), 1)
+            self.assertEqual(writer.failures[0][0], path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from precompress import compressors, precompress, remove_siblings
+
+PAGE = "<html><body>" + "<p>Some repeated text</p>" * 50 + "</body></html>"
+
+class PrecompressTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.docs = os.path.join(self.root, "docs")
+        self.suffixes = [suffix for suffix, _ in compressors()]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text, root=None):
+        path = os.path.join(root or self.docs, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_writes_smaller_siblings(self):
+        page = self.write(os.path.join("blog", "index.html"), PAGE)
+        tiny = self.write("tiny.css", "a{}")
+        self.write("image.png", PAGE)
+        records, stats = precompress(self.docs, threads=2)
+
+        self.assertEqual((stats.compressed, stats.unchanged), (2, 0))
+        self.assertEqual(sorted(records), [os.path.join("blog", "index.html"), "tiny.css"])
+        with gzip.open(page + ".gz", "rt") as f:
+            self.assertEqual(f.read(), PAGE)
+        self.assertEqual(records[os.path.join("blog", "index.html")]["kept"], self.suffixes)
+        # Compressing three bytes only makes them bigger
+        self.assertFalse(os.path.exists(tiny + ".gz"))
+        self.assertEqual(records["tiny.css"]["kept"], [])
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "image.png.gz")))
+
+    def test_output_is_deterministic(self):
+        page = self.write("index.html", PAGE)
+        precompress(self.docs)
+        with open(page + ".gz", "rb") as f:
+            first = f.read()
+        os.remove(page + ".gz")
+        precompress(self.docs)
+        with open(page + ".gz", "rb") as f:
+            self.assertEqual(f.read(), first)
+
+    def test_skips_unchanged_files(self):
+        page = self.write("index.html", PAGE)
+        records, _ = precompress(self.docs)
+        records, stats = precompress(self.docs, records)
+        self.assertEqual((stats.compressed, stats.unchanged), (0, 1))
+
+        # Rewritten with the same content: the hash still matches
+        self.write("index.html", PAGE)
+        records, stats = precompress(self.docs, records)
+        self.assertEqual((stats.compressed, stats.unchanged), (0, 1))
+
+        self.write("index.html", PAGE + "<!-- changed -->")
+        records, stats = precompress(self.docs, records)
+        self.assertEqual(stats.compressed, 1)
+        with gzip.open(page + ".gz", "rt") as f:
+            self.assertTrue(f.read().endswith("<!-- changed -->"))
+
+    def test_links_siblings_from_previous_output(self):
+        self.write("index.html", PAGE)
+        records, _ = precompress(self.docs)
+
+        staging = os.path.join(self.root, "staging")
+        page = self.write("index.html", PAGE, staging)
+        records, stats = precompress(staging, records, previous_dir=self.docs)
+        self.assertEqual((stats.compressed, stats.unchanged), (0, 1))
+        self.assertTrue(os.path.samefile(page + ".gz", os.path.join(self.docs, "index.html.gz")))
+
+    def test_removes_siblings_of_deleted_files(self):
+        page = self.write(os.path.join("old", "index.html"), PAGE)
+        records, _ = precompress(self.docs)
+        os.remove(page)
+        records, stats = precompress(self.docs, records)
+        self.assertEqual(stats.removed, len(self.suffixes))
+        self.assertEqual(records, {})
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "old")))
+
+    def test_remove_siblings(self):
+        page = self.write("index.html", PAGE)
+        records, _ = precompress(self.docs)
+        self.assertEqual(remove_siblings(self.docs, records), len(self.suffixes))
+        self.assertEqual(os.listdir(self.docs), ["index.html"])
+        self.assertTrue(os.path.exists(page))
+
+
+if __name__ == "__main__":
+    unittest.main()
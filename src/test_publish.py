@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from publish import list_builds, prepare_staging, prune_builds, publish, rollback, swap_directory
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+class PublishTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.builds = os.path.join(self.tmp.name, "builds")
+        self.manifest = os.path.join(self.tmp.name, "manifest.json")
+
+    def build(self, text, keep=0, seed=False):
+        staging = prepare_staging(self.docs, self.builds, seed)
+        write(os.path.join(staging, "index.html"), text)
+        write(self.manifest + ".new", text)
+        retired = publish(staging, self.docs, self.builds, keep, self.manifest)
+        os.replace(self.manifest + ".new", self.manifest)
+        return retired
+
+    def test_swap_into_missing_and_existing_directory(self):
+        new = os.path.join(self.tmp.name, "new")
+        old = os.path.join(self.tmp.name, "old")
+        write(os.path.join(new, "a.html"), "one")
+        self.assertFalse(swap_directory(new, self.docs, old))
+        write(os.path.join(new, "a.html"), "two")
+        self.assertTrue(swap_directory(new, self.docs, old))
+        self.assertEqual(read(os.path.join(self.docs, "a.html")), "two")
+        self.assertEqual(read(os.path.join(old, "a.html")), "one")
+        self.assertFalse(os.path.exists(new))
+
+    def test_seeded_staging_shares_unchanged_files(self):
+        self.build("one")
+        staging = prepare_staging(self.docs, self.builds, seed=True)
+        self.assertTrue(os.path.samefile(os.path.join(staging, "index.html"), os.path.join(self.docs, "index.html")))
+        self.assertEqual(os.listdir(prepare_staging(self.docs, self.builds)), [])
+
+    def test_keeps_only_newest_builds(self):
+        self.assertIsNone(self.build("one", keep=2))
+        first = self.build("two", keep=2)
+        self.build("three", keep=2)
+        self.build("four", keep=2)
+        builds = list_builds(self.builds)
+        self.assertEqual(len(builds), 2)
+        self.assertNotIn(first, builds)
+        self.assertEqual(read(os.path.join(self.builds, builds[-1], "index.html")), "three")
+        self.assertEqual(read(os.path.join(self.builds, builds[-1] + ".json")), "three")
+
+        prune_builds(self.builds, 0)
+        self.assertEqual(list_builds(self.builds), [])
+        self.assertEqual(os.listdir(self.builds), [])
+
+    def test_rollback_restores_output_and_manifest(self):
+        self.build("one", keep=1)
+        self.build("two", keep=1)
+        replaced = rollback(self.docs, self.builds, manifest_path=self.manifest)
+        self.assertEqual(read(os.path.join(self.docs, "index.html")), "one")
+        self.assertEqual(read(self.manifest), "one")
+        self.assertEqual(list_builds(self.builds), [replaced])
+
+        # A rollback can be undone
+        rollback(self.docs, self.builds, replaced, self.manifest)
+        self.assertEqual(read(os.path.join(self.docs, "index.html")), "two")
+        self.assertEqual(read(self.manifest), "two")
+
+    def test_rollback_without_builds(self):
+        with self.assertRaises(ValueError):
+            rollback(self.docs, self.builds)
+        self.build("one", keep=1)
+        with self.assertRaises(ValueError):
+            rollback(self.docs, self.builds, "missing")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from rendercache import RenderCache
+
+class RenderCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RenderCache(os.path.join(self.tmp.name, "render"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_miss_then_hit(self):
+        key = RenderCache.key("# Hello")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "<div><h1>Hello</h1></div>")
+        self.assertEqual(self.cache.get(key), "<div><h1>Hello</h1></div>")
+
+    def test_metadata_is_kept_with_the_body(self):
+        key = RenderCache.key("# Hello")
+        self.cache.put(key, "<div>\n<h1>Hello</h1></div>", {"title": "Hello", "headings": [[1, "Hello"]]})
+        self.assertEqual(
+            self.cache.get_entry(key),
+            ("<div>\n<h1>Hello</h1></div>", {"title": "Hello", "headings": [[1, "Hello"]]}),
+        )
+        self.assertEqual(self.cache.get(key), "<div>\n<h1>Hello</h1></div>")
+
+    def test_entry_without_metadata_is_a_miss(self):
+        key = RenderCache.key("x")
+        self.cache.put(key, "<p>x</p>")
+        with open(os.path.join(self.cache.directory, key[:2], key + ".html"), "w") as f:
+            f.write("<p>x</p>")
+        self.assertIsNone(self.cache.get_entry(key))
+
+    def test_key_depends_on_content(self):
+        self.assertEqual(RenderCache.key("a"), RenderCache.key("a"))
+        self.assertNotEqual(RenderCache.key("a"), RenderCache.key("b"))
+
+    def test_entries_are_sharded_by_key_prefix(self):
+        key = RenderCache.key("x")
+        self.cache.put(key, "<p>x</p>")
+        self.assertTrue(os.path.isfile(os.path.join(self.cache.directory, key[:2], key + ".html")))
+
+    def test_evict_removes_least_recently_used(self):
+        keys = [RenderCache.key(str(i)) for i in range(3)]
+        for age, key in enumerate(keys):
+            self.cache.put(key, "12345")
+            path = os.path.join(self.cache.directory, key[:2], key + ".html")
+            os.utime(path, (age, age))
+        # Room for two of the three entries
+        self.cache.max_bytes = 2 * os.path.getsize(path)
+        # Reading the oldest entry makes it the most recently used
+        self.cache.get(keys[0])
+
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_clear(self):
+        key = RenderCache.key("x")
+        self.cache.put(key, "<p>x</p>")
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.evict(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from search import SearchIndex, count_terms, file_terms, node_text, page_terms
+from textnode import parse_document
+
+MARKDOWN = """# Brewing Coffee
+
+Good **coffee** needs [fresh beans](/beans) and ![a grinder](/g.png).
+
+```
+grind --fine
+```
+
+- Coffee at 93 degrees
+- A timer
+"""
+
+class SearchTermsTest(unittest.TestCase):
+    def test_node_text(self):
+        node = ParentNode("p", [
+            LeafNode(None, "Hello "),
+            LeafNode("b", "world"),
+            LeafNode("img", "", {"src": "/a.png", "alt": "a cat"}),
+        ])
+        self.assertEqual(list(node_text(node)), ["Hello ", "world", "a cat"])
+
+    def test_count_terms(self):
+        self.assertEqual(
+            count_terms(["Hello, hello WORLD", "a b élan x" + "y" * 40]),
+            {"hello": 2, "world": 1, "élan": 1, "x" + "y" * 31: 1},
+        )
+
+    def test_page_terms(self):
+        terms = page_terms(parse_document(MARKDOWN).root)
+        self.assertEqual(terms["coffee"], 3)
+        self.assertEqual(terms["grinder"], 1)
+        self.assertEqual(terms["fine"], 1)
+        self.assertEqual(terms["93"], 1)
+        self.assertNotIn("a", terms)
+
+    def test_file_terms_match_page_terms(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "page.md")
+            with open(path, "w") as f:
+                f.write("---\ntitle: Ignored front matter\n---\n" + MARKDOWN)
+            self.assertEqual(file_terms(path), page_terms(parse_document(MARKDOWN).root))
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.store = os.path.join(self.root, "cache", "search.json")
+        self.docs = os.path.join(self.root, "docs")
+        self.pages = {}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_page(self, name, text):
+        path = os.path.join(self.root, name)
+        with open(path, "w") as f:
+            f.write(text)
+        self.pages[path] = (text, f"/{name[:-3]}/", name[:-3].title())
+        return path
+
+    def entries(self):
+        return {path: (str(hash(text)), url, title) for path, (text, url, title) in self.pages.items()}
+
+    def read(self, name):
+        with open(os.path.join(self.docs, "search", name)) as f:
+            return json.load(f)
+
+    def test_writes_sharded_index(self):
+        a = self.write_page("a.md", "# Python tips\n\nPython and pytest")
+        self.write_page("b.md", "# Coffee\n\npython")
+        stats = SearchIndex(self.store).update(self.entries(), self.docs)
+        self.assertEqual((stats.indexed, stats.unchanged), (2, 0))
+
+        index = self.read("index.json")
+        self.assertEqual(index["pages"], [["/a/", "A"], ["/b/", "B"]])
+        self.assertEqual(index["prefix_length"], 2)
+        self.assertIn("py", index["shards"])
+        self.assertEqual(self.read("py.json"), {"python": [0, 2, 1, 1], "pytest": [0, 1]})
+        self.assertTrue(os.path.exists(os.path.join(self.docs, "search", "search.js")))
+
+        # Terms counted while rendering are used instead of reading the file
+        stats = SearchIndex(self.store).update({a: ("h", "/a/", "A")}, os.path.join(self.root, "other"),
+                                               {a: {"zebra": 1}})
+        with open(os.path.join(self.root, "other", "search", "ze.json")) as f:
+            self.assertEqual(json.load(f), {"zebra": [0, 1]})
+
+    def test_incremental_update(self):
+        a = self.write_page("a.md", "# Alpha\n\nshared words")
+        self.write_page("b.md", "# Beta\n\nshared")
+        index = SearchIndex(self.store)
+        index.update(self.entries(), self.docs)
+        index.save()
+
+        index = SearchIndex.load(self.store)
+        stats = index.update(self.entries(), self.docs)
+        self.assertEqual((stats.indexed, stats.unchanged, stats.shards_written), (0, 2, 0))
+
+        self.write_page("a.md", "# Alpha\n\nshared gamma")
+        stats = index.update(self.entries(), self.docs)
+        self.assertEqual((stats.indexed, stats.unchanged), (1, 1))
+        # The shards of the page's old and new terms are rebuilt; only those of words and gamma differ
+        self.assertEqual(stats.shards_written, 2)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "search", "wo.json")))
+        self.assertEqual(self.read("ga.json"), {"gamma": [0, 1]})
+
+        # A removed page's id is given to the next new page
+        del self.pages[a]
+        stats = index.update(self.entries(), self.docs)
+        self.assertEqual(stats.removed, 1)
+        self.assertEqual(self.read("sh.json"), {"shared": [1, 1]})
+        self.assertEqual(self.read("index.json")["pages"], [None, ["/b/", "B"]])
+        self.write_page("c.md", "# Gamma")
+        index.update(self.entries(), self.docs)
+        self.assertEqual(self.read("index.json")["pages"], [["/c/", "C"], ["/b/", "B"]])
+
+    def test_rewrites_every_shard_for_another_output(self):
+        self.write_page("a.md", "# Alpha\n\nwords")
+        index = SearchIndex(self.store)
+        index.update(self.entries(), self.docs)
+        index.save()
+
+        fresh = os.path.join(self.root, "fresh")
+        stats = SearchIndex.load(self.store).update(self.entries(), fresh)
+        self.assertEqual(stats.indexed, 0)
+        self.assertTrue(os.path.exists(os.path.join(fresh, "search", "wo.json")))
+        self.assertTrue(os.path.exists(os.path.join(fresh, "search", "al.json")))
+
+    def test_load_missing_or_corrupt_store(self):
+        self.assertEqual(SearchIndex.load(self.store).pages, {})
+        os.makedirs(os.path.dirname(self.store))
+        with open(self.store, "w") as f:
+            f.write("{not json")
+        self.assertEqual(SearchIndex.load(self.store).pages, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from staticsync import copy_file, sync_static
+
+class SyncStaticTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        os.makedirs(os.path.join(self.source, "images"))
+        os.makedirs(self.dest)
+        self.write(self.source, "index.css", "body {}")
+        self.write(self.source, "images/logo.png", "png-bytes")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, root, rel_path, text):
+        path = os.path.join(root, rel_path)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def read(self, root, rel_path):
+        with open(os.path.join(root, rel_path)) as f:
+            return f.read()
+
+    def test_first_sync_copies_everything(self):
+        assets, stats = sync_static(self.source, self.dest)
+        self.assertEqual(assets, ["images/logo.png", "index.css"])
+        self.assertEqual((stats.copied, stats.skipped, stats.removed), (2, 0, 0))
+        self.assertEqual(self.read(self.dest, "images/logo.png"), "png-bytes")
+
+    def test_second_sync_skips_unchanged_files(self):
+        assets, _ = sync_static(self.source, self.dest)
+        _, stats = sync_static(self.source, self.dest, assets)
+        self.assertEqual((stats.copied, stats.skipped, stats.removed), (0, 2, 0))
+
+    def test_changed_file_is_recopied(self):
+        assets, _ = sync_static(self.source, self.dest)
+        self.write(self.source, "index.css", "body { color: red; }")
+        _, stats = sync_static(self.source, self.dest, assets)
+        self.assertEqual(stats.copied, 1)
+        self.assertEqual(self.read(self.dest, "index.css"), "body { color: red; }")
+
+    def test_checksum_detects_same_size_edit_with_same_mtime(self):
+        assets, _ = sync_static(self.source, self.dest)
+        path = self.write(self.source, "index.css", "BODY {}")
+        dest_stat = os.stat(os.path.join(self.dest, "index.css"))
+        os.utime(path, ns=(dest_stat.st_atime_ns, dest_stat.st_mtime_ns))
+
+        _, stats = sync_static(self.source, self.dest, assets)
+        self.assertEqual(stats.copied, 0)
+        _, stats = sync_static(self.source, self.dest, assets, checksum=True)
+        self.assertEqual(stats.copied, 1)
+        self.assertEqual(self.read(self.dest, "index.css"), "BODY {}")
+
+    def test_deleted_asset_is_removed_but_other_files_kept(self):
+        assets, _ = sync_static(self.source, self.dest)
+        self.write(self.dest, "index.html", "<p>generated</p>")
+        os.remove(os.path.join(self.source, "images/logo.png"))
+
+        assets, stats = sync_static(self.source, self.dest, assets)
+
+        self.assertEqual(assets, ["index.css"])
+        self.assertEqual(stats.removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_sync_only_given_paths(self):
+        assets, _ = sync_static(self.source, self.dest)
+        self.write(self.source, "index.css", "body { color: red }")
+        self.write(self.source, "images/new.png", "new")
+        os.remove(os.path.join(self.source, "images/logo.png"))
+
+        assets, stats = sync_static(self.source, self.dest, assets, paths=["images"])
+
+        self.assertEqual(assets, ["images/new.png", "index.css"])
+        self.assertEqual((stats.copied, stats.removed), (1, 1))
+        self.assertEqual(self.read(self.dest, "index.css"), "body {}")
+
+    def test_link_mode_shares_inode(self):
+        sync_static(self.source, self.dest, link=True)
+        source_stat = os.stat(os.path.join(self.source, "index.css"))
+        dest_stat = os.stat(os.path.join(self.dest, "index.css"))
+        self.assertEqual(source_stat.st_ino, dest_stat.st_ino)
+
+    def test_copy_file_does_not_write_through_hard_link(self):
+        source_path = os.path.join(self.source, "index.css")
+        dest_path = os.path.join(self.dest, "index.css")
+        os.link(source_path, dest_path)
+        other = self.write(self.source, "other.css", "other")
+
+        copy_file(other, dest_path)
+
+        self.assertEqual(self.read(self.source, "index.css"), "body {}")
+        self.assertEqual(self.read(self.dest, "index.css"), "other")
+
+
+if __name__ == "__main__":
+    unittest.main()
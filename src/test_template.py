@@ -0,0 +1,132 @@
+import io
+import os
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from template import Template, normalize_basepath, rewrite_paths
+
+class TemplateTest(unittest.TestCase):
+    def test_render_title_and_content(self):
+        template = Template("<title>{{ Title }}</title><article>{{ Content }}</article>")
+        self.assertEqual(
+            template.render(Title="Hi", Content="<p>Body</p>"),
+            "<title>Hi</title><article><p>Body</p></article>",
+        )
+
+    def test_placeholders_in_order(self):
+        template = Template("{{ Title }} {{ Date }} {{ Content }} {{ Title }}")
+        self.assertEqual(template.placeholders, ["Title", "Date", "Content", "Title"])
+
+    def test_additional_named_placeholders(self):
+        template = Template("<time>{{ Date }}</time>{{Author}}")
+        self.assertEqual(template.render(Date="2024-01-01", Author="Bob"), "<time>2024-01-01</time>Bob")
+
+    def test_missing_value_leaves_placeholder(self):
+        template = Template("<p>{{ Title }} {{ Unknown }}</p>")
+        self.assertEqual(template.render(Title="Hi"), "<p>Hi {{ Unknown }}</p>")
+
+    def test_basepath_rewrites_template_segments(self):
+        template = Template('<link href="/index.css" /><img src="/a.png" />', "/blog")
+        self.assertEqual(template.render(), '<link href="/blog/index.css" /><img src="/blog/a.png" />')
+
+    def test_basepath_rewrites_values(self):
+        template = Template("<article>{{ Content }}</article>", "/repo/")
+        self.assertEqual(
+            template.render(Content='<a href="/about">About</a><img src="/x.png" alt="x"></img>'),
+            '<article><a href="/repo/about">About</a><img src="/repo/x.png" alt="x"></img></article>',
+        )
+
+    def test_basepath_applies_to_placeholder_inside_attribute(self):
+        template = Template('<a href="{{ Url }}">next</a>', "/repo")
+        self.assertEqual(template.render(Url="/page/2/"), '<a href="/repo/page/2/">next</a>')
+        self.assertEqual(template.render(Url="https://x.com"), '<a href="https://x.com">next</a>')
+
+    def test_default_basepath_leaves_paths(self):
+        template = Template('<link href="/index.css" />{{ Content }}')
+        self.assertEqual(template.render(Content='<a href="/a">a</a>'), '<link href="/index.css" /><a href="/a">a</a>')
+
+    def test_normalize_basepath(self):
+        self.assertEqual(normalize_basepath("/"), "/")
+        self.assertEqual(normalize_basepath("/repo"), "/repo/")
+        self.assertEqual(normalize_basepath("/repo/"), "/repo/")
+
+    def test_rewrite_paths_ignores_relative_and_external(self):
+        html = '<a href="page">p</a><a href="https://x.com">x</a>'
+        self.assertEqual(rewrite_paths(html, "/repo/"), html)
+
+    def test_render_streams_html_node_values(self):
+        template = Template("<article>{{ Content }}</article>", "/repo")
+        content = ParentNode("p", [LeafNode("a", "about", {"href": "/about"})])
+        self.assertEqual(template.render(Content=content), '<article><p><a href="/repo/about">about</a></p></article>')
+
+    def test_write(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}")
+        buffer = io.StringIO()
+        template.write(buffer, Title="Hi", Content=ParentNode("div", [LeafNode(None, "x")]))
+        self.assertEqual(buffer.getvalue(), "<title>Hi</title><div>x</div>")
+
+    def test_includes_partials_relative_to_template(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "partials"))
+            with open(os.path.join(root, "partials", "nav.html"), "w") as f:
+                f.write('<nav><a href="/">{{ Title }}</a>{{> link.html }}</nav>')
+            with open(os.path.join(root, "partials", "link.html"), "w") as f:
+                f.write('<a href="/about">About</a>')
+            path = os.path.join(root, "page.html")
+            with open(path, "w") as f:
+                f.write("{{> partials/nav.html }}{{ Content }}{{>partials/link.html}}")
+
+            template = Template.load(path, "/repo")
+            self.assertEqual(
+                template.render(Title="Hi", Content="<p>x</p>"),
+                '<nav><a href="/repo/">Hi</a><a href="/repo/about">About</a></nav><p>x</p>'
+                '<a href="/repo/about">About</a>',
+            )
+            self.assertEqual(template.includes, [
+                os.path.join(root, "partials", "nav.html"),
+                os.path.join(root, "partials", "link.html"),
+            ])
+
+    def test_include_cycle_raises(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "page.html")
+            with open(path, "w") as f:
+                f.write("<main>{{> loop.html }}</main>")
+            with open(os.path.join(root, "loop.html"), "w") as f:
+                f.write("{{> page.html }}")
+            with self.assertRaises(ValueError):
+                Template.load(path)
+
+    def test_template_without_includes(self):
+        self.assertEqual(Template("{{ Content }}").includes, [])
+
+    def test_minified_template(self):
+        template = Template(
+            '<!DOCTYPE html>\n<html>\n  <head>\n    <title> {{ Title }} </title>\n'
+            '    <link rel="stylesheet" href="/index.css">\n  </head>\n  <!-- main content -->\n'
+            '  <body>\n    <a href="{{ Home }}" class="home">Home</a> <em>!</em>\n'
+            '    <main>\n      {{ Content }}\n    </main>\n  </body>\n</html>\n',
+            "/repo",
+            minify=True,
+        )
+        content = ParentNode("div", [LeafNode("a", "Link", {"href": "/blog/"})])
+        self.assertEqual(
+            template.render(Title="Hi", Home="/", Content=content),
+            '<!DOCTYPE html><html><head><title>Hi</title><link rel=stylesheet href=/repo/index.css></head>'
+            '<body><a href="/repo/" class=home>Home</a> <em>!</em>'
+            '<main><div><a href=/repo/blog/>Link</a></div></main></body></html>',
+        )
+
+    def test_minified_template_preserves_pre(self):
+        text = '<pre>\n  {{ Code }}\n  <!-- kept --></pre>\n<p>\n  x\n</p>'
+        template = Template(text, minify=True)
+        self.assertEqual(template.render(Code="a  b"), '<pre>\n  a  b\n  <!-- kept --></pre><p>x</p>')
+
+    def test_render_hash(self):
+        self.assertEqual(Template("x").render_hash("abc"), "abc")
+        self.assertEqual(Template("x", minify=True).render_hash("abc"), "abc+minified")
+
+
+if __name__ == "__main__":
+    unittest.main()
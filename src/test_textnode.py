@@ -1,6 +1,6 @@
 import unittest
 
-from textnode import TextNode, TextType, extract_markdown_images, extract_markdown_links, text_to_textnodes, markdown_to_blocks, block_to_block_type, BlockType, markdown_to_html_node, extract_title
+from textnode import TextNode, TextType, extract_markdown_images, extract_markdown_links, text_to_textnodes, markdown_to_blocks, block_to_block_type, BlockType, markdown_to_html_node, extract_title, scan_blocks, Block, iter_block_texts, iter_markdown_html, extract_title_from_lines, parse_document
 from splitnodes import split_nodes_delimiter, split_nodes_image, split_nodes_link
 
 class TestTextNode(unittest.TestCase):
@@ -22,6 +22,10 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD_TEXT)
         self.assertEqual(repr(node), repr(node2))
 
+    def test_no_instance_dict(self):
+        node = TextNode("text", TextType.PLAIN_TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+
     def test_eq_url(self):
         # Test equality of link nodes
         node = TextNode("[example text](https://example.com", TextType.LINKS)
@@ -497,6 +501,12 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(nodes[0].text, expected[0].text)
         self.assertEqual(nodes[0].text_type, expected[0].text_type)
 
+    def test_text_to_textnodes_plain_fast_path(self):
+        # Text with no markup characters skips the tokenizer entirely
+        self.assertEqual(text_to_textnodes("Just prose, with (parens) and 3.5 #tags!"),
+                         [TextNode("Just prose, with (parens) and 3.5 #tags!", TextType.PLAIN_TEXT)])
+        self.assertEqual(text_to_textnodes(""), [])
+
     def test_text_to_textnodes_bold_only(self):
         # Test text with only bold formatting
         text = "This is **bold** text"
@@ -757,6 +767,90 @@ code block
         expected = ["Block1", "Block2", "Block3", "Block4"]
         self.assertEqual(blocks, expected)
 
+    def test_scan_blocks_offsets_and_types(self):
+        md = "# Title\n\n  Some text\nmore text  \n- a\n- b\n\n```\ncode\n```"
+        blocks = scan_blocks(md)
+        self.assertEqual(
+            blocks,
+            [
+                Block(BlockType.HEADING, 0, 7),
+                Block(BlockType.PARAGRAPH, 11, 30),
+                Block(BlockType.UNORDERED_LIST, 33, 40),
+                Block(BlockType.CODE, 42, 54),
+            ],
+        )
+        self.assertEqual(
+            [md[block.start:block.end] for block in blocks],
+            ["# Title", "Some text\nmore text", "- a\n- b", "```\ncode\n```"],
+        )
+
+    def test_scan_blocks_types_match_block_to_block_type(self):
+        md = "1. a\n2. b\n\n2. a\n\n> q\n  > r\n\n# \ntext\n\n```\nopen"
+        for block in scan_blocks(md):
+            text = md[block.start:block.end]
+            self.assertEqual(block.block_type, block_to_block_type(text), text)
+
+    def test_iter_block_texts_matches_scan_blocks(self):
+        md = "# Title\n\n  Some text\nmore text  \n- a\n- b\n\n```\ncode\n\n\n```\n\n \n```\nopen"
+        expected = [(block.block_type, md[block.start:block.end]) for block in scan_blocks(md)]
+        self.assertEqual(list(iter_block_texts(md.split("\n"))), expected)
+        # Lines from a file have no trailing empty line
+        self.assertEqual(list(iter_block_texts(md.splitlines())), expected)
+
+    def test_iter_block_texts_reads_lazily(self):
+        read = []
+
+        def lines():
+            for line in ["# One", "", "two", "", "three"]:
+                read.append(line)
+                yield line
+
+        blocks = iter_block_texts(lines())
+        self.assertEqual(next(blocks), (BlockType.HEADING, "# One"))
+        self.assertEqual(read, ["# One", ""])
+
+    def test_iter_markdown_html_matches_tree(self):
+        for md in ["", "# Title\n\ntext **bold**\n\n```\n  code\n```\n\n1. a\n2. b", "> q\n> r"]:
+            self.assertEqual("".join(iter_markdown_html(md.split("\n"))), markdown_to_html_node(md).to_html())
+
+    def test_parse_document_metadata(self):
+        md = (
+            "Intro with [a link](/a) and ![pic](/p.png)\n\n"
+            "# The **Title**\n\n"
+            "## Part one\n\n"
+            "- item *one*\n- [two](/b)\n\n"
+            "```\nnot counted [x](/c)\n```"
+        )
+        document = parse_document(md)
+        self.assertEqual(document.root.to_html(), markdown_to_html_node(md).to_html())
+        self.assertEqual(document.title, "The **Title**")
+        self.assertEqual(document.headings, [(1, "The Title"), (2, "Part one")])
+        self.assertEqual(document.word_count, 12)
+        self.assertEqual(document.links, [("a link", "/a"), ("two", "/b")])
+        self.assertEqual(document.images, [("pic", "/p.png")])
+
+    def test_parse_document_title_matches_extract_title(self):
+        for md in ["text\n\n```\n# in code\n```", "## h2\n# h1", "#  \ntext", "no title", ""]:
+            try:
+                expected = extract_title(md)
+            except ValueError:
+                expected = None
+            self.assertEqual(parse_document(md).title, expected, md)
+
+    def test_extract_title_prefers_front_matter(self):
+        self.assertEqual(extract_title("---\ntitle: From front matter\n---\n# Heading"), "From front matter")
+        self.assertEqual(extract_title("---\ndate: 2024-01-01\n---\n# Heading"), "Heading")
+
+    def test_extract_title_from_lines_stops_at_title(self):
+        def lines():
+            yield "intro"
+            yield "# Title "
+            raise AssertionError("read past the title")
+
+        self.assertEqual(extract_title_from_lines(lines()), "Title")
+        with self.assertRaises(ValueError):
+            extract_title_from_lines(["## Not h1"])
+
     # ===== Block to Block Type Tests =====
     def test_block_to_block_type_heading_h1(self):
         # Test heading with single # (h1)
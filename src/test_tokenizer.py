@@ -0,0 +1,136 @@
+import unittest
+
+from textnode import TextNode, TextType
+from splitnodes import split_nodes_delimiter, split_nodes_image, split_nodes_link
+from tokenizer import parse_inline, tokenize_inline
+
+def split_passes(text):
+    """The chained split passes tokenize_inline replaces, used as a reference."""
+    nodes = [TextNode(text, TextType.PLAIN_TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE_TEXT)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD_TEXT)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC_TEXT)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC_TEXT)
+    return [node for node in nodes if node.text != ""]
+
+class TokenizeInlineTest(unittest.TestCase):
+    def test_plain_text(self):
+        self.assertEqual(tokenize_inline("just words"), [TextNode("just words", TextType.PLAIN_TEXT)])
+
+    def test_empty_text(self):
+        self.assertEqual(tokenize_inline(""), [])
+
+    def test_all_node_types(self):
+        text = "a **b** *c* _d_ `e` [f](/g) ![h](/i.png)"
+        self.assertEqual(
+            tokenize_inline(text),
+            [
+                TextNode("a ", TextType.PLAIN_TEXT),
+                TextNode("b", TextType.BOLD_TEXT),
+                TextNode(" ", TextType.PLAIN_TEXT),
+                TextNode("c", TextType.ITALIC_TEXT),
+                TextNode(" ", TextType.PLAIN_TEXT),
+                TextNode("d", TextType.ITALIC_TEXT),
+                TextNode(" ", TextType.PLAIN_TEXT),
+                TextNode("e", TextType.CODE_TEXT),
+                TextNode(" ", TextType.PLAIN_TEXT),
+                TextNode("f", TextType.LINKS, "/g"),
+                TextNode(" ", TextType.PLAIN_TEXT),
+                TextNode("h", TextType.IMAGES, "/i.png"),
+            ],
+        )
+
+    def test_code_keeps_other_delimiters(self):
+        self.assertEqual(tokenize_inline("`**x** _y_`"), [TextNode("**x** _y_", TextType.CODE_TEXT)])
+
+    def test_bold_keeps_italic_delimiters_for_nested_parsing(self):
+        self.assertEqual(tokenize_inline("**a _b_ c**"), [TextNode("a _b_ c", TextType.BOLD_TEXT)])
+
+    def test_triple_star_splits_bold_first(self):
+        self.assertEqual(tokenize_inline("***a**"), [TextNode("*a", TextType.BOLD_TEXT)])
+        self.assertEqual(tokenize_inline("***a**"), split_passes("***a**"))
+
+    def test_excluded_delimiters_are_plain_text(self):
+        self.assertEqual(
+            tokenize_inline("a **b** *c*", {"**"}),
+            [
+                TextNode("a ", TextType.PLAIN_TEXT),
+                TextNode("b", TextType.PLAIN_TEXT),
+                TextNode(" ", TextType.PLAIN_TEXT),
+                TextNode("c", TextType.ITALIC_TEXT),
+            ],
+        )
+        self.assertEqual(tokenize_inline("_a_", {"*", "_"}), [TextNode("_a_", TextType.PLAIN_TEXT)])
+
+    def test_empty_alt_image_is_dropped(self):
+        self.assertEqual(tokenize_inline("a![](/x.png)b"), [TextNode("a", TextType.PLAIN_TEXT), TextNode("b", TextType.PLAIN_TEXT)])
+
+    def test_unmatched_delimiters_raise(self):
+        for text in ["`a", "**a", "*a", "a_b", "**a `b` c**", "**[x](y)**"]:
+            with self.assertRaises(ValueError):
+                tokenize_inline(text)
+
+    def test_error_reports_first_pass_that_failed(self):
+        with self.assertRaisesRegex(ValueError, "unmatched ` delimiter"):
+            tokenize_inline("_a `b")
+        with self.assertRaisesRegex(ValueError, r"unmatched \* delimiter"):
+            tokenize_inline("_a *b **c** d_")
+
+    def test_matches_split_passes(self):
+        samples = [
+            "This is **text** with an *italic* word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+            "![a](b)[c](d)",
+            "!![a](b)",
+            "[a](b![x)](y)",
+            "a****b",
+            "**a*b**",
+            "`[a](b)` c",
+            "x_y_z **w** `v`",
+            "[](/empty) text",
+        ]
+        for text in samples:
+            try:
+                expected = split_passes(text)
+            except ValueError as e:
+                with self.assertRaisesRegex(ValueError, str(e).replace("*", r"\*")):
+                    tokenize_inline(text)
+                continue
+            self.assertEqual(tokenize_inline(text), expected, text)
+
+class ParseInlineTest(unittest.TestCase):
+    def html(self, text):
+        return "".join(child.to_html() for child in parse_inline(text))
+
+    def test_flat_formatting(self):
+        self.assertEqual(
+            self.html("a `b` [c](/d) ![e](/f.png)"),
+            'a <code>b</code> <a href="/d">c</a> <img src="/f.png" alt="e"></img>',
+        )
+
+    def test_italic_inside_bold(self):
+        self.assertEqual(self.html("**a *b* _c_ d**"), "<b>a <i>b</i> <i>c</i> d</b>")
+
+    def test_underscore_inside_star_italic_stays_text(self):
+        self.assertEqual(self.html("*a _b_ c*"), "<i>a _b_ c</i>")
+
+    def test_nested_spans_are_parent_nodes(self):
+        children = parse_inline("**x *y* z**")
+        self.assertEqual(children[0].tag_name, "b")
+        self.assertEqual(children[0].children[1].tag_name, "i")
+
+    def test_unmatched_delimiter_inside_bold_raises(self):
+        with self.assertRaisesRegex(ValueError, r"unmatched \* delimiter"):
+            parse_inline("**a *b**")
+
+    def test_outer_error_wins_over_error_inside_bold(self):
+        with self.assertRaisesRegex(ValueError, "unmatched _ delimiter"):
+            parse_inline("**a *b** c_")
+
+    def test_excluded_delimiters(self):
+        self.assertEqual("".join(c.to_html() for c in parse_inline("*a* **b**", {"**"})), "<i>a</i> b")
+
+
+if __name__ == "__main__":
+    unittest.main()
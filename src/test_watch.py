@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from watch import InotifyWatcher, PollingWatcher, create_watcher
+
+class WatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        os.makedirs(self.content)
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(self.template, "{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def check_watcher(self, watcher):
+        try:
+            # A new directory is reported as a whole; files written into it later individually
+            page = os.path.join(self.content, "blog", "post.md")
+            os.makedirs(os.path.dirname(page))
+            self.write(page, "# Post")
+            self.assertTrue({page, os.path.dirname(page)} & self.collect(watcher, page))
+
+            self.write(page, "# Post, edited")
+            self.assertIn(page, self.collect(watcher, page))
+
+            self.write(self.template, "<main>{{ Content }}</main>")
+            self.assertIn(self.template, self.collect(watcher, self.template))
+
+            self.write(os.path.join(self.tmp.name, "unrelated.txt"), "x")
+            os.remove(page)
+            changed = self.collect(watcher, page)
+            self.assertIn(page, changed)
+            self.assertNotIn(os.path.join(self.tmp.name, "unrelated.txt"), changed)
+        finally:
+            watcher.close()
+
+    def collect(self, watcher, expected):
+        # Events may be split over several waits
+        changed = set()
+        for _ in range(20):
+            changed |= watcher.wait(timeout=0.5)
+            if expected in changed or os.path.dirname(expected) in changed:
+                break
+        return changed
+
+    def test_polling_watcher(self):
+        self.check_watcher(PollingWatcher([self.content, self.template], interval=0.01))
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher([self.content, self.template])
+        except (OSError, AttributeError, TypeError):
+            self.skipTest("inotify is not available")
+        self.check_watcher(watcher)
+
+    def test_wait_times_out_without_changes(self):
+        watcher = create_watcher([self.content], poll=True, interval=0.01)
+        self.assertEqual(watcher.wait(timeout=0.05), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,121 +1,198 @@
+from collections import deque
 from enum import Enum
+from frontmatter import split_front_matter
 from htmlnode import LeafNode, ParentNode
 import re
 import textwrap
 
+# Pattern matches ![alt text](url)
+IMAGE_PATTERN = re.compile(r'!\[([^\[\]]*?)\]\(([^\(\)]*?)\)')
+# Pattern matches [text](url) but NOT ![text](url)
+LINK_PATTERN = re.compile(r'(?<!\!)\[([^\[\]]*?)\]\(([^\(\)]*?)\)')
+# Any character that can start inline markup; text without one is plain
+INLINE_MARKUP_CHARS = re.compile(r'[!\[`*_]')
+WHITESPACE_RUN = re.compile(r'\s+')
+
 
 def extract_markdown_images(text):
     """Extracts images from markdown text and returns list of (alt_text, url) tuples."""
-    # Pattern matches ![alt text](url)
-    pattern = r'!\[([^\[\]]*?)\]\(([^\(\)]*?)\)'
-    matches = re.findall(pattern, text)
+    matches = IMAGE_PATTERN.findall(text)
     return matches
 
 def extract_markdown_links(text):
     """extracts markdown links instead of images. It should return tuples of anchor text and URLs"""
-    # Pattern matches [text](url) but NOT ![text](url)
-    pattern = r'(?<!\!)\[([^\[\]]*?)\]\(([^\(\)]*?)\)'
-    matches = re.findall(pattern, text)
+    matches = LINK_PATTERN.findall(text)
     return matches
 
 def text_to_textnodes(text):
-    """Converts markdown text into a list of TextNode objects by applying all splitting functions."""
+    """Converts markdown text into a list of TextNode objects (images, links, code, bold and italic)."""
+    # Fast path: most prose has no markup at all, so skip the tokenizer
+    if not INLINE_MARKUP_CHARS.search(text):
+        return [TextNode(text, TextType.PLAIN_TEXT)] if text else []
+
     # Import here to avoid circular imports
-    from splitnodes import split_nodes_delimiter, split_nodes_image, split_nodes_link
+    from tokenizer import tokenize_inline
+
+    # A single scan yields the same nodes as applying split_nodes_image,
+    # split_nodes_link and split_nodes_delimiter for `, **, * and _ in turn
+    return tokenize_inline(text)
 
-    # Start with the input text as a single plain text node
-    nodes = [TextNode(text, TextType.PLAIN_TEXT)]
+def markdown_to_blocks(markdown):
+    """Splits markdown into block strings (see iter_blocks for the rules)."""
+    return [markdown[block.start:block.end] for block in scan_blocks(markdown)]
 
-    # Apply each splitting function in sequence
-    # Order matters: images first, then links, then inline formatting
-    # Process longer delimiters first to prevent conflicts (** before *)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE_TEXT)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD_TEXT)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC_TEXT)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC_TEXT)
+def scan_blocks(markdown):
+    """
+    Splits markdown into typed blocks in a single pass.
+    Returns a list of Block objects whose start/end offsets index into the
+    original markdown, so no block text is copied or re-joined.
+    """
+    return list(iter_blocks(markdown.split('\n')))
 
-    # Filter out any empty text nodes
-    nodes = [node for node in nodes if node.text != ""]
+def iter_blocks(lines):
+    """
+    Yields a Block for each block in an iterable of markdown lines (without
+    their newlines). Offsets count from the start of the first line.
 
-    return nodes
+    Blocks are separated by empty lines, split wherever the line type changes,
+    and a line starting with ``` collects everything up to the closing ```.
+    Each block is classified as its lines arrive, with the same rules as
+    block_to_block_type, so the block text is never re-split.
+    """
+    offset = 0
+    start = end = None          # span of the open block, None when there is none
+    first = last = None         # first line (without indent) and last line of the block
+    index = 0                   # line number of `last` within the block
+    blank_lines = 0             # blank lines since `last`
+    line_type = None
+    in_block = in_code = False
+    is_quote = is_unordered = is_ordered = True
 
-def markdown_to_blocks(markdown):
-    blocks = []
+    for line in lines:
+        line_start = offset
+        offset += len(line) + 1
 
-    # First, try to split on double newlines (traditional approach)
-    raw_blocks = markdown.split('\n\n')
+        if not line:
+            if start is not None:
+                yield _close_block(first, last, index, line_type, is_quote, is_unordered, is_ordered, start, end)
+                start = None
+            blank_lines = 0
+            line_type = None
+            in_block = in_code = False
+            continue
 
-    for raw_block in raw_blocks:
-        stripped_block = raw_block.strip()
-        if not stripped_block:
+        stripped = line.strip()
+        if not stripped:
+            # Blank lines only belong to a block if more of it follows
+            if in_block:
+                blank_lines += 1
             continue
-            
-        # Check if this block contains multiple different block types that should be split
-        lines = stripped_block.split('\n')
-        if len(lines) > 1:
-            # Check if we need to split based on changing block types
-            current_block_lines = []
-            current_block_type = None
-            
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                line_stripped = line.strip()
-                
-                if not line_stripped:
-                    # Empty line within a block - add to current block
-                    current_block_lines.append(line)
-                    i += 1
-                    continue
-                
-                # Determine block type of this line
-                line_block_type = get_line_block_type(line_stripped)
-                
-                # Special handling for code blocks
-                if line_stripped.startswith('```'):
-                    # If we have a current block, finalize it
-                    if current_block_lines:
-                        blocks.append('\n'.join(current_block_lines).strip())
-                        current_block_lines = []
-                    
-                    # Collect the entire code block (opening ``` to closing ```)
-                    code_block_lines = [line]
-                    i += 1
-                    while i < len(lines):
-                        code_block_lines.append(lines[i])
-                        if lines[i].strip().endswith('```'):
-                            break
-                        i += 1
-                    
-                    # Add the complete code block
-                    blocks.append('\n'.join(code_block_lines).strip())
-                    current_block_lines = []
-                    current_block_type = None
-                    i += 1
-                    continue
-                
-                # If block type changes, split here
-                if (current_block_type and 
-                    current_block_type != line_block_type):
-                    # Finalize current block
-                    if current_block_lines:
-                        blocks.append('\n'.join(current_block_lines).strip())
-                        current_block_lines = []
-                
-                current_block_lines.append(line)
-                current_block_type = line_block_type
-                i += 1
-            
-            # Add the final block
-            if current_block_lines:
-                blocks.append('\n'.join(current_block_lines).strip())
+        in_block = True
+
+        closes_code = False
+        if in_code:
+            closes_code = stripped.endswith('```')
+        elif stripped.startswith('```'):
+            if start is not None:
+                yield _close_block(first, last, index, line_type, is_quote, is_unordered, is_ordered, start, end)
+                start = None
+            elif blank_lines:
+                # Blank lines between a code block and the next fence make an empty block
+                yield Block(BlockType.PARAGRAPH, line_start, line_start)
+            line_type = BlockType.CODE
+            in_code = True
+        else:
+            current_type = get_line_block_type(stripped)
+            if line_type is not None and line_type != current_type:
+                yield _close_block(first, last, index, line_type, is_quote, is_unordered, is_ordered, start, end)
+                start = None
+            line_type = current_type
+
+        if start is None:
+            indent = len(line) - len(line.lstrip())
+            start = line_start + indent
+            first = last = line[indent:]
+            index = 0
+            is_quote = is_unordered = is_ordered = True
+        else:
+            if is_quote or is_unordered or is_ordered:
+                is_quote, is_unordered, is_ordered = _line_prefixes(last, index, is_quote, is_unordered, is_ordered)
+                if blank_lines:
+                    # A blank line starts with none of the list or quote prefixes
+                    is_quote = is_unordered = is_ordered = False
+            index += 1 + blank_lines
+            last = line
+        blank_lines = 0
+        end = line_start + len(line.rstrip())
+
+        if closes_code:
+            yield _close_block(first, last, index, line_type, is_quote, is_unordered, is_ordered, start, end)
+            start = None
+            line_type = None
+            in_code = False
+
+    if start is not None:
+        yield _close_block(first, last, index, line_type, is_quote, is_unordered, is_ordered, start, end)
+
+def iter_block_texts(lines):
+    """
+    Yields (block_type, text) for each block in an iterable of markdown
+    lines, with the same blocks as iter_blocks. Only the lines of the block
+    being scanned are held, so a source of any size (e.g. a file read line
+    by line) is split in memory bounded by its largest block.
+    """
+    buffer = deque()
+    buffer_start = 0  # offset of buffer[0]
+
+    def record(lines):
+        for line in lines:
+            buffer.append(line)
+            yield line
+
+    for block in iter_blocks(record(lines)):
+        text = '\n'.join(buffer)[block.start - buffer_start:block.end - buffer_start]
+        # Lines that end within this block are not needed by the next one
+        while buffer and buffer_start + len(buffer[0]) <= block.end:
+            buffer_start += len(buffer.popleft()) + 1
+        yield block.block_type, text
+
+def _line_prefixes(line, index, is_quote, is_unordered, is_ordered):
+    """Narrows the quote/list flags of a block by its line at the given index."""
+    return (
+        is_quote and line.startswith('>'),
+        is_unordered and line.startswith('- '),
+        is_ordered and line.startswith(f"{index + 1}. "),
+    )
+
+def _close_block(first, last, index, line_type, is_quote, is_unordered, is_ordered, start, end):
+    if index == 0:
+        # A one-line block has the type of its line, except that code needs a
+        # closing ``` and an ordered list has to start at 1
+        if line_type == BlockType.CODE:
+            text = first.rstrip()
+            block_type = BlockType.CODE if text.endswith('```') else BlockType.PARAGRAPH
+        elif line_type == BlockType.ORDERED_LIST and not first.startswith('1. '):
+            block_type = BlockType.PARAGRAPH
         else:
-            # Single line block, add as-is
-            blocks.append(stripped_block)
+            block_type = line_type
+        return Block(block_type, start, end)
+
+    last = last.rstrip()
+    if first.startswith('#'):
+        count_hashes = len(first) - len(first.lstrip('#'))
+        if 1 <= count_hashes <= 6 and len(first) > count_hashes and first[count_hashes] == ' ':
+            return Block(BlockType.HEADING, start, end)
+    if first.startswith('```') and last.endswith('```'):
+        return Block(BlockType.CODE, start, end)
 
-    return blocks
+    is_quote, is_unordered, is_ordered = _line_prefixes(last, index, is_quote, is_unordered, is_ordered)
+    if is_quote:
+        return Block(BlockType.QUOTE, start, end)
+    if is_unordered:
+        return Block(BlockType.UNORDERED_LIST, start, end)
+    if is_ordered:
+        return Block(BlockType.ORDERED_LIST, start, end)
+    return Block(BlockType.PARAGRAPH, start, end)
 
 def get_line_block_type(line):
     """Helper function to determine the block type of a single line."""
@@ -138,7 +215,8 @@ def get_line_block_type(line):
         return BlockType.UNORDERED_LIST
     
     # Check for ordered list
-    if '.' in line and line.split('.')[0].isdigit() and line.startswith(line.split('.')[0] + '. '):
+    number, dot, _ = line.partition('.')
+    if dot and number.isdigit() and line.startswith(' ', len(number) + 1):
         return BlockType.ORDERED_LIST
     
     # Default to paragraph
@@ -185,22 +263,16 @@ def text_to_children(text, exclude_delimiters=None):
     if exclude_delimiters is None:
         exclude_delimiters = set()
     
-    text_nodes = text_to_textnodes_selective(text, exclude_delimiters)
-    children = []
-    for text_node in text_nodes:
-        if text_node.text_type == TextType.BOLD_TEXT:
-            # Process the content inside the bold text, but exclude bold delimiter to prevent infinite recursion
-            nested_children = text_to_children(text_node.text, exclude_delimiters | {"**"})
-            children.append(ParentNode("b", nested_children))
-        elif text_node.text_type == TextType.ITALIC_TEXT:
-            # Process the content inside the italic text, but exclude italic delimiters
-            nested_children = text_to_children(text_node.text, exclude_delimiters | {"*", "_"})
-            children.append(ParentNode("i", nested_children))
-        else:
-            # For other types, use regular conversion
-            html_node = text_node.text_node_to_html_node()
-            children.append(html_node)
-    return children
+    # Fast path: plain prose becomes a single text node
+    if not INLINE_MARKUP_CHARS.search(text):
+        return [LeafNode(None, text)] if text else []
+
+    # Import here to avoid circular imports
+    from tokenizer import parse_inline
+
+    # Bold content is parsed without ** and italic content without * and _,
+    # nested inside the same scan rather than by re-parsing each span's text
+    return parse_inline(text, exclude_delimiters)
 
 def text_to_textnodes_selective(text, exclude_delimiters=None):
     """Like text_to_textnodes but can exclude certain delimiters to prevent infinite recursion."""
@@ -208,37 +280,30 @@ def text_to_textnodes_selective(text, exclude_delimiters=None):
         exclude_delimiters = set()
         
     # Import here to avoid circular imports
-    from splitnodes import split_nodes_delimiter, split_nodes_image, split_nodes_link
+    from tokenizer import tokenize_inline
 
-    # Start with the input text as a single plain text node
-    nodes = [TextNode(text, TextType.PLAIN_TEXT)]
-
-    # Apply splitting functions, but skip excluded delimiters
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    
-    if "`" not in exclude_delimiters:
-        nodes = split_nodes_delimiter(nodes, "`", TextType.CODE_TEXT)
-    if "**" not in exclude_delimiters:
-        nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD_TEXT)
-    if "*" not in exclude_delimiters:
-        nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC_TEXT)
-    if "_" not in exclude_delimiters:
-        nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC_TEXT)
-
-    # Filter out any empty text nodes
-    nodes = [node for node in nodes if node.text != ""]
-
-    return nodes
+    return tokenize_inline(text, exclude_delimiters)
 
 def extract_title(markdown):
     """
-    Extracts the h1 header from markdown text.
-    Returns the header text without the # and leading/trailing whitespace.
+    Extracts the page title from markdown text: the title in its front
+    matter if it has one, otherwise the h1 header, returned without the #
+    and leading/trailing whitespace.
     Raises an exception if no h1 header is found.
     """
-    lines = markdown.split('\n')
-    
+    front_matter, body = split_front_matter(markdown)
+    if front_matter.get("title") is not None:
+        return str(front_matter["title"])
+    return extract_title_from_lines(body.split('\n'))
+
+def extract_title_from_lines(lines):
+    """Like extract_title, for an iterable of lines; stops reading at the title."""
+    title = _find_title(lines)
+    if title is None:
+        raise ValueError("No h1 header found in markdown")
+    return title
+
+def _find_title(lines):
     for line in lines:
         # Check if line contains an h1 header (# followed by space or just #)
         stripped_line = line.strip()
@@ -251,78 +316,73 @@ def extract_title(markdown):
                 return title
     
     # If we get here, no h1 header was found
-    raise ValueError("No h1 header found in markdown")
+    return None
 
 def markdown_to_html_node(markdown):
     """Converts a full markdown document into a single parent HTMLNode."""
-    # Split markdown into blocks
-    blocks = markdown_to_blocks(markdown)
-    
+    # Split markdown into typed blocks in one pass
+    return blocks_to_html_node(markdown, scan_blocks(markdown))
+
+def blocks_to_html_node(markdown, blocks):
+    """Converts the blocks scan_blocks found in markdown into a single parent HTMLNode."""
     # Convert each block to an HTMLNode
+    block_nodes = [
+        block_to_html_node(markdown[typed_block.start:typed_block.end], typed_block.block_type)
+        for typed_block in blocks
+    ]
+    return _wrap_blocks(block_nodes)
+
+def parse_document(markdown):
+    """
+    Parses markdown once into a Document: the HTML tree of
+    markdown_to_html_node plus the page's metadata.
+    """
+    return blocks_to_document(markdown, scan_blocks(markdown))
+
+def blocks_to_document(markdown, blocks):
+    """
+    Converts the blocks scan_blocks found in markdown into a Document,
+    picking up the title and headings from each block as it is converted.
+    """
+    document = Document()
     block_nodes = []
-    
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        
-        if block_type == BlockType.PARAGRAPH:
-            # Create paragraph node with inline formatting
-            # Replace newlines with spaces and normalize whitespace
-            paragraph_text = block.replace("\n", " ")
-            # Replace multiple spaces with single spaces
-            paragraph_text = re.sub(r'\s+', ' ', paragraph_text).strip()
-            children = text_to_children(paragraph_text)
-            block_nodes.append(ParentNode("p", children))
-            
-        elif block_type == BlockType.HEADING:
-            # Determine heading level from number of # characters
-            level = len(block) - len(block.lstrip("#"))
-            heading_text = block[level + 1:]  # Remove "# " prefix
-            children = text_to_children(heading_text)
-            block_nodes.append(ParentNode(f"h{level}", children))
-            
-        elif block_type == BlockType.CODE:
-            # Code blocks don't process inline markdown
-            code_text = block[3:-3]  # Remove ``` from start and end
-            
-            # Use textwrap.dedent to remove common leading whitespace
-            # Strip leading newline but preserve trailing newline if it exists
-            code_text = textwrap.dedent(code_text)
-            if code_text.startswith('\n'):
-                code_text = code_text[1:]
-            
-            code_node = TextNode(code_text, TextType.PLAIN_TEXT)
-            html_node = code_node.text_node_to_html_node()
-            block_nodes.append(ParentNode("pre", [ParentNode("code", [html_node])]))
-            
-        elif block_type == BlockType.QUOTE:
-            # Remove > from each line and process inline markdown
-            lines = block.split("\n")
-            quote_text = "\n".join(line[1:].lstrip() for line in lines)  # Remove > and leading space
-            children = text_to_children(quote_text)
-            block_nodes.append(ParentNode("blockquote", children))
-            
-        elif block_type == BlockType.UNORDERED_LIST:
-            # Create list items for each line
-            lines = block.split("\n")
-            list_items = []
-            for line in lines:
-                item_text = line[2:]  # Remove "- "
-                item_children = text_to_children(item_text)
-                list_items.append(ParentNode("li", item_children))
-            block_nodes.append(ParentNode("ul", list_items))
-            
-        elif block_type == BlockType.ORDERED_LIST:
-            # Create list items for each line
-            lines = block.split("\n")
-            list_items = []
-            for line in lines:
-                # Find the first space after the number and period
-                space_index = line.find(" ")
-                item_text = line[space_index + 1:]  # Remove "1. ", "2. ", etc.
-                item_children = text_to_children(item_text)
-                list_items.append(ParentNode("li", item_children))
-            block_nodes.append(ParentNode("ol", list_items))
-    
+
+    for typed_block in blocks:
+        block = markdown[typed_block.start:typed_block.end]
+        block_type = typed_block.block_type
+        node = block_to_html_node(block, block_type)
+        block_nodes.append(node)
+
+        if document.title is None and '#' in block:
+            # Same rule as extract_title: the first "# " line anywhere, code
+            # included. Whole lines are checked, since the block's span ends
+            # before trailing whitespace that rule looks at.
+            line_end = markdown.find('\n', typed_block.end)
+            document.title = _find_title(markdown[typed_block.start:line_end if line_end >= 0 else None].split('\n'))
+
+        if block_type == BlockType.HEADING:
+            text = []
+            _collect_inline(node.children, text, [], [])
+            document.headings.append((int(node.tag_name[1:]), "".join(text)))
+
+    document.root = _wrap_blocks(block_nodes)
+    return document
+
+def _collect_inline(nodes, text, links, images):
+    """Appends the text of inline nodes to text, and their links and images as (text, url) pairs."""
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node.children:
+            stack.extend(reversed(node.children))
+        elif node.tag_name == "img":
+            images.append((node.props["alt"], node.props["src"]))
+        else:
+            if node.tag_name == "a":
+                links.append((node.value, node.props["href"]))
+            text.append(node.value)
+
+def _wrap_blocks(block_nodes):
     # Wrap everything in a div (handle empty case)
     if not block_nodes:
         # For empty documents, create a div with empty text node
@@ -331,8 +391,145 @@ def markdown_to_html_node(markdown):
     
     return ParentNode("div", block_nodes)
 
+def iter_markdown_html(lines, minify=False):
+    """
+    Yields the HTML of markdown_to_html_node for an iterable of lines in
+    chunks, one block at a time, without building the document's tree.
+    """
+    yield "<div>"
+    for block_type, block in iter_block_texts(lines):
+        yield from block_to_html_node(block, block_type).iter_html(minify)
+    yield "</div>"
+
+class StreamedHtml:
+    """
+    HTML produced from an iterable of chunks, usable wherever an HtmlNode is
+    streamed through iter_html() (e.g. as a Template value). It can only be
+    iterated once. The chunks are yielded as they are, so minification (see
+    iter_markdown_html) happens where they are produced.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def iter_html(self, minify=False):
+        return iter(self.chunks)
+
+def block_to_html_node(block, block_type):
+    """Converts the text of one block of the given BlockType into an HTMLNode."""
+    if block_type == BlockType.PARAGRAPH:
+        # Create paragraph node with inline formatting
+        # Replace newlines and runs of whitespace with single spaces
+        paragraph_text = WHITESPACE_RUN.sub(' ', block).strip()
+        children = text_to_children(paragraph_text)
+        return ParentNode("p", children)
+        
+    elif block_type == BlockType.HEADING:
+        # Determine heading level from number of # characters
+        level = len(block) - len(block.lstrip("#"))
+        heading_text = block[level + 1:]  # Remove "# " prefix
+        children = text_to_children(heading_text)
+        return ParentNode(f"h{level}", children)
+        
+    elif block_type == BlockType.CODE:
+        # Code blocks don't process inline markdown
+        code_text = block[3:-3]  # Remove ``` from start and end
+        
+        # Use textwrap.dedent to remove common leading whitespace
+        # Strip leading newline but preserve trailing newline if it exists
+        code_text = textwrap.dedent(code_text)
+        if code_text.startswith('\n'):
+            code_text = code_text[1:]
+        
+        code_node = TextNode(code_text, TextType.PLAIN_TEXT)
+        html_node = code_node.text_node_to_html_node()
+        return ParentNode("pre", [ParentNode("code", [html_node])])
+        
+    elif block_type == BlockType.QUOTE:
+        # Remove > from each line and process inline markdown
+        lines = block.split("\n")
+        quote_text = "\n".join(line[1:].lstrip() for line in lines)  # Remove > and leading space
+        children = text_to_children(quote_text)
+        return ParentNode("blockquote", children)
+        
+    elif block_type == BlockType.UNORDERED_LIST:
+        # Create list items for each line
+        lines = block.split("\n")
+        list_items = []
+        for line in lines:
+            item_text = line[2:]  # Remove "- "
+            item_children = text_to_children(item_text)
+            list_items.append(ParentNode("li", item_children))
+        return ParentNode("ul", list_items)
+        
+    elif block_type == BlockType.ORDERED_LIST:
+        # Create list items for each line
+        lines = block.split("\n")
+        list_items = []
+        for line in lines:
+            # Find the first space after the number and period
+            space_index = line.find(" ")
+            item_text = line[space_index + 1:]  # Remove "1. ", "2. ", etc.
+            item_children = text_to_children(item_text)
+            list_items.append(ParentNode("li", item_children))
+        return ParentNode("ol", list_items)
 
 
+class Document:
+    """
+    A parsed markdown page (see parse_document): root is its HTML tree,
+    title the text of its first h1 line (None without one) and headings a
+    list of (level, text). word_count (words outside code blocks), links and
+    images (lists of (text, url) in document order) are read off the tree the
+    first time one of them is used, since most builds never need them.
+    """
+    __slots__ = ("root", "title", "headings", "_word_count", "_links", "_images")
+
+    def __init__(self, root=None, title=None, headings=None):
+        self.root = root
+        self.title = title
+        self.headings = headings if headings is not None else []
+        self._links = None
+
+    @property
+    def word_count(self):
+        if self._links is None:
+            self._collect()
+        return self._word_count
+
+    @property
+    def links(self):
+        if self._links is None:
+            self._collect()
+        return self._links
+
+    @property
+    def images(self):
+        if self._links is None:
+            self._collect()
+        return self._images
+
+    def _collect(self):
+        word_count = 0
+        links = []
+        images = []
+        for node in self.root.children:
+            if node.tag_name == "pre" or not node.children:
+                continue
+            for item in node.children if node.tag_name in ("ul", "ol") else (node,):
+                text = []
+                _collect_inline(item.children, text, links, images)
+                word_count += len("".join(text).split())
+        self._word_count = word_count
+        self._links = links
+        self._images = images
+
+    def __repr__(self):
+        return (
+            f"Document(title={self.title!r}, headings={self.headings!r}, word_count={self.word_count}, "
+            f"links={self.links!r}, images={self.images!r})"
+        )
+
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
     HEADING = "heading"
@@ -341,6 +538,27 @@ class BlockType(Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
+class Block:
+    """A block found by scan_blocks: its type and its [start, end) span in the document."""
+    __slots__ = ("block_type", "start", "end")
+
+    def __init__(self, block_type, start, end):
+        self.block_type = block_type
+        self.start = start
+        self.end = end
+
+    def __eq__(self, other):
+        if not isinstance(other, Block):
+            return False
+        return (
+            self.block_type == other.block_type
+            and self.start == other.start
+            and self.end == other.end
+        )
+
+    def __repr__(self):
+        return f"Block({self.block_type.value!r}, {self.start}, {self.end})"
+
 class TextType(Enum):
     PLAIN_TEXT = "text"
     BOLD_TEXT = "**Bold text**"
@@ -350,6 +568,8 @@ class TextType(Enum):
     IMAGES = "![alt text](url)"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type=TextType.PLAIN_TEXT, url = None):
         self.text = text
         self.text_type = text_type
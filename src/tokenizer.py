@@ -0,0 +1,219 @@
+from htmlnode import LeafNode, ParentNode
+from textnode import IMAGE_PATTERN, INLINE_MARKUP_CHARS, LINK_PATTERN, TextNode, TextType
+
+# Delimiters in the order the split passes used to apply them. A delimiter's
+# index is its priority: a span can only contain lower-priority delimiters.
+DELIMITERS = ("`", "**", "*", "_")
+DELIMITER_TYPES = (TextType.CODE_TEXT, TextType.BOLD_TEXT, TextType.ITALIC_TEXT, TextType.ITALIC_TEXT)
+CODE, BOLD, STAR, UNDERSCORE = range(4)
+CHAR_LEVELS = {"`": CODE, "_": UNDERSCORE}
+
+
+def tokenize_inline(text, exclude_delimiters=frozenset()):
+    """
+    Splits inline markdown into TextNodes in one left-to-right scan.
+
+    Produces exactly what applying split_nodes_image, split_nodes_link and
+    split_nodes_delimiter for `, **, * and _ in sequence would, including the
+    ValueError for unmatched delimiters, without building a new node list per
+    pass. Images and links are taken first and end any open span; a span can
+    only contain delimiters of lower priority, and meeting a higher-priority
+    delimiter inside one means the span was never closed.
+    Delimiters in exclude_delimiters are treated as plain text.
+    """
+    scanner = _InlineScanner(text, exclude_delimiters, nested=False)
+    scanner.scan()
+    return scanner.root.nodes
+
+
+def parse_inline(text, exclude_delimiters=frozenset()):
+    """
+    Parses inline markdown straight into a list of HtmlNode children, with
+    bold and italic spans already holding their nested formatting.
+
+    The result is the same as tokenizing the text and then re-tokenizing the
+    content of every bold and italic span, but the nested spans are paired
+    during the same scan instead of re-parsing each substring.
+    """
+    scanner = _InlineScanner(text, exclude_delimiters, nested=True)
+    scanner.scan()
+    return scanner.root.nodes
+
+
+class _Frame:
+    """
+    Delimiter pairing state for one run of inline content: the whole text, or
+    the inside of an open bold/italic span. Spans never overlap within a frame,
+    so at most one is open; its content gets a child frame when nesting.
+    """
+
+    def __init__(self, active, start):
+        self.active = active
+        self.start = start
+        self.nodes = []
+        self.open_level = None
+        self.child = None
+        self.error_level = None
+        self.child_error = None
+
+    def error(self, level):
+        # The split passes ran in priority order, so the highest-priority failure wins
+        if self.error_level is None or level < self.error_level:
+            self.error_level = level
+
+    def first_error(self):
+        """This frame's own error, else the first error inside its spans (the order recursion found them)."""
+        return self.error_level if self.error_level is not None else self.child_error
+
+
+class _InlineScanner:
+    def __init__(self, text, exclude_delimiters, nested):
+        self.text = text
+        self.nested = nested
+        self.root = _Frame([delimiter not in exclude_delimiters for delimiter in DELIMITERS], 0)
+
+    def scan(self):
+        text = self.text
+        position = 0
+        while True:
+            match = INLINE_MARKUP_CHARS.search(text, position)
+            if match is None:
+                break
+            i = match.start()
+            char = text[i]
+
+            if char == "!" or char == "[":
+                end = self._match_image_or_link(i)
+                position = end if end else i + 1
+            elif char == "*":
+                position = self._star_run(i)
+            else:
+                level = CHAR_LEVELS[char]
+                if self.root.active[level]:
+                    self._delimiter(self.root, level, i, i + 1)
+                position = i + 1
+
+        self._end_fragment(len(text))
+
+        error_level = self.root.first_error()
+        if error_level is not None:
+            raise ValueError(f"Invalid markdown: unmatched {DELIMITERS[error_level]} delimiter")
+
+    def _match_image_or_link(self, i):
+        """Emits an image or link starting at i, returning its end (or 0 if there is none)."""
+        text = self.text
+        if text[i] == "!":
+            match = IMAGE_PATTERN.match(text, i)
+            if match is None:
+                return 0
+            text_type = TextType.IMAGES
+        else:
+            # The pattern's lookbehind rejects a link directly after ! (that would be an image)
+            match = LINK_PATTERN.match(text, i)
+            if match is None or self._contains_image(i + 1, match.end()):
+                return 0
+            text_type = TextType.LINKS
+
+        self._end_fragment(i)
+        label, url = match.group(1), match.group(2)
+        if label:
+            if not self.nested:
+                self.root.nodes.append(TextNode(label, text_type, url))
+            elif text_type == TextType.IMAGES:
+                self.root.nodes.append(LeafNode("img", "", {"src": url, "alt": label}))
+            else:
+                self.root.nodes.append(LeafNode("a", label, {"href": url}))
+        self.root.start = match.end()
+        return match.end()
+
+    def _contains_image(self, start, end):
+        """Images take priority over links, so a link overlapping an image is not a link."""
+        position = self.text.find("![", start, end)
+        while position != -1:
+            if IMAGE_PATTERN.match(self.text, position):
+                return True
+            position = self.text.find("![", position + 1, end)
+        return False
+
+    def _star_run(self, i):
+        """Splits a run of * into ** and * delimiters, ** first, like the split passes did."""
+        text = self.text
+        end = i
+        while end < len(text) and text[end] == "*":
+            end += 1
+
+        root = self.root
+        position = i
+        if root.active[BOLD]:
+            while end - position >= 2:
+                self._delimiter(root, BOLD, position, position + 2)
+                position += 2
+        if root.active[STAR]:
+            while position < end:
+                self._delimiter(root, STAR, position, position + 1)
+                position += 1
+        return end
+
+    def _delimiter(self, frame, level, start, end):
+        open_level = frame.open_level
+        if open_level is not None and open_level < level:
+            # Inside a higher-priority span (e.g. * inside bold): content of
+            # that span, which may still pair up inside it
+            child = frame.child
+            if child is not None and child.active[level]:
+                self._delimiter(child, level, start, end)
+            return
+
+        if open_level == level:
+            self._close_span(frame, start)
+        else:
+            if open_level is None:
+                self._emit_plain(frame, start)
+            else:
+                # A higher-priority delimiter cut the open span short
+                frame.error(open_level)
+            frame.open_level = level
+            frame.child = None
+            if self.nested and level != CODE:
+                # Bold content is parsed without **, italic content without * and _
+                active = list(frame.active)
+                for excluded in ((BOLD,) if level == BOLD else (STAR, UNDERSCORE)):
+                    active[excluded] = False
+                frame.child = _Frame(active, end)
+        frame.start = end
+
+    def _close_span(self, frame, end):
+        level = frame.open_level
+        child = frame.child
+        frame.open_level = None
+        frame.child = None
+        if end == frame.start:
+            return
+
+        content = self.text[frame.start:end]
+        if not self.nested:
+            frame.nodes.append(TextNode(content, DELIMITER_TYPES[level]))
+        elif level == CODE:
+            frame.nodes.append(LeafNode("code", content))
+        else:
+            self._finish(child, end)
+            if frame.child_error is None:
+                frame.child_error = child.first_error()
+            frame.nodes.append(ParentNode("b" if level == BOLD else "i", child.nodes))
+
+    def _end_fragment(self, end):
+        """Closes the text before an image, link or the end of the input."""
+        self._finish(self.root, end)
+
+    def _finish(self, frame, end):
+        if frame.open_level is None:
+            self._emit_plain(frame, end)
+        else:
+            frame.error(frame.open_level)
+            frame.open_level = None
+            frame.child = None
+
+    def _emit_plain(self, frame, end):
+        if end > frame.start:
+            content = self.text[frame.start:end]
+            frame.nodes.append(LeafNode(None, content) if self.nested else TextNode(content, TextType.PLAIN_TEXT))
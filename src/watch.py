@@ -0,0 +1,300 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from template import normalize_basepath
+
+# inotify event bits (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# Content changes only: plain IN_MODIFY fires for every write(), while
+# IN_CLOSE_WRITE arrives once the editor has finished saving
+WATCH_MASK = IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+EVENT_HEADER = struct.Struct("iIII")
+
+# How long to wait for more events after the first one, so that an editor
+# writing several files (or one file in several steps) triggers one rebuild
+DEBOUNCE = 0.02
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    b'<script>new EventSource("' + LIVE_RELOAD_PATH.encode() + b'")'
+    b".onmessage = function () { location.reload(); };</script>"
+)
+
+
+class InotifyWatcher:
+    """
+    Reports changed files under a set of roots using Linux inotify.
+    Directory roots are watched recursively (new subdirectories included);
+    file roots are watched through their parent directory, so editors that
+    save by renaming a temporary file over the original are still noticed.
+    """
+
+    def __init__(self, roots):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self.roots = list(roots)
+        self.watches = {}  # watch descriptor -> (directory, recursive)
+        self.files = set()
+        for root in self.roots:
+            if os.path.isdir(root):
+                self._watch_tree(root)
+            else:
+                self.files.add(root)
+                self._watch(os.path.dirname(root) or ".", recursive=False)
+
+    def close(self):
+        os.close(self.fd)
+
+    def wait(self, timeout=None):
+        """Blocks until something changes (or timeout) and returns the set of changed paths."""
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        while readable:
+            self._read_events(changed)
+            readable, _, _ = select.select([self.fd], [], [], DEBOUNCE)
+        return changed
+
+    def _read_events(self, changed):
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+                offset += length
+                self._handle_event(wd, mask, name, changed)
+
+    def _handle_event(self, wd, mask, name, changed):
+        if mask & IN_Q_OVERFLOW:
+            # Events were dropped: treat every root as changed
+            changed.update(self.roots)
+            return
+        if mask & IN_IGNORED:
+            self.watches.pop(wd, None)
+            return
+        if wd not in self.watches or not name:
+            return
+
+        directory, recursive = self.watches[wd]
+        path = os.path.join(directory, name) if directory != "." else name
+        if not recursive:
+            if path in self.files:
+                changed.add(path)
+            return
+
+        if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+            # Files may have been written into the directory before its watch existed
+            self._watch_tree(path)
+        changed.add(path)
+
+    def _watch_tree(self, root):
+        self._watch(root, recursive=True)
+        for directory, subdirs, _ in os.walk(root):
+            for subdir in subdirs:
+                self._watch(os.path.join(directory, subdir), recursive=True)
+
+    def _watch(self, directory, recursive):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = (directory, recursive)
+
+
+class PollingWatcher:
+    """
+    Portable fallback for InotifyWatcher: rescans the roots every interval
+    seconds and reports files whose size or mtime changed, appeared or vanished.
+    """
+
+    def __init__(self, roots, interval=0.25):
+        self.roots = list(roots)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def close(self):
+        pass
+
+    def wait(self, timeout=None):
+        """Blocks until something changes (or timeout) and returns the set of changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def _scan(self):
+        snapshot = {}
+        for root in self.roots:
+            if os.path.isdir(root):
+                for directory, _, files in os.walk(root):
+                    for name in files:
+                        self._stat(os.path.join(directory, name), snapshot)
+            else:
+                self._stat(root, snapshot)
+        return snapshot
+
+    @staticmethod
+    def _stat(path, snapshot):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+
+def create_watcher(roots, poll=False, interval=0.25):
+    """Returns an InotifyWatcher where inotify is available, else a PollingWatcher."""
+    if not poll:
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError, TypeError):
+            # No inotify on this platform (or no libc found)
+            pass
+    return PollingWatcher(roots, interval)
+
+
+class DevServer:
+    """
+    Serves the output directory over HTTP for local development.
+    HTML pages get a small script that reloads them whenever reload() is
+    called, via a server-sent event stream at LIVE_RELOAD_PATH.
+    Requests under basepath are served from the root of the directory, so a
+    site built for e.g. /StaticSiteGenerator/ works as it would when deployed.
+    """
+
+    def __init__(self, directory, host="localhost", port=8888, basepath="/"):
+        self.directory = directory
+        self.basepath = normalize_basepath(basepath)
+        self.generation = 0
+        self.changed = threading.Condition()
+        self.httpd = ThreadingHTTPServer((host, port), LiveReloadHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.dev_server = self
+        self.thread = None
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{self.basepath}"
+
+    def start(self):
+        """Starts serving in a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reload(self):
+        """Tells every open page to reload itself."""
+        with self.changed:
+            self.generation += 1
+            self.changed.notify_all()
+
+    def wait_for_reload(self, generation, timeout):
+        """Waits until the generation moves past the given one; returns the current generation."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    def __init__(self, request, client_address, server):
+        super().__init__(request, client_address, server, directory=server.dev_server.directory)
+
+    def do_GET(self):
+        if self.path == LIVE_RELOAD_PATH:
+            self._stream_reloads()
+            return
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            self._send_html(path)
+            return
+        super().do_GET()
+
+    def translate_path(self, path):
+        basepath = self.server.dev_server.basepath
+        if basepath != "/" and path.startswith(basepath):
+            path = path[len(basepath) - 1:]
+        return super().translate_path(path)
+
+    def log_message(self, format, *args):
+        # Keep the console for build output
+        pass
+
+    def _send_html(self, path):
+        with open(path, 'rb') as f:
+            body = f.read()
+        index = body.rfind(b"</body>")
+        if index == -1:
+            body += LIVE_RELOAD_SCRIPT
+        else:
+            body = body[:index] + LIVE_RELOAD_SCRIPT + body[index:]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_reloads(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+        dev_server = self.server.dev_server
+        generation = dev_server.generation
+        try:
+            while True:
+                current = dev_server.wait_for_reload(generation, timeout=15)
+                if current != generation:
+                    self.wfile.write(b"data: reload\n\n")
+                    generation = current
+                else:
+                    # Keeps proxies and the browser from timing the stream out
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass